@@ -0,0 +1,286 @@
+import math
+import random
+
+import numpy as np
+
+from table_groups import TableGrouper
+from utils import LogManager
+
+layout_logger = LogManager.get_logger('layout')
+
+
+class AutoArranger:
+    """自动排座策略注册表
+
+    每个策略是一个函数 strategy(students, seat_keys, layout_config, constraints)，
+    返回 座位键 -> Student 的字典，座位数不足时只安排部分学生。
+    constraints 为配置中的"constraints"项（小组人数、需要分开的学生等）
+    """
+    # 已注册的策略，名称 -> (显示名称, 函数)
+    STRATEGIES = {}
+
+    @staticmethod
+    def register(name, label):
+        """注册自动排座策略的装饰器
+
+        Args:
+            name: 策略名称
+            label: 界面上显示的名称
+        """
+        def decorator(func):
+            AutoArranger.STRATEGIES[name] = (label, func)
+            return func
+        return decorator
+
+    @staticmethod
+    def arrange(name, students, seat_keys, layout_config, constraints=None):
+        """按指定策略安排座位
+
+        Args:
+            name: 策略名称
+            students: 待安排的Student列表
+            seat_keys: 可用的座位键列表
+            layout_config: 布局配置
+            constraints: 排座约束配置
+
+        Returns:
+            dict: 座位键 -> Student
+
+        Raises:
+            KeyError: 策略不存在
+        """
+        label, strategy = AutoArranger.STRATEGIES[name]
+        assignment = strategy(students, seat_keys, layout_config, constraints or {})
+        LogManager.info(layout_logger, f"自动排座（{label}）：安排 {len(assignment)} 名学生")
+        return assignment
+
+    @staticmethod
+    def fill(order, students, seat_keys, layout_config):
+        """按指定顺序把学生依次填入空座位
+
+        Args:
+            order: 填充顺序名称，见FILL_ORDERS
+            students: 待安排的Student列表，按名单顺序
+            seat_keys: 空座位键列表
+            layout_config: 布局配置
+
+        Returns:
+            dict: 座位键 -> Student
+
+        Raises:
+            KeyError: 填充顺序不存在
+        """
+        label, sort_seats = FILL_ORDERS[order]
+        assignment = dict(zip(sort_seats(seat_keys, layout_config), students))
+        LogManager.info(layout_logger, f"自动填充（{label}）：安排 {len(assignment)} 名学生")
+        return assignment
+
+    @staticmethod
+    def seat_positions(seat_keys, layout_config):
+        """计算座位到讲台的前后距离和到中线的左右距离
+
+        讲台在座位表下方，每个列组的最后一排离讲台最近。列组从左到右依次排列。
+
+        Args:
+            seat_keys: 座位键列表
+            layout_config: 布局配置
+
+        Returns:
+            tuple: (前后距离数组, 左右距离数组)，都归一化到[0, 1]，0表示最前排/正中间
+        """
+        max_rows = max((config["rows"] for config in layout_config.values()), default=1)
+        offsets = _column_offsets(layout_config)
+        total_cols = sum(config["cols"] for config in layout_config.values())
+
+        depth = np.empty(len(seat_keys))
+        lateral = np.empty(len(seat_keys))
+        center = (total_cols - 1) / 2
+        for index, (col_key, row, col) in enumerate(seat_keys):
+            depth[index] = layout_config[col_key]["rows"] - 1 - row
+            lateral[index] = abs(offsets[col_key] + col - center)
+        depth /= max(max_rows - 1, 1)
+        lateral /= max(center, 1)
+        return depth, lateral
+
+
+def solve_assignment(cost):
+    """求解最小费用完全匹配（匈牙利算法，最短增广路 + 势函数）
+
+    每次增广时对所有列的松弛量做向量化更新，200×200的矩阵在几十毫秒内完成。
+
+    Args:
+        cost: n×m费用矩阵（n <= m 时每行分配一列，否则每列分配一行）
+
+    Returns:
+        tuple: (行下标数组, 列下标数组)，与 scipy.optimize.linear_sum_assignment 的返回值一致
+    """
+    cost = np.asarray(cost, dtype=float)
+    if cost.ndim != 2:
+        raise ValueError("费用矩阵必须是二维的")
+    if cost.shape[0] > cost.shape[1]:
+        cols, rows = solve_assignment(cost.T)
+        order = np.argsort(rows)
+        return rows[order], cols[order]
+
+    n, m = cost.shape
+    u = np.zeros(n + 1)
+    v = np.zeros(m + 1)
+    # match[j]: 第j列匹配的行（从1开始，0表示未匹配），下标0为虚拟列
+    match = np.zeros(m + 1, dtype=int)
+    way = np.zeros(m + 1, dtype=int)
+
+    for i in range(1, n + 1):
+        match[0] = i
+        j0 = 0
+        min_slack = np.full(m + 1, np.inf)
+        used = np.zeros(m + 1, dtype=bool)
+        while True:
+            used[j0] = True
+            i0 = match[j0]
+            free = ~used
+            free[0] = False
+            slack = cost[i0 - 1] - u[i0] - v[1:]
+            improved = free[1:] & (slack < min_slack[1:])
+            min_slack[1:][improved] = slack[improved]
+            way[1:][improved] = j0
+
+            candidates = np.where(free, min_slack, np.inf)
+            j1 = int(np.argmin(candidates))
+            delta = candidates[j1]
+            u[match[used]] += delta
+            v[used] -= delta
+            min_slack[free] -= delta
+            j0 = j1
+            if match[j0] == 0:
+                break
+
+        # 沿增广路翻转匹配
+        while j0:
+            j1 = way[j0]
+            match[j0] = match[j1]
+            j0 = j1
+
+    cols = np.nonzero(match[1:])[0]
+    rows = match[1:][cols] - 1
+    order = np.argsort(rows)
+    return rows[order], cols[order]
+
+
+def vision_need(vision):
+    """视力对前排的需求程度，0表示不需要，1表示最需要
+
+    支持五分记录（4.0~5.3）和小数记录（0.1~2.0），未知视力为0
+    """
+    if vision <= 0:
+        return 0.0
+    if vision <= 2.0:
+        vision = 5.0 + math.log10(vision)
+    return min(max(5.0 - vision, 0.0), 1.0)
+
+
+# 各项需求在费用中的权重：视力和听力优先于身高
+NEED_WEIGHTS = {"vision": 3.0, "hearing": 3.0, "height": 1.0}
+
+# 表示听力需求的标签
+HEARING_TAGS = ("听力",)
+
+
+def need_cost_matrix(students, seat_keys, layout_config):
+    """根据学生的视力、身高和听力标签计算 学生×座位 的费用矩阵
+
+    - 视力差的学生坐在后排费用高
+    - 有听力标签的学生离讲台越远、越偏离中线费用越高
+    - 身高已知的学生按身高排名对应理想的前后位置，偏离越多费用越高
+
+    Args:
+        students: Student列表
+        seat_keys: 座位键列表
+        layout_config: 布局配置
+
+    Returns:
+        numpy.ndarray: len(students)×len(seat_keys)的费用矩阵
+    """
+    depth, lateral = AutoArranger.seat_positions(seat_keys, layout_config)
+    vision = np.array([vision_need(student.vision) for student in students])
+    hearing = np.array([
+        1.0 if any(tag in student.tags for tag in HEARING_TAGS) else 0.0 for student in students
+    ])
+
+    heights = np.array([student.height for student in students], dtype=float)
+    known = heights > 0
+    height_rank = np.zeros(len(students))
+    if known.sum() > 1:
+        order = heights[known].argsort().argsort()
+        height_rank[known] = order / (known.sum() - 1)
+
+    cost = NEED_WEIGHTS["vision"] * vision[:, None] * depth[None, :]
+    cost += NEED_WEIGHTS["hearing"] * hearing[:, None] * ((depth + lateral) / 2)[None, :]
+    cost += NEED_WEIGHTS["height"] * known[:, None] * (depth[None, :] - height_rank[:, None]) ** 2
+    return cost
+
+
+@AutoArranger.register("optimal", "按需求最优分配")
+def optimal_strategy(students, seat_keys, layout_config, constraints):
+    """按视力、身高和听力需求求总费用最小的精确分配"""
+    if not students or not seat_keys:
+        return {}
+    rows, cols = solve_assignment(need_cost_matrix(students, seat_keys, layout_config))
+    return {seat_keys[col]: students[row] for row, col in zip(rows, cols)}
+
+
+@AutoArranger.register("random", "随机分配")
+def random_strategy(students, seat_keys, layout_config, constraints):
+    """随机打乱学生和座位"""
+    chosen_seats = random.sample(seat_keys, min(len(students), len(seat_keys)))
+    chosen_students = random.sample(students, len(chosen_seats))
+    return dict(zip(chosen_seats, chosen_students))
+
+
+@AutoArranger.register("table_groups", "小组均衡分配")
+def table_groups_strategy(students, seat_keys, layout_config, constraints):
+    """按成绩、性别均衡分组，并把各小组安排到相邻的座位块"""
+    assignment, _ = TableGrouper.arrange(
+        students, seat_keys, layout_config,
+        group_size=constraints.get("group_size", 4),
+        keep_apart=constraints.get("keep_apart", [])
+    )
+    return assignment
+
+
+def _column_offsets(layout_config):
+    """每个列组第一列在整个教室中的列序号"""
+    offsets = {}
+    total_cols = 0
+    for col_key, config in layout_config.items():
+        offsets[col_key] = total_cols
+        total_cols += config["cols"]
+    return offsets
+
+
+def front_to_back_order(seat_keys, layout_config):
+    """从离讲台最近的一排开始，每排从左到右"""
+    offsets = _column_offsets(layout_config)
+    return sorted(seat_keys, key=lambda seat_key: (
+        layout_config[seat_key[0]]["rows"] - 1 - seat_key[1], offsets[seat_key[0]] + seat_key[2]
+    ))
+
+
+def column_group_order(seat_keys, layout_config):
+    """按列组依次填满，每个列组内从前往后、从左到右"""
+    groups = {col_key: index for index, col_key in enumerate(layout_config)}
+    return sorted(seat_keys, key=lambda seat_key: (
+        groups[seat_key[0]], layout_config[seat_key[0]]["rows"] - 1 - seat_key[1], seat_key[2]
+    ))
+
+
+def random_order(seat_keys, layout_config):
+    """随机顺序"""
+    return random.sample(seat_keys, len(seat_keys))
+
+
+# 自动填充顺序，名称 -> (显示名称, 座位排序函数)
+FILL_ORDERS = {
+    "front_to_back": ("从前往后", front_to_back_order),
+    "column_group": ("按列组", column_group_order),
+    "random": ("随机", random_order),
+}
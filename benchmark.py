@@ -0,0 +1,575 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+SeatsChanger性能基准测试
+
+用法:
+    python benchmark.py                  # 运行全部基准
+    python benchmark.py student_memory   # 只运行指定的基准
+
+结果输出到控制台，可重定向保存到bench_output.txt
+"""
+
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+# 已注册的基准测试，名称 -> 函数
+BENCHMARKS = {}
+
+
+def benchmark(func):
+    """注册基准测试的装饰器"""
+    BENCHMARKS[func.__name__] = func
+    return func
+
+
+def measure_memory(build):
+    """测量构建对象所分配的Python内存
+
+    Args:
+        build: 无参函数，返回构建出的对象（测量期间保持引用）
+
+    Returns:
+        tuple: (构建结果, 分配的字节数, 耗时秒数)
+    """
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = build()
+    elapsed = time.perf_counter() - start
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, current, elapsed
+
+
+def report(name, value):
+    """输出一行基准结果"""
+    print(f"  {name:<36}{value}")
+
+
+@benchmark
+def student_memory(count=100000):
+    """比较10万名学生用不同结构保存时的内存占用"""
+    from student import Student
+
+    names = [f"学生{i:06d}" for i in range(count)]
+
+    _, name_bytes, _ = measure_memory(lambda: list(names))
+
+    def build_dicts():
+        return [
+            {"id": i, "name": name, "gender": "", "height": 0.0, "vision": 0.0, "tags": (), "score": 0.0}
+            for i, name in enumerate(names)
+        ]
+    _, dict_bytes, dict_time = measure_memory(build_dicts)
+
+    def build_students():
+        return [Student(i, name) for i, name in enumerate(names)]
+    _, student_bytes, student_time = measure_memory(build_students)
+
+    print(f"学生记录内存（{count} 名学生，不含姓名字符串本身）")
+    report("仅姓名列表", f"{name_bytes / 1024 / 1024:.1f} MB")
+    report("字典记录", f"{dict_bytes / 1024 / 1024:.1f} MB ({dict_bytes / count:.0f} B/人, {dict_time * 1000:.0f} ms)")
+    report("Student(__slots__)", f"{student_bytes / 1024 / 1024:.1f} MB ({student_bytes / count:.0f} B/人, {student_time * 1000:.0f} ms)")
+
+
+@benchmark
+def exam_allocation(class_count=100, class_size=50, room_count=84):
+    """5000名学生分配到84个考场（每个考场60座）的耗时"""
+    from exam_allocator import ExamAllocator
+    from student import Student
+
+    layout_config = {f"column{i}": {"rows": 6, "cols": 2} for i in range(1, 6)}
+    rosters = {
+        f"{c}班": [Student(i, f"学生{c}-{i}") for i in range(class_size)]
+        for c in range(1, class_count + 1)
+    }
+    rooms = [(f"第{i}考场", layout_config) for i in range(1, room_count + 1)]
+
+    print(f"考场编排（{class_count * class_size} 名学生，{room_count} 个考场）")
+    for label, max_workers in (("单进程", 1), ("进程池", None)):
+        start = time.perf_counter()
+        allocations = ExamAllocator.allocate_exam(rosters, rooms, max_workers=max_workers)
+        elapsed = time.perf_counter() - start
+        violations = sum(allocation.violations for allocation in allocations)
+        report(label, f"{elapsed * 1000:.0f} ms (同班相邻 {violations} 对)")
+
+
+@benchmark
+def optimal_assignment(sizes=(50, 100, 200, 400)):
+    """匈牙利算法求解不同规模费用矩阵的耗时"""
+    import numpy as np
+    from auto_arrange import solve_assignment
+
+    rng = np.random.default_rng(0)
+    print("最优分配（随机费用矩阵）")
+    for size in sizes:
+        cost = rng.random((size, size))
+        start = time.perf_counter()
+        solve_assignment(cost)
+        elapsed = time.perf_counter() - start
+        report(f"{size}×{size}", f"{elapsed * 1000:.0f} ms")
+
+
+@benchmark
+def table_grouping(sizes=(60, 1000), group_size=5):
+    """按成绩、性别和回避约束均衡分组的耗时"""
+    import random
+    from student import Student
+    from table_groups import TableGrouper
+
+    rng = random.Random(0)
+    print(f"小组均衡分组（每组 {group_size} 人，每4名学生一对回避约束）")
+    for count in sizes:
+        students = [
+            Student(i, f"学生{i}", gender=rng.choice("男女"), score=rng.gauss(75, 12))
+            for i in range(count)
+        ]
+        keep_apart = [[f"学生{2 * i}", f"学生{2 * i + 1}"] for i in range(count // 4)]
+        group_sizes = TableGrouper.group_sizes(count, [group_size] * -(-count // group_size))
+        start = time.perf_counter()
+        groups = TableGrouper.partition(students, group_sizes, keep_apart, seed=0)
+        elapsed = time.perf_counter() - start
+        violations = TableGrouper.keep_apart_violations(groups, keep_apart)
+        report(f"{count} 名学生", f"{elapsed * 1000:.0f} ms (同组回避 {violations} 对)")
+
+
+@benchmark
+def fairness_analysis(class_count=40, week_count=40, class_size=50):
+    """全校一学年（40个班×40周）座位公平性统计的耗时"""
+    import random
+    from fairness_analytics import FairnessAnalyzer
+    from session_manager import SessionManager
+    from student import Student
+
+    layout_config = {f"column{i}": {"rows": 8, "cols": 3} for i in range(1, 4)}
+    column_names = {"column1": "南", "column2": "中", "column3": "北"}
+    seat_keys = [(col_key, row, col) for col_key in layout_config for row in range(8) for col in range(3)]
+    rng = random.Random(0)
+    sessions = []
+    for c in range(class_count):
+        students = [Student(i, f"{c}班学生{i}") for i in range(class_size)]
+        for _ in range(week_count):
+            rng.shuffle(seat_keys)
+            seats = dict(zip(seat_keys, students))
+            sessions.append(SessionManager.build_session(
+                layout_config, column_names, students[len(seat_keys):], seats
+            ))
+
+    start = time.perf_counter()
+    report_data = FairnessAnalyzer.analyze(sessions)
+    elapsed = time.perf_counter() - start
+    print(f"座位公平性统计（{len(sessions)} 个会话）")
+    report(f"{len(report_data.names)} 名学生", f"{elapsed * 1000:.0f} ms")
+
+
+@benchmark
+def constraint_checks(group_count=4, rows=25, cols=10):
+    """1000座教室中排座约束的构建、增量更新和拖拽检查耗时"""
+    from seat_constraints import ConstraintEvaluator
+    from student import Student
+
+    layout_config = {f"column{i}": {"rows": rows, "cols": cols} for i in range(1, group_count + 1)}
+    seat_count = group_count * rows * cols
+    students = [Student(i, f"学生{i}") for i in range(seat_count)]
+    constraints = {
+        "keep_apart": [[f"学生{i}", f"学生{i + 1}"] for i in range(0, seat_count - 1, 2)],
+        "front_row": [f"学生{i}" for i in range(0, seat_count, 50)],
+    }
+
+    start = time.perf_counter()
+    evaluator = ConstraintEvaluator(layout_config, constraints)
+    build_time = time.perf_counter() - start
+    seat_keys = list(evaluator.index.neighbors)
+
+    start = time.perf_counter()
+    evaluator.apply(list(zip(seat_keys, students)))
+    fill_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for seat_key in seat_keys:
+        evaluator.check_drop(seat_key, students[1])
+    check_time = (time.perf_counter() - start) / seat_count
+
+    start = time.perf_counter()
+    swaps = 500
+    for i in range(swaps):
+        evaluator.apply([(seat_keys[i], students[-1 - i]), (seat_keys[-1 - i], students[i])])
+    swap_time = (time.perf_counter() - start) / swaps
+
+    print(f"排座约束检查（{seat_count} 个座位）")
+    report("构建邻接索引", f"{build_time * 1000:.1f} ms")
+    report("全部入座后检查", f"{fill_time * 1000:.1f} ms")
+    report("单次拖拽检查", f"{check_time * 1e6:.1f} µs")
+    report("单次交换增量更新", f"{swap_time * 1e6:.1f} µs")
+
+
+# 所有Qt基准共用的QApplication，由_qt_app创建
+_app = None
+
+
+def _qt_app():
+    """返回所有Qt基准共用的QApplication
+
+    QApplication保存在模块变量中直到进程结束。若由单个基准的局部变量持有，
+    基准返回时QApplication被销毁，qfluentwidgets的qconfig随之销毁，
+    之后创建卡片控件的基准会因qconfig已删除而失败
+    """
+    global _app
+    from PyQt5.QtWidgets import QApplication
+
+    if _app is None:
+        _app = QApplication.instance() or QApplication(sys.argv[:1])
+    return _app
+
+
+def current_rss():
+    """当前进程的常驻内存（字节），仅Linux可用，其他平台返回0"""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError):
+        return 0
+
+
+@benchmark
+def exam_documents(class_count=100, class_size=50, room_count=84):
+    """为5000名考生生成桌贴、门贴和签到表PDF的耗时和内存"""
+    from exam_allocator import ExamAllocator
+    from exam_documents import ExamDocumentExporter
+    from student import Student
+
+    # 绘制文字需要QApplication
+    app = _qt_app()
+    layout_config = {f"column{i}": {"rows": 6, "cols": 2} for i in range(1, 6)}
+    rosters = {
+        f"{c}班": [Student(i, f"学生{c}-{i}") for i in range(class_size)]
+        for c in range(1, class_count + 1)
+    }
+    rooms = [(f"第{i}考场", layout_config) for i in range(1, room_count + 1)]
+    allocations = ExamAllocator.allocate_exam(rosters, rooms, max_workers=1)
+
+    print(f"考场资料PDF（{class_count * class_size} 名考生，{room_count} 个考场）")
+    with tempfile.TemporaryDirectory() as directory:
+        for suffix, method_name in ExamDocumentExporter.DOCUMENTS:
+            file_path = os.path.join(directory, f"{method_name}.pdf")
+            rss_before = current_rss()
+            start = time.perf_counter()
+            pages = getattr(ExamDocumentExporter, method_name)(allocations, file_path)
+            elapsed = time.perf_counter() - start
+            rss_growth = (current_rss() - rss_before) / 1024 / 1024
+            report(suffix, f"{pages} 页, {elapsed * 1000:.0f} ms, "
+                           f"{os.path.getsize(file_path) / 1024:.0f} KB, 内存增长 {rss_growth:.1f} MB")
+
+
+@benchmark
+def export_cache(class_count=40, class_size=50, room_count=34):
+    """考场资料首次导出与内容未变化时重复导出的耗时，以及缓存淘汰的耗时"""
+    from exam_allocator import ExamAllocator
+    from exam_documents import ExamDocumentExporter
+    from export_cache import ExportCache
+    from student import Student
+
+    app = _qt_app()
+    layout_config = {f"column{i}": {"rows": 6, "cols": 2} for i in range(1, 6)}
+    rosters = {
+        f"{c}班": [Student(i, f"学生{c}-{i}") for i in range(class_size)]
+        for c in range(1, class_count + 1)
+    }
+    rooms = [(f"第{i}考场", layout_config) for i in range(1, room_count + 1)]
+    allocations = ExamAllocator.allocate_exam(rosters, rooms, max_workers=1)
+
+    print(f"导出缓存（{class_count * class_size} 名考生的考场资料）")
+    with tempfile.TemporaryDirectory() as directory:
+        cache = ExportCache(os.path.join(directory, "cache"))
+        for label in ("首次导出（渲染并写入缓存）", "重复导出（命中缓存）"):
+            start = time.perf_counter()
+            ExamDocumentExporter.write_all(allocations, os.path.join(directory, "考场"), cache=cache)
+            report(label, f"{(time.perf_counter() - start) * 1000:.1f} ms")
+
+        # 500个100KB的缓存文件，上限20MB时淘汰到一半以下
+        source = os.path.join(directory, "blob.bin")
+        with open(source, "wb") as f:
+            f.write(os.urandom(100 * 1024))
+        cache.max_bytes = 1 << 40
+        for i in range(500):
+            cache.store(ExportCache.key("blob", i), ".bin", source)
+        cache.max_bytes = 20 * 1024 * 1024
+        start = time.perf_counter()
+        cache.evict()
+        remaining = len(os.listdir(cache.directory))
+        report("LRU淘汰（500个文件）", f"{(time.perf_counter() - start) * 1000:.1f} ms, 剩余 {remaining} 个")
+
+
+@benchmark
+def tiled_render(group_count=4, rows=25, cols=20, scale=3.125):
+    """2000座礼堂按300DPI分块导出PNG和分页PDF的耗时和峰值内存"""
+    from chart_renderer import ChartRenderer, ChartSnapshot
+
+    app = _qt_app()
+    layout_config = {
+        f"column{i}": {"rows": rows, "cols": cols, "row_height": 60, "col_width": 80}
+        for i in range(1, group_count + 1)
+    }
+    seats = {
+        (col_key, row, col): (index, f"学生{index}")
+        for index, (col_key, row, col) in enumerate(
+            (col_key, row, col) for col_key in layout_config for row in range(rows) for col in range(cols)
+        )
+    }
+    renderer = ChartRenderer(ChartSnapshot(layout_config, {}, seats))
+    size = renderer.size(scale)
+
+    print(f"分块渲染（{len(seats)} 个座位，{size.width()}×{size.height()} 像素）")
+    report("整张QImage所需内存", f"{size.width() * size.height() * 4 / 1024 / 1024:.0f} MB")
+    with tempfile.TemporaryDirectory() as directory:
+        for label, file_name, render in (
+            ("分块PNG", "chart.png", lambda path, progress: renderer.render_tiled_png(path, scale, progress=progress)),
+            ("分页PDF", "chart.pdf", lambda path, progress: renderer.render_tiled_pdf(path, progress=progress)),
+        ):
+            file_path = os.path.join(directory, file_name)
+            rss_before = current_rss()
+            peak = [rss_before]
+            start = time.perf_counter()
+            render(file_path, lambda percent: peak.__setitem__(0, max(peak[0], current_rss())))
+            elapsed = time.perf_counter() - start
+            report(label, f"{elapsed * 1000:.0f} ms, {os.path.getsize(file_path) / 1024 / 1024:.1f} MB, "
+                          f"峰值内存增长 {(peak[0] - rss_before) / 1024 / 1024:.1f} MB")
+
+
+@benchmark
+def theme_switch(group_count=4, rows=25, cols=10):
+    """1000座教室切换主题和更新座位状态的耗时：应用程序级样式表与逐个控件设置样式表"""
+    from PyQt5.QtWidgets import QGridLayout, QWidget
+    from theme_manager import ThemeManager
+    from widgets import SeatWidget
+
+    app = _qt_app()
+    ThemeManager.apply("LIGHT", app)
+    room = QWidget()
+    grid = QGridLayout(room)
+    seats = []
+    for group in range(group_count):
+        for row in range(rows):
+            for col in range(cols):
+                seat = SeatWidget(room, (f"column{group + 1}", row, col))
+                grid.addWidget(seat, row, group * cols + col)
+                seats.append(seat)
+    room.show()
+    app.processEvents()
+
+    def timed(action, repeat=1):
+        """返回(计算样式耗时, 重绘耗时)，单位毫秒"""
+        style_time = paint_time = 0.0
+        for _ in range(repeat):
+            start = time.perf_counter()
+            action()
+            styled = time.perf_counter()
+            app.processEvents()
+            style_time += styled - start
+            paint_time += time.perf_counter() - styled
+        return f"样式 {style_time * 1000 / repeat:.0f} ms + 重绘 {paint_time * 1000 / repeat:.0f} ms"
+
+    themes = iter(("DARK", "LIGHT") * 3)
+    print(f"主题切换（{len(seats)} 个座位）")
+    report("应用程序级样式表切换主题", timed(lambda: ThemeManager.apply(next(themes), app), repeat=6))
+
+    # 旧方式：座位和姓名标签各自设置并解析一份样式表
+    seat_sheet = ("SeatWidget { background-color: #2d2d2d; border: 1px solid #3d3d3d; "
+                  "border-radius: 8px; margin: 2px; padding: 0px; }")
+    label_sheet = "color: #9e9e9e; font-size: 14px;"
+
+    def restyle_each():
+        for seat in seats:
+            seat.setStyleSheet(seat_sheet)
+            seat.label.setStyleSheet(label_sheet)
+
+    report("逐个控件setStyleSheet切换主题", timed(restyle_each))
+
+    highlight_sheet = ("SeatWidget { background-color: #e8f5e9; border: 2px solid #43a047; "
+                       "border-radius: 8px; margin: 2px; padding: 0px; }")
+    report("全部座位高亮（逐个setStyleSheet）", timed(lambda: [seat.setStyleSheet(highlight_sheet) for seat in seats]))
+    for seat in seats:
+        seat.setStyleSheet("")
+        seat.label.setStyleSheet("")
+    app.processEvents()
+
+    report("全部座位高亮（动态属性）", timed(lambda: [seat.set_highlighted(True) for seat in seats]))
+    room.close()
+
+
+@benchmark
+def seat_widgets(count=2000):
+    """自绘座位与卡片座位的单座位内存、创建耗时和首次绘制耗时"""
+    import gc
+    from PyQt5.QtCore import QObject
+    from PyQt5.QtWidgets import QGridLayout, QWidget
+    from student import Student
+    from theme_manager import ThemeManager
+    from widgets import PaintedSeatWidget, SeatWidget
+
+    app = _qt_app()
+    ThemeManager.apply("LIGHT", app)
+    columns = 50
+    print(f"座位控件（{count} 个座位）")
+    # 先测自绘座位，卡片座位可能复用其释放的内存，结果对卡片座位偏乐观
+    for label, seat_class in (("PaintedSeatWidget", PaintedSeatWidget), ("SeatWidget", SeatWidget)):
+        room = QWidget()
+        grid = QGridLayout(room)
+        gc.collect()
+        rss_before = current_rss()
+
+        def build():
+            seats = []
+            for index in range(count):
+                seat = seat_class(room, ("column1", index // columns, index % columns))
+                grid.addWidget(seat, index // columns, index % columns)
+                seats.append(seat)
+            return seats
+
+        seats, python_bytes, create_time = measure_memory(build)
+        for index, seat in enumerate(seats[::2]):
+            seat.set_student(Student(index, f"学生{index}"))
+        app.processEvents()
+        # 显示前测量，不含窗口后备缓冲区
+        rss_growth = current_rss() - rss_before
+        objects = len(room.findChildren(QObject)) - 1  # 不含网格布局
+        start = time.perf_counter()
+        room.show()
+        app.processEvents()
+        paint_time = time.perf_counter() - start
+
+        report(label, f"{rss_growth / count / 1024:.1f} KB/座（Python {python_bytes / count:.0f} B），"
+                      f"{objects / count:.0f} 个QObject/座")
+        report("  创建 / 入座后首次显示", f"{create_time * 1000:.0f} ms / {paint_time * 1000:.0f} ms")
+        room.close()
+        room.deleteLater()
+        del seats
+        app.processEvents()
+
+
+@benchmark
+def presentation_repaint(group_count=4, rows=25, cols=10, width=1920, height=1080, repeat=20):
+    """1000座教室在1080p投影画面上每次重绘都绘制座位表与复用缓存的耗时"""
+    from PyQt5.QtCore import QRect
+    from PyQt5.QtGui import QColor, QPainter, QPixmap
+    from chart_renderer import ChartRenderer, ChartSnapshot
+
+    app = _qt_app()
+    layout_config = {
+        f"column{i}": {"rows": rows, "cols": cols, "row_height": 60, "col_width": 80}
+        for i in range(1, group_count + 1)
+    }
+    seats = {
+        (col_key, row, col): (index, f"学生{index}")
+        for index, (col_key, row, col) in enumerate(
+            (col_key, row, col) for col_key in layout_config for row in range(rows) for col in range(cols)
+        )
+    }
+    snapshot = ChartSnapshot(layout_config, {}, seats)
+    screen = QPixmap(width, height)
+
+    def render_chart():
+        """与PresentationView._render相同：按屏幕尺寸缩放绘制整张座位表"""
+        renderer = ChartRenderer(snapshot)
+        pixmap = QPixmap(width, height)
+        pixmap.fill(QColor(ChartRenderer.BACKGROUND))
+        scale = min(width / renderer.width, height / renderer.height)
+        painter = QPainter(pixmap)
+        painter.scale(scale, scale)
+        renderer.paint(painter)
+        painter.end()
+        return pixmap
+
+    def timed(action):
+        start = time.perf_counter()
+        for _ in range(repeat):
+            action()
+        return (time.perf_counter() - start) / repeat * 1000
+
+    cache = render_chart()
+
+    def blit():
+        painter = QPainter(screen)
+        painter.drawPixmap(QRect(0, 0, width, height), cache, QRect(0, 0, width, height))
+        painter.end()
+
+    print(f"演示模式重绘（{len(seats)} 个座位，{width}×{height}）")
+    report("每次重绘都绘制座位表", f"{timed(render_chart):.1f} ms")
+    report("复用缓存的整屏重绘", f"{timed(blit):.2f} ms")
+    report("缓存内存", f"{cache.width() * cache.height() * cache.depth() // 8 / 1024 / 1024:.1f} MB")
+
+
+@benchmark
+def template_apply(rounds=5):
+    """依次应用内置布局模板的耗时：按模板增量调整并复用座位控件与整个座位表重建"""
+    from PyQt5.QtCore import QCoreApplication, QEvent
+    from PyQt5.QtTest import QTest
+    from layout_templates import LayoutTemplateLibrary
+    from main_window import SeatingChartWindow
+
+    app = _qt_app()
+    templates = [(layout_config, column_names) for _, _, layout_config, column_names in LayoutTemplateLibrary.BUILTIN_TEMPLATES]
+    # 座位表窗口在当前目录（main中设置的临时目录）写入配置和操作日志
+    window = SeatingChartWindow()
+    window.resize(1200, 800)
+    window.show()
+    # 座位表在窗口创建后延迟建立
+    QTest.qWait(300)
+
+    def seats():
+        return [seat for rows in window.columns.values() for row_seats in rows for seat in row_seats]
+
+    print(f"应用布局模板（{len(templates)} 个内置模板轮流应用 {rounds} 轮）")
+    for label, apply in (
+        ("apply_layout（复用座位控件）", lambda layout_config, column_names: window.apply_layout(layout_config, column_names)),
+        ("setup_seating_chart（整体重建）", lambda layout_config, column_names: window.setup_seating_chart(layout_config)),
+    ):
+        elapsed = 0.0
+        created = total = 0
+        for _ in range(rounds):
+            for layout_config, column_names in templates:
+                # 标记应用前的座位，应用后没有标记的是新建的座位
+                for seat in seats():
+                    seat.setProperty("existing", True)
+                start = time.perf_counter()
+                apply(layout_config, column_names)
+                app.processEvents()
+                QCoreApplication.sendPostedEvents(None, QEvent.DeferredDelete)
+                elapsed += time.perf_counter() - start
+                after = seats()
+                created += sum(1 for seat in after if not seat.property("existing"))
+                total += len(after)
+        count = rounds * len(templates)
+        report(label, f"{elapsed / count * 1000:.1f} ms/次，新建座位 {created / total:.0%}")
+    window.close_journal()
+    window.deleteLater()
+    app.processEvents()
+
+
+def main():
+    """主函数
+
+    基准测试在临时工作目录中运行，程序日志、配置和操作日志都写到该目录，
+    不会留在代码仓库中
+    """
+    names = sys.argv[1:] or list(BENCHMARKS)
+    for name in names:
+        if name not in BENCHMARKS:
+            print(f"未知的基准测试: {name}，可选: {', '.join(BENCHMARKS)}")
+            sys.exit(1)
+    working_directory = os.getcwd()
+    with tempfile.TemporaryDirectory(prefix="seats_bench_") as directory:
+        os.chdir(directory)
+        try:
+            for name in names:
+                BENCHMARKS[name]()
+                print()
+        finally:
+            os.chdir(working_directory)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,358 @@
+import math
+
+import numpy as np
+from PyQt5.QtCore import QRectF, QSize, Qt
+from PyQt5.QtGui import QColor, QFont, QImage, QPainter, QPen
+
+from config_manager import ConfigManager
+from pdf_writer import PagedPdfWriter
+from png_writer import StreamingPngWriter
+
+
+class RenderCancelled(Exception):
+    """渲染被取消"""
+
+
+class ChartSnapshot:
+    """座位表数据快照
+
+    在界面线程中复制布局、列名和每个座位上的学生，之后可以交给后台线程渲染，
+    不再访问任何控件
+    """
+    __slots__ = ("layout_config", "column_names", "seats")
+
+    def __init__(self, layout_config, column_names, seats):
+        """初始化快照
+
+        Args:
+            layout_config: 布局配置
+            column_names: 列组键 -> 列名
+            seats: 座位键 -> (学号, 姓名)
+        """
+        self.layout_config = {col_key: dict(config) for col_key, config in layout_config.items()}
+        self.column_names = dict(column_names)
+        self.seats = dict(seats)
+
+    @staticmethod
+    def capture(window):
+        """从座位表窗口获取快照
+
+        Args:
+            window: SeatingChartWindow
+
+        Returns:
+            ChartSnapshot: 快照
+        """
+        return ChartSnapshot(
+            window.current_layout_config,
+            window.config.get("column_names", {}),
+            {
+                seat_key: (student.student_id, student.name)
+                for seat_key, student in window.occupied_seats().items()
+            }
+        )
+
+    def column_name(self, col_key):
+        """列组名称，配置中缺少时使用"列N" """
+        return self.column_names.get(col_key) or ConfigManager.default_column_name(col_key)
+
+    def payload(self):
+        """决定导出结果的内容，用于计算导出缓存的哈希键
+
+        Returns:
+            dict: 可JSON序列化的内容
+        """
+        return {
+            "layout_config": self.layout_config,
+            "column_names": self.column_names,
+            "seats": sorted([list(seat_key), student_id, name] for seat_key, (student_id, name) in self.seats.items()),
+        }
+
+
+class ChartRenderer:
+    """座位表绘制器
+
+    按快照直接用QPainter绘制列标题、座位和讲台，与界面上的座位表保持相同的配色。
+    只使用QImage和QPainter，可以在后台线程中使用。
+
+    大教室按高分辨率导出时，PNG按固定大小的图块逐条绘制并流式写入编码器，
+    PDF按页切分绘制，内存占用只取决于图块大小而与座位表大小无关
+    """
+    MARGIN = 20
+    GROUP_GAP = 30
+    GRID_PADDING = 10
+    SEAT_SPACING = 4
+    TITLE_HEIGHT = 50
+    TITLE_GAP = 15
+    DESK_GAP = 30
+    DESK_SIZE = (240, 90)
+    # 分块绘制时图块的边长（像素），以及每条图块带的像素缓冲上限（字节）
+    TILE_SIZE = 512
+    BAND_BYTES = 16 * 1024 * 1024
+    # 分页PDF中一个绘制单位（界面上的1像素）对应的毫米数
+    PDF_MM_PER_UNIT = 25.4 / 96
+
+    BACKGROUND = "#ffffff"
+    GRID_BACKGROUND = "#f5f5f5"
+    TITLE_COLORS = ("#e3f2fd", "#1976d2", "#1976d2")  # 背景、边框、文字
+    OCCUPIED_COLORS = ("#e3f2fd", "#90caf9", "#333333")
+    EMPTY_COLORS = ("#f5f5f5", "#e0e0e0", "#757575")
+    DESK_COLORS = ("#e0f2f1", "#26a69a", "#00796b")
+
+    def __init__(self, snapshot):
+        """根据快照计算各部分的位置
+
+        Args:
+            snapshot: ChartSnapshot
+        """
+        self.snapshot = snapshot
+        self.groups = []  # (列组键, 网格矩形, 标题矩形, 座位宽, 座位高)
+        x = self.MARGIN
+        max_height = 0
+        for col_key, config in snapshot.layout_config.items():
+            rows, cols = config["rows"], config["cols"]
+            seat_width, seat_height = config.get("col_width", 80), config.get("row_height", 60)
+            grid_width = 2 * self.GRID_PADDING + cols * seat_width + max(cols - 1, 0) * self.SEAT_SPACING
+            grid_height = 2 * self.GRID_PADDING + rows * seat_height + max(rows - 1, 0) * self.SEAT_SPACING
+            group_height = self.TITLE_HEIGHT + self.TITLE_GAP + grid_height
+            title = QRectF(x, self.MARGIN, grid_width, self.TITLE_HEIGHT)
+            grid = QRectF(x, self.MARGIN + self.TITLE_HEIGHT + self.TITLE_GAP, grid_width, grid_height)
+            self.groups.append((col_key, grid, title, seat_width, seat_height))
+            x += grid_width + self.GROUP_GAP
+            max_height = max(max_height, group_height)
+
+        self.width = max(int(x - self.GROUP_GAP + self.MARGIN), self.DESK_SIZE[0] + 2 * self.MARGIN)
+        desk_top = self.MARGIN + max_height + self.DESK_GAP
+        self.desk = QRectF((self.width - self.DESK_SIZE[0]) / 2, desk_top, *self.DESK_SIZE)
+        self.height = int(desk_top + self.DESK_SIZE[1] + self.MARGIN)
+
+        self.title_font = QFont("Microsoft YaHei")
+        self.title_font.setPixelSize(18)
+        self.title_font.setBold(True)
+        self.seat_font = QFont("Microsoft YaHei")
+        self.seat_font.setPixelSize(14)
+
+    def size(self, scale=1.0):
+        """绘制区域的像素尺寸
+
+        Args:
+            scale: 缩放比例
+
+        Returns:
+            QSize: 尺寸
+        """
+        return QSize(max(1, round(self.width * scale)), max(1, round(self.height * scale)))
+
+    def seat_rect(self, grid, seat_width, seat_height, row, col):
+        """座位在绘制区域中的矩形"""
+        return QRectF(
+            grid.x() + self.GRID_PADDING + col * (seat_width + self.SEAT_SPACING),
+            grid.y() + self.GRID_PADDING + row * (seat_height + self.SEAT_SPACING),
+            seat_width, seat_height
+        )
+
+    @staticmethod
+    def _box(painter, rect, colors, radius=8, width=1):
+        """绘制圆角背景框"""
+        painter.setPen(QPen(QColor(colors[1]), width))
+        painter.setBrush(QColor(colors[0]))
+        painter.drawRoundedRect(rect, radius, radius)
+
+    def paint_group(self, painter, index, clip=None):
+        """绘制一个列组的标题和座位
+
+        Args:
+            painter: QPainter，坐标为未缩放的绘制区域坐标
+            index: 列组序号
+            clip: 需要绘制的区域，为None时绘制全部；只绘制与该区域相交的标题和座位
+        """
+        col_key, grid, title, seat_width, seat_height = self.groups[index]
+        config = self.snapshot.layout_config[col_key]
+        if clip is None or clip.intersects(title):
+            self._box(painter, title, self.TITLE_COLORS, width=2)
+            painter.setPen(QColor(self.TITLE_COLORS[2]))
+            painter.setFont(self.title_font)
+            painter.drawText(title, Qt.AlignCenter, self.snapshot.column_name(col_key))
+        if clip is not None and not clip.intersects(grid):
+            return
+
+        painter.setPen(Qt.NoPen)
+        painter.setBrush(QColor(self.GRID_BACKGROUND))
+        painter.drawRoundedRect(grid, 8, 8)
+
+        # 按区域计算需要绘制的行列范围
+        rows, cols = range(config["rows"]), range(config["cols"])
+        if clip is not None:
+            step_x, step_y = seat_width + self.SEAT_SPACING, seat_height + self.SEAT_SPACING
+            origin_x, origin_y = grid.x() + self.GRID_PADDING, grid.y() + self.GRID_PADDING
+            cols = range(max(0, math.floor((clip.left() - origin_x) / step_x)),
+                         min(config["cols"], math.floor((clip.right() - origin_x) / step_x) + 1))
+            rows = range(max(0, math.floor((clip.top() - origin_y) / step_y)),
+                         min(config["rows"], math.floor((clip.bottom() - origin_y) / step_y) + 1))
+
+        painter.setFont(self.seat_font)
+        seats = self.snapshot.seats
+        for row in rows:
+            for col in cols:
+                rect = self.seat_rect(grid, seat_width, seat_height, row, col)
+                seat = seats.get((col_key, row, col))
+                colors = self.OCCUPIED_COLORS if seat is not None else self.EMPTY_COLORS
+                self._box(painter, rect.adjusted(2, 2, -2, -2), colors)
+                painter.setPen(QColor(colors[2]))
+                painter.drawText(rect, Qt.AlignCenter | Qt.TextWordWrap, seat[1] if seat is not None else "空座位")
+
+    def paint_desk(self, painter):
+        """绘制讲台"""
+        self._box(painter, self.desk, self.DESK_COLORS, width=2)
+        painter.setPen(QColor(self.DESK_COLORS[2]))
+        painter.setFont(self.title_font)
+        painter.drawText(self.desk, Qt.AlignCenter, "讲 台")
+
+    def paint(self, painter, clip=None, progress=None, cancelled=None):
+        """绘制座位表
+
+        Args:
+            painter: QPainter，坐标为未缩放的绘制区域坐标
+            clip: 需要绘制的区域，为None时绘制全部
+            progress: 进度回调progress(百分比)
+            cancelled: 无参函数，返回True时停止绘制
+
+        Raises:
+            RenderCancelled: 绘制被取消
+        """
+        painter.setRenderHint(QPainter.Antialiasing)
+        painter.setRenderHint(QPainter.TextAntialiasing)
+        painter.fillRect(clip if clip is not None else QRectF(0, 0, self.width, self.height), QColor(self.BACKGROUND))
+        for index in range(len(self.groups)):
+            if cancelled is not None and cancelled():
+                raise RenderCancelled()
+            self.paint_group(painter, index, clip)
+            if progress is not None:
+                progress(int((index + 1) * 90 / (len(self.groups) + 1)))
+        if clip is None or clip.intersects(self.desk):
+            self.paint_desk(painter)
+
+    def render_image(self, file_path, scale=1.0, progress=None, cancelled=None):
+        """把座位表绘制为文件，格式由扩展名决定
+
+        PNG分块流式写入，PDF按页切分绘制；其他格式（如JPEG）的编码器需要完整图片，
+        整张绘制后保存
+
+        Args:
+            file_path: 输出文件路径
+            scale: 缩放比例（PDF为矢量输出，不受影响）
+            progress: 进度回调progress(百分比)
+            cancelled: 无参函数，返回True时停止绘制
+
+        Raises:
+            RenderCancelled: 绘制被取消
+            IOError: 文件保存失败
+        """
+        ext = file_path.lower().rsplit(".", 1)[-1]
+        if ext == "png":
+            self.render_tiled_png(file_path, scale, progress=progress, cancelled=cancelled)
+            return
+        if ext == "pdf":
+            self.render_tiled_pdf(file_path, progress=progress, cancelled=cancelled)
+            return
+
+        image = QImage(self.size(scale), QImage.Format_RGB32)
+        if image.isNull():
+            raise IOError(f"图片过大，无法分配内存，请导出为PNG或PDF: {file_path}")
+        painter = QPainter(image)
+        try:
+            painter.scale(scale, scale)
+            self.paint(painter, progress=progress, cancelled=cancelled)
+        finally:
+            painter.end()
+        if cancelled is not None and cancelled():
+            raise RenderCancelled()
+        if not image.save(file_path):
+            raise IOError(f"图片保存失败: {file_path}")
+        if progress is not None:
+            progress(100)
+
+    def render_tiled_png(self, file_path, scale=1.0, tile_size=None, progress=None, cancelled=None):
+        """分块绘制座位表并流式写入PNG
+
+        从上到下逐条绘制图块带，每条带由若干图块拼成后立即压缩写出。
+        带的高度按BAND_BYTES限制，内存占用不随图片大小增长
+
+        Args:
+            file_path: PNG文件路径
+            scale: 缩放比例
+            tile_size: 图块边长（像素），默认TILE_SIZE
+            progress: 进度回调progress(百分比)
+            cancelled: 无参函数，返回True时停止绘制
+
+        Raises:
+            RenderCancelled: 绘制被取消
+        """
+        tile_size = tile_size or self.TILE_SIZE
+        size = self.size(scale)
+        width, height = size.width(), size.height()
+        band_height = max(1, min(tile_size, self.BAND_BYTES // (width * 3)))
+        tile = QImage(min(tile_size, width), band_height, QImage.Format_RGB32)
+        background = QColor(self.BACKGROUND)
+
+        with StreamingPngWriter(file_path, width, height) as writer:
+            for top in range(0, height, band_height):
+                rows = min(band_height, height - top)
+                band = np.empty((rows, width, 3), dtype=np.uint8)
+                for left in range(0, width, tile.width()):
+                    if cancelled is not None and cancelled():
+                        raise RenderCancelled()
+                    tile.fill(background)
+                    painter = QPainter(tile)
+                    try:
+                        painter.translate(-left, -top)
+                        painter.scale(scale, scale)
+                        self.paint(painter, QRectF(left / scale, top / scale,
+                                                   tile.width() / scale, band_height / scale))
+                    finally:
+                        painter.end()
+                    columns = min(tile.width(), width - left)
+                    # Format_RGB32在内存中的字节顺序为B、G、R、A
+                    bits = tile.constBits()
+                    bits.setsize(tile.byteCount())
+                    pixels = np.frombuffer(bits, dtype=np.uint8).reshape(tile.height(), tile.bytesPerLine())
+                    pixels = pixels[:rows, :columns * 4].reshape(rows, columns, 4)
+                    band[:, left:left + columns] = pixels[:, :, 2::-1]
+                writer.write_rows(band)
+                if progress is not None:
+                    progress(int((top + rows) * 100 / height))
+
+    def render_tiled_pdf(self, file_path, progress=None, cancelled=None):
+        """把座位表按页切分绘制为多页PDF（矢量），每页绘制座位表的一块区域
+
+        Args:
+            file_path: PDF文件路径
+            progress: 进度回调progress(百分比)
+            cancelled: 无参函数，返回True时停止绘制
+
+        Raises:
+            RenderCancelled: 绘制被取消
+        """
+        landscape = self.width > self.height
+        with PagedPdfWriter(file_path, landscape=landscape) as writer:
+            # 设备像素/绘制单位
+            scale = writer.mm(self.PDF_MM_PER_UNIT)
+            page_width, page_height = writer.width / scale, writer.height / scale
+            columns = max(1, math.ceil(self.width / page_width))
+            rows = max(1, math.ceil(self.height / page_height))
+            for page in range(rows * columns):
+                if cancelled is not None and cancelled():
+                    raise RenderCancelled()
+                left = (page % columns) * page_width
+                top = (page // columns) * page_height
+                writer.new_page()
+                painter = writer.painter
+                painter.save()
+                painter.scale(scale, scale)
+                painter.translate(-left, -top)
+                clip = QRectF(left, top, page_width, page_height)
+                painter.setClipRect(clip)
+                self.paint(painter, clip)
+                painter.restore()
+                if progress is not None:
+                    progress(int((page + 1) * 100 / (rows * columns)))
@@ -1,11 +1,16 @@
 import json
 import os
+import re
+
 
 class ConfigManager:
     """配置管理器
     
     负责加载、保存和管理应用程序的配置数据
     """
+    # 列组键的格式，编号可以有多位，例如column12
+    COLUMN_KEY = re.compile(r"column(\d+)$")
+
     # 默认配置定义
     DEFAULT_CONFIG = {
         "layout_config": {
@@ -27,11 +32,37 @@ class ConfigManager:
             "size_percentage": 0.85
         },
         "theme": "LIGHT",
-        "styles": {
-            "main_window": "background-color: #f5f7fa;"
+        "seat_widget": "painted",
+        "watchdog": {
+            "enabled": False,
+            "threshold_ms": 50
+        },
+        "journal": {
+            "enabled": True,
+            "directory": "recovery",
+            "compact_every": 200
+        },
+        "constraints": {
+            "group_size": 4,
+            "keep_apart": [],
+            "front_row": []
+        },
+        "export_image": {
+            "scale": 2.0
+        },
+        "export_cache": {
+            "enabled": True,
+            "directory": "cache/exports",
+            "max_mb": 200
+        },
+        "layout_templates": {
+            "directory": "templates"
         }
     }
 
+    # 由用户增删条目的配置项（例如列组），加载时不补充默认条目
+    USER_DEFINED_KEYS = ("layout_config", "column_names")
+
     def __init__(self, config_file="config.json"):
         """初始化配置管理器
         
@@ -55,7 +86,7 @@ class ConfigManager:
                     for key, value in self.DEFAULT_CONFIG.items():
                         if key not in config:
                             config[key] = value
-                        elif isinstance(value, dict):
+                        elif isinstance(value, dict) and key not in self.USER_DEFINED_KEYS:
                             for sub_key, sub_value in value.items():
                                 if sub_key not in config[key]:
                                     config[key][sub_key] = sub_value
@@ -113,4 +144,17 @@ class ConfigManager:
             new_layout_config: 新的布局配置数据
         """
         self.config["layout_config"] = new_layout_config
-        self.save_config(self.config)
\ No newline at end of file
+        self.save_config(self.config)
+
+    @staticmethod
+    def default_column_name(col_key):
+        """配置中没有列名时列组的默认名称
+
+        Args:
+            col_key: 列组键，例如column12
+
+        Returns:
+            str: "列N"，N为列组键的完整编号；列组键不是columnN格式时返回列组键本身
+        """
+        match = ConfigManager.COLUMN_KEY.match(col_key)
+        return f"列{match.group(1)}" if match else col_key
@@ -0,0 +1,248 @@
+import csv
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+from utils import LogManager
+
+layout_logger = LogManager.get_logger('layout')
+
+
+class RoomAllocation:
+    """单个考场的编排结果"""
+    __slots__ = ("room_name", "layout_config", "seats", "seat_numbers", "violations")
+
+    def __init__(self, room_name, layout_config):
+        """初始化考场编排结果
+
+        Args:
+            room_name: 考场名称
+            layout_config: 考场的布局配置（与座位表的layout_config格式相同）
+        """
+        self.room_name = room_name
+        self.layout_config = layout_config
+        self.seats = {}          # 座位键 -> (班级名, Student)
+        self.seat_numbers = {}   # 座位键 -> 考场内座位号（从1开始）
+        self.violations = 0      # 同班相邻的座位对数量
+
+    def ordered_seats(self):
+        """按座位号顺序列出已安排的座位
+
+        Returns:
+            list: (座位号, 座位键, 班级名, Student)列表
+        """
+        return sorted(
+            (self.seat_numbers[seat_key], seat_key, class_name, student)
+            for seat_key, (class_name, student) in self.seats.items()
+        )
+
+
+class ExamAllocator:
+    """考场编排器
+
+    把一个年级多个班级的学生分配到多个考场（每个考场使用与座位表相同的列组布局），
+    保证同班学生不相邻，并为每个考场单独编排座位号。各考场在进程池中并行求解。
+    """
+    # 考场数少于该值时直接在当前进程中计算，避免进程启动开销
+    PARALLEL_MIN_ROOMS = 8
+
+    @staticmethod
+    def seat_order(layout_config):
+        """考场座位的编号顺序：按列组顺序，每个列组内逐行从左到右
+
+        Args:
+            layout_config: 布局配置
+
+        Returns:
+            list: 座位键列表
+        """
+        return [
+            (col_key, row, col)
+            for col_key, config in layout_config.items()
+            for row in range(config["rows"])
+            for col in range(config["cols"])
+        ]
+
+    @staticmethod
+    def room_capacity(layout_config):
+        """计算考场座位数"""
+        return sum(config["rows"] * config["cols"] for config in layout_config.values())
+
+    @staticmethod
+    def _earlier_neighbors(seat_key, diagonal):
+        """按编号顺序已经安排过的相邻座位（同一列组内）"""
+        col_key, row, col = seat_key
+        neighbors = [(col_key, row - 1, col), (col_key, row, col - 1)]
+        if diagonal:
+            neighbors.extend([(col_key, row - 1, col - 1), (col_key, row - 1, col + 1)])
+        return neighbors
+
+    @staticmethod
+    def _interleave(class_sizes):
+        """把各班学生交错排成一个序列，每一步取剩余人数最多的班级
+
+        Args:
+            class_sizes: 各班人数列表
+
+        Returns:
+            list: (班级下标, 班内学生下标)序列
+        """
+        taken = [0] * len(class_sizes)
+        total = sum(class_sizes)
+        sequence = []
+        for _ in range(total):
+            class_index = max(range(len(class_sizes)), key=lambda i: (class_sizes[i] - taken[i], -i))
+            sequence.append((class_index, taken[class_index]))
+            taken[class_index] += 1
+        return sequence
+
+    @staticmethod
+    def allocate_room(layout_config, students, diagonal=False):
+        """为单个考场安排座位（可在子进程中运行）
+
+        逐个座位贪心选择：在前方和左侧相邻座位都没有出现过的班级中，选剩余人数最多的班级；
+        没有可选班级且空座位仍有富余时留空该座位，否则只能安排同班学生，
+        与每个同班的前方或左侧相邻学生各计为一对冲突
+
+        Args:
+            layout_config: 考场布局配置
+            students: 分到该考场的(班级下标, 班内学生下标)列表
+            diagonal: 斜对角是否也算相邻
+
+        Returns:
+            tuple: (座位键 -> (班级下标, 班内学生下标)的字典, 同班相邻的座位对数量)
+        """
+        queues = {}
+        for class_index, student_index in students:
+            queues.setdefault(class_index, []).append(student_index)
+        for queue in queues.values():
+            queue.reverse()  # 从末尾弹出，保持原有顺序
+
+        seats = ExamAllocator.seat_order(layout_config)
+        remaining = len(students)
+        assigned = {}
+        violations = 0
+
+        for position, seat_key in enumerate(seats):
+            if remaining == 0:
+                break
+            neighbor_classes = [
+                assigned[neighbor][0] for neighbor in ExamAllocator._earlier_neighbors(seat_key, diagonal)
+                if neighbor in assigned
+            ]
+            candidates = [c for c, queue in queues.items() if queue and c not in neighbor_classes]
+            spare_seats = len(seats) - position - remaining
+            forced = not candidates
+            if forced:
+                if spare_seats > 0:
+                    continue
+                candidates = [c for c, queue in queues.items() if queue]
+            class_index = max(candidates, key=lambda c: (len(queues[c]), -c))
+            if forced:
+                violations += neighbor_classes.count(class_index)
+            assigned[seat_key] = (class_index, queues[class_index].pop())
+            remaining -= 1
+
+        return assigned, violations
+
+    @staticmethod
+    def _allocate_room_task(args):
+        """进程池任务包装"""
+        return ExamAllocator.allocate_room(*args)
+
+    @staticmethod
+    def allocate_exam(rosters, rooms, diagonal=False, max_workers=None):
+        """多考场编排：把多个班级的学生分配到多个考场，同班学生互不相邻
+
+        先把各班学生交错排成一个序列，按考场容量依次切分，保证每个考场的班级构成均衡；
+        再在进程池中并行为每个考场安排座位并编号
+
+        Args:
+            rosters: 班级名 -> Student列表（有序字典）
+            rooms: (考场名称, 布局配置)列表
+            diagonal: 斜对角是否也算相邻
+            max_workers: 进程数，为1时在当前进程中计算
+
+        Returns:
+            list: RoomAllocation列表
+
+        Raises:
+            ValueError: 考场总座位数不足
+        """
+        class_names = list(rosters)
+        class_students = [rosters[name] for name in class_names]
+        total = sum(len(students) for students in class_students)
+        capacities = [ExamAllocator.room_capacity(layout_config) for _, layout_config in rooms]
+        if total > sum(capacities):
+            raise ValueError(f"考场座位不足：共 {total} 名学生，只有 {sum(capacities)} 个座位")
+
+        # 按容量比例确定每个考场的人数，余数依次分给前面还有空位的考场
+        total_capacity = sum(capacities)
+        quotas = [total * capacity // total_capacity for capacity in capacities]
+        remainder = total - sum(quotas)
+        for index, capacity in enumerate(capacities):
+            if remainder == 0:
+                break
+            if quotas[index] < capacity:
+                quotas[index] += 1
+                remainder -= 1
+
+        sequence = ExamAllocator._interleave([len(students) for students in class_students])
+        tasks = []
+        start = 0
+        for (_, layout_config), quota in zip(rooms, quotas):
+            tasks.append((layout_config, sequence[start:start + quota], diagonal))
+            start += quota
+
+        if max_workers == 1 or len(tasks) < ExamAllocator.PARALLEL_MIN_ROOMS:
+            results = [ExamAllocator._allocate_room_task(task) for task in tasks]
+        else:
+            with ProcessPoolExecutor(max_workers=max_workers) as executor:
+                results = list(executor.map(ExamAllocator._allocate_room_task, tasks, chunksize=max(1, len(tasks) // 16)))
+
+        allocations = []
+        for (room_name, layout_config), (assigned, violations) in zip(rooms, results):
+            allocation = RoomAllocation(room_name, layout_config)
+            allocation.violations = violations
+            number = 0
+            for seat_key in ExamAllocator.seat_order(layout_config):
+                if seat_key in assigned:
+                    class_index, student_index = assigned[seat_key]
+                    number += 1
+                    allocation.seats[seat_key] = (
+                        class_names[class_index], class_students[class_index][student_index]
+                    )
+                    allocation.seat_numbers[seat_key] = number
+            allocations.append(allocation)
+
+        LogManager.info(
+            layout_logger,
+            f"考场编排完成：{total} 名学生，{len(rooms)} 个考场，"
+            f"同班相邻 {sum(a.violations for a in allocations)} 对"
+        )
+        return allocations
+
+    @staticmethod
+    def write_allocation_csv(allocations, file_path, column_names=None):
+        """把考场编排结果写入CSV文件
+
+        Args:
+            allocations: RoomAllocation列表
+            file_path: 输出文件路径
+            column_names: 列组键 -> 列名，缺省时使用列组键
+        """
+        column_names = column_names or {}
+        with open(file_path, 'w', encoding='utf-8-sig', newline='') as f:
+            writer = csv.writer(f)
+            writer.writerow(["考场", "座位号", "列组", "排", "列", "班级", "姓名"])
+            for allocation in allocations:
+                for number, (col_key, row, col), class_name, student in allocation.ordered_seats():
+                    writer.writerow([
+                        allocation.room_name, f"{number:02d}",
+                        column_names.get(col_key, col_key), row + 1, col + 1,
+                        class_name, student.name
+                    ])
+
+    @staticmethod
+    def class_name_from_path(file_path):
+        """用CSV文件名（不含扩展名）作为班级名"""
+        return os.path.splitext(os.path.basename(file_path))[0]
@@ -0,0 +1,187 @@
+from datetime import datetime
+
+from PyQt5.QtCore import QRectF, Qt
+from PyQt5.QtGui import QColor, QPen
+
+from pdf_writer import PagedPdfWriter
+
+
+class ExamDocumentExporter:
+    """考场资料导出器
+
+    根据考场编排结果逐页生成门贴（考场考生名单）、桌贴和签到表PDF，
+    考场和考生按顺序逐个读取并绘制，生成数千页时内存占用也保持平稳
+    """
+    # 桌贴每页的行列数（A4纸）
+    LABEL_COLUMNS = 3
+    LABEL_ROWS = 8
+
+    @staticmethod
+    def _seat_text(seat_key, column_names):
+        """座位位置文本，例如"第一组 第2排第1列\""""
+        col_key, row, col = seat_key
+        return f"{column_names.get(col_key, col_key)} 第{row + 1}排第{col + 1}列"
+
+    @staticmethod
+    def write_door_lists(allocations, file_path, column_names=None):
+        """生成门贴：每个考场一份考生名单，贴在考场门口
+
+        Args:
+            allocations: RoomAllocation列表
+            file_path: 输出文件路径
+            column_names: 列组键 -> 列名
+
+        Returns:
+            int: 页数
+        """
+        column_names = column_names or {}
+        with PagedPdfWriter(file_path) as writer:
+            for allocation in allocations:
+                rows = (
+                    (f"{number:02d}", student.name, class_name,
+                     ExamDocumentExporter._seat_text(seat_key, column_names))
+                    for number, seat_key, class_name, student in allocation.ordered_seats()
+                )
+                writer.table(
+                    f"{allocation.room_name} 考生名单", ["座位号", "姓名", "班级", "座位位置"],
+                    [1, 2, 2, 3], rows, row_height_mm=7.5,
+                    footer=f"共 {len(allocation.seats)} 人"
+                )
+            return writer.page_count
+
+    @staticmethod
+    def write_sign_in_sheets(allocations, file_path, column_names=None):
+        """生成签到表：每个考场一份，留出考生签名栏
+
+        Args:
+            allocations: RoomAllocation列表
+            file_path: 输出文件路径
+            column_names: 列组键 -> 列名（签到表不使用，保持接口一致）
+
+        Returns:
+            int: 页数
+        """
+        printed_at = datetime.now().strftime("%Y年%m月%d日")
+        with PagedPdfWriter(file_path) as writer:
+            for allocation in allocations:
+                rows = (
+                    (f"{number:02d}", student.name, class_name, "")
+                    for number, _, class_name, student in allocation.ordered_seats()
+                )
+                writer.table(
+                    f"{allocation.room_name} 考生签到表", ["座位号", "姓名", "班级", "签名"],
+                    [1, 2, 2, 3], rows, row_height_mm=10,
+                    footer=f"应到 {len(allocation.seats)} 人    实到____人    监考签名__________    {printed_at}"
+                )
+            return writer.page_count
+
+    @staticmethod
+    def write_desk_labels(allocations, file_path, column_names=None):
+        """生成桌贴：每个考生一张，按考场和座位号顺序排版
+
+        Args:
+            allocations: RoomAllocation列表
+            file_path: 输出文件路径
+            column_names: 列组键 -> 列名
+
+        Returns:
+            int: 页数
+        """
+        column_names = column_names or {}
+        columns = ExamDocumentExporter.LABEL_COLUMNS
+        rows = ExamDocumentExporter.LABEL_ROWS
+        per_page = columns * rows
+
+        with PagedPdfWriter(file_path) as writer:
+            label_width = writer.width / columns
+            label_height = writer.height / rows
+            padding = writer.mm(2)
+            border_pen = QPen(QColor("#999999"))
+            border_pen.setWidthF(writer.mm(0.2))
+            border_pen.setStyle(Qt.DashLine)
+            text_pen = QPen(QColor("#000000"))
+            fonts = {
+                "room": writer.font(9),
+                "number": writer.font(22, True),
+                "name": writer.font(14, True),
+                "detail": writer.font(8),
+            }
+            painter = writer.painter
+
+            index = 0
+            for allocation in allocations:
+                for number, seat_key, class_name, student in allocation.ordered_seats():
+                    slot = index % per_page
+                    if slot == 0:
+                        writer.new_page()
+                    index += 1
+
+                    x = (slot % columns) * label_width
+                    y = (slot // columns) * label_height
+                    painter.setPen(border_pen)
+                    painter.drawRect(QRectF(x, y, label_width, label_height))
+
+                    inner = QRectF(x + padding, y + padding, label_width - padding * 2, label_height - padding * 2)
+                    line = inner.height() / 4
+                    painter.setPen(text_pen)
+                    painter.setFont(fonts["room"])
+                    painter.drawText(QRectF(inner.x(), inner.y(), inner.width(), line),
+                                     Qt.AlignLeft | Qt.AlignVCenter, allocation.room_name)
+                    painter.setFont(fonts["number"])
+                    painter.drawText(QRectF(inner.x(), inner.y(), inner.width(), line * 2),
+                                     Qt.AlignRight | Qt.AlignVCenter, f"{number:02d}")
+                    painter.setFont(fonts["name"])
+                    painter.drawText(QRectF(inner.x(), inner.y() + line * 2, inner.width(), line),
+                                     Qt.AlignLeft | Qt.AlignVCenter, student.name)
+                    painter.setFont(fonts["detail"])
+                    painter.drawText(QRectF(inner.x(), inner.y() + line * 3, inner.width(), line),
+                                     Qt.AlignLeft | Qt.AlignVCenter,
+                                     f"{class_name}  {ExamDocumentExporter._seat_text(seat_key, column_names)}")
+            return writer.page_count
+
+    # 文件名后缀 -> 生成函数，用于一次导出全部考场资料
+    DOCUMENTS = (
+        ("门贴", "write_door_lists"),
+        ("桌贴", "write_desk_labels"),
+        ("签到表", "write_sign_in_sheets"),
+    )
+
+    @staticmethod
+    def _cache_payload(allocations, column_names):
+        """考场资料的缓存内容：各考场的布局、座位号和考生"""
+        return {
+            "column_names": column_names or {},
+            "rooms": [
+                [allocation.room_name, allocation.layout_config, [
+                    [number, list(seat_key), class_name, student.student_id, student.name]
+                    for number, seat_key, class_name, student in allocation.ordered_seats()
+                ]]
+                for allocation in allocations
+            ],
+        }
+
+    @staticmethod
+    def write_all(allocations, base_path, column_names=None, cache=None):
+        """生成全部考场资料，文件名为"<base_path>_门贴.pdf"等
+
+        Args:
+            allocations: RoomAllocation列表
+            base_path: 不含扩展名的文件路径前缀
+            column_names: 列组键 -> 列名
+            cache: ExportCache，考场安排没有变化时直接复用缓存的PDF
+
+        Returns:
+            list: 生成的文件路径列表
+        """
+        payload = ExamDocumentExporter._cache_payload(allocations, column_names) if cache is not None else None
+        file_paths = []
+        for suffix, method_name in ExamDocumentExporter.DOCUMENTS:
+            file_path = f"{base_path}_{suffix}.pdf"
+            write = getattr(ExamDocumentExporter, method_name)
+            if cache is None:
+                write(allocations, file_path, column_names)
+            else:
+                cache.export(f"exam_{method_name}", payload, file_path,
+                             lambda path, write=write: write(allocations, path, column_names))
+            file_paths.append(file_path)
+        return file_paths
@@ -0,0 +1,133 @@
+import hashlib
+import json
+import os
+import shutil
+
+from utils import LogManager
+
+file_logger = LogManager.get_logger('file')
+
+
+class ExportCache:
+    """导出结果缓存
+
+    以导出内容（布局、姓名、导出选项等）的哈希值为键，把导出的图片和PDF保存在磁盘缓存目录中。
+    内容没有变化时直接复制缓存文件，跳过渲染。缓存文件的修改时间记录最近使用时间，
+    总大小超过上限时按最近最少使用的顺序删除。
+    """
+    def __init__(self, directory="cache/exports", max_bytes=200 * 1024 * 1024, enabled=True):
+        """初始化导出缓存
+
+        Args:
+            directory: 缓存目录
+            max_bytes: 缓存总大小上限（字节）
+            enabled: 是否启用缓存
+        """
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.enabled = enabled
+
+    @staticmethod
+    def key(kind, payload):
+        """计算导出内容的哈希键
+
+        Args:
+            kind: 导出类型，例如"image"、"pdf"
+            payload: 决定导出结果的全部内容，可JSON序列化
+
+        Returns:
+            str: 十六进制哈希值
+        """
+        data = json.dumps([kind, payload], ensure_ascii=False, sort_keys=True, separators=(",", ":"), default=str)
+        return hashlib.sha256(data.encode("utf-8")).hexdigest()
+
+    def _path(self, key, ext):
+        """缓存文件路径"""
+        return os.path.join(self.directory, key + ext.lower())
+
+    def fetch(self, key, ext, file_path):
+        """缓存命中时把缓存文件复制到目标路径，并更新最近使用时间
+
+        Args:
+            key: 哈希键
+            ext: 文件扩展名（含"."）
+            file_path: 目标文件路径
+
+        Returns:
+            bool: 是否命中缓存
+        """
+        if not self.enabled:
+            return False
+        cached_path = self._path(key, ext)
+        if not os.path.exists(cached_path):
+            return False
+        try:
+            shutil.copyfile(cached_path, file_path)
+            os.utime(cached_path)
+        except OSError as e:
+            LogManager.warning(file_logger, f"读取导出缓存失败: {str(e)}")
+            return False
+        LogManager.info(file_logger, f"导出缓存命中: {os.path.basename(file_path)}")
+        return True
+
+    def store(self, key, ext, file_path):
+        """把导出的文件保存到缓存，并按大小上限淘汰旧文件
+
+        Args:
+            key: 哈希键
+            ext: 文件扩展名（含"."）
+            file_path: 刚导出的文件路径
+        """
+        if not self.enabled or not os.path.exists(file_path):
+            return
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            cached_path = self._path(key, ext)
+            temp_path = cached_path + ".tmp"
+            shutil.copyfile(file_path, temp_path)
+            os.replace(temp_path, cached_path)
+            self.evict()
+        except OSError as e:
+            LogManager.warning(file_logger, f"写入导出缓存失败: {str(e)}")
+
+    def evict(self):
+        """缓存总大小超过上限时，按最近使用时间从旧到新删除缓存文件"""
+        entries = []
+        total = 0
+        with os.scandir(self.directory) as it:
+            for entry in it:
+                if entry.is_file() and not entry.name.endswith(".tmp"):
+                    stat = entry.stat()
+                    entries.append((stat.st_mtime, stat.st_size, entry.path))
+                    total += stat.st_size
+        if total <= self.max_bytes:
+            return
+        entries.sort()
+        for _, size, path in entries:
+            if total <= self.max_bytes:
+                break
+            try:
+                os.remove(path)
+                total -= size
+            except OSError:
+                pass
+
+    def export(self, kind, payload, file_path, render):
+        """带缓存的导出：命中缓存时直接复制，否则调用render生成文件后存入缓存
+
+        Args:
+            kind: 导出类型
+            payload: 决定导出结果的全部内容
+            file_path: 目标文件路径
+            render: 函数render(file_path)，生成导出文件
+
+        Returns:
+            bool: 是否使用了缓存
+        """
+        ext = os.path.splitext(file_path)[1] or "." + kind
+        key = self.key(kind, payload)
+        if self.fetch(key, ext, file_path):
+            return True
+        render(file_path)
+        self.store(key, ext, file_path)
+        return False
@@ -1,15 +1,24 @@
 import os
 from datetime import datetime
-from PyQt5.QtCore import Qt
+from PyQt5.QtCore import Qt, QThreadPool
 from PyQt5.QtGui import QTextDocument
 from PyQt5.QtWidgets import QFileDialog, QMessageBox
 from PyQt5.QtPrintSupport import QPrinter
-from qfluentwidgets import InfoBar, InfoBarPosition
+from qfluentwidgets import InfoBar, InfoBarPosition, StateToolTip
+
+from chart_renderer import ChartRenderer, ChartSnapshot, RenderCancelled
+from export_cache import ExportCache
+from export_worker import ExportTask
+from utils import LogManager
+
+file_logger = LogManager.get_logger('file')
+
 
 class ExportManager:
     """导出管理器
     
-    负责将座位表导出为图片和PDF格式
+    负责将座位表导出为图片和PDF格式。导出时在界面线程中获取座位数据快照，
+    在后台线程池中渲染并显示进度，可随时取消；导出内容没有变化时直接复用缓存的导出文件
     """
     def __init__(self, parent_window=None):
         """初始化导出管理器
@@ -18,37 +27,154 @@ class ExportManager:
             parent_window: 父窗口引用，用于显示对话框和状态消息
         """
         self.parent_window = parent_window
+        config = getattr(parent_window, 'config', None) or {}
+        cache_config = config.get("export_cache", {})
+        self.cache = ExportCache(
+            directory=cache_config.get("directory", "cache/exports"),
+            max_bytes=int(cache_config.get("max_mb", 200) * 1024 * 1024),
+            enabled=cache_config.get("enabled", True)
+        )
+        self.thread_pool = QThreadPool.globalInstance()
+        self.active_task = None  # 正在进行的导出任务，同一时间只进行一个
+        self.state_tooltip = None  # 导出进度提示
+
+    @staticmethod
+    def _cached_suffix(cached):
+        """导出提示中标注是否使用了缓存"""
+        return "（内容未变化，使用缓存）" if cached else ""
+
+    def _notify(self, message, level="success"):
+        """显示导出提示，优先使用父窗口的通知管理器
+
+        Args:
+            message: 提示内容
+            level: 提示级别，success/warning
+        """
+        if not self.parent_window:
+            return
+        notifier = getattr(self.parent_window, 'notifier', None)
+        if notifier is not None:
+            getattr(notifier, level)(message)
+            return
+        getattr(InfoBar, level)(
+            title="成功" if level == "success" else "提示",
+            content=message,
+            orient=Qt.Horizontal,
+            isClosable=True,
+            position=InfoBarPosition.TOP_RIGHT,
+            duration=2000,
+            parent=self.parent_window
+        )
+
+    def _start_task(self, title, kind, payload, file_path, render):
+        """在后台线程池中启动导出任务，并显示可关闭（取消）的进度提示
+
+        Args:
+            title: 进度提示标题，例如"导出图片"
+            kind: 导出类型
+            payload: 决定导出结果的全部内容
+            file_path: 目标文件路径
+            render: 函数render(file_path, progress, cancelled)
+
+        Returns:
+            ExportTask: 已启动的任务，已有任务在进行时返回None
+        """
+        if self.active_task is not None:
+            self._notify("已有导出任务正在进行，请稍候", "warning")
+            return None
+
+        task = ExportTask(kind, payload, file_path, render, self.cache)
+        tooltip = StateToolTip(title, "正在导出，关闭此提示可取消", self.parent_window)
+        tooltip.move(tooltip.getSuitablePos())
+        tooltip.show()
+        tooltip.closedSignal.connect(task.cancel)
+        self.active_task = task
+        self.state_tooltip = tooltip
+
+        task.signals.progress.connect(lambda percent: self._on_progress(task, percent))
+        task.signals.finished.connect(lambda path, cached: self._on_finished(task, title, path, cached))
+        task.signals.failed.connect(lambda message: self._on_failed(task, title, message))
+        task.signals.cancelled.connect(lambda: self._on_cancelled(task, title))
+        self.thread_pool.start(task)
+        return task
+
+    def _finish_task(self, task, done):
+        """结束导出任务，更新进度提示
+
+        Args:
+            task: 导出任务
+            done: True表示完成，False表示失败或取消
+        """
+        if task is not self.active_task:
+            return
+        tooltip = self.state_tooltip
+        self.active_task = None
+        self.state_tooltip = None
+        if tooltip is None:
+            return
+        if done:
+            tooltip.setContent("导出完成")
+            tooltip.setState(True)
+        else:
+            tooltip.hide()
+            tooltip.deleteLater()
+
+    def _on_progress(self, task, percent):
+        """更新进度提示"""
+        if task is self.active_task and self.state_tooltip is not None and not task.is_cancelled():
+            self.state_tooltip.setContent(f"已完成 {percent}%，关闭此提示可取消")
+
+    def _on_finished(self, task, title, file_path, cached):
+        """导出完成"""
+        self._finish_task(task, True)
+        self._notify(f"{title}完成: {file_path}{self._cached_suffix(cached)}")
+
+    def _on_failed(self, task, title, message):
+        """导出失败"""
+        self._finish_task(task, False)
+        QMessageBox.critical(self.parent_window, "错误", f"{title}时出错: {message}")
+
+    def _on_cancelled(self, task, title):
+        """导出已取消"""
+        self._finish_task(task, False)
+        self._notify(f"已取消{title}", "warning")
+
+    def cancel_active(self, wait_ms=5000):
+        """取消正在进行的导出并等待后台线程结束，关闭窗口时调用
+
+        Args:
+            wait_ms: 最长等待时间（毫秒）
+        """
+        if self.active_task is not None:
+            self.active_task.cancel()
+        self.thread_pool.waitForDone(wait_ms)
 
     def export_as_image(self):
         """导出座位表为图片"""
         file_path, _ = QFileDialog.getSaveFileName(
-            self.parent_window, "保存图片", "座位安排.png", "PNG图片 (*.png);;JPEG图片 (*.jpg *.jpeg)"
+            self.parent_window, "保存图片", "座位安排.png",
+            "PNG图片 (*.png);;JPEG图片 (*.jpg *.jpeg);;分页PDF大图 (*.pdf)"
         )
         
         if not file_path:
             return
             
         try:
-            # 获取座位表区域截图
-            seating_chart_widget = self.parent_window.seating_chart_layout.parent().parent()
-            pixmap = seating_chart_widget.grab()
-            pixmap.save(file_path)
-            
-            # 显示状态消息
-            if self.parent_window:
-                InfoBar.success(
-                    title="成功",
-                    content=f"已导出图片到: {file_path}",
-                    orient=Qt.Horizontal,
-                    isClosable=True,
-                    position=InfoBarPosition.TOP_RIGHT,
-                    duration=2000,
-                    parent=self.parent_window
-                )
-                
+            snapshot = ChartSnapshot.capture(self.parent_window)
         except Exception as e:
             error_message = f"导出图片时出错: {str(e)}"
             QMessageBox.critical(self.parent_window, "错误", error_message)
+            return
+
+        # 缩放比例决定导出分辨率，例如3.125约相当于300DPI打印
+        scale = float(self.parent_window.config.get("export_image", {}).get("scale", 2.0))
+        payload = snapshot.payload()
+        payload["scale"] = scale
+        renderer = ChartRenderer(snapshot)
+        self._start_task(
+            "导出图片", "image", payload, file_path,
+            lambda path, progress, cancelled: renderer.render_image(path, scale, progress, cancelled)
+        )
             
     def export_for_printing(self):
         """导出座位表为适合打印的PDF格式"""
@@ -66,200 +192,186 @@ class ExportManager:
             
             if "column_names" not in self.parent_window.config or "layout_config" not in self.parent_window.config:
                 raise ValueError("配置文件缺少必要的键")
+
+            snapshot = ChartSnapshot.capture(self.parent_window)
             
-            # 创建一个适合打印的文档
-            document = QTextDocument()
-            
-            # 构建完整的HTML内容字符串
-            html_content = '''
-            <html>
-            <head>
-                <meta charset="UTF-8">
-                <style>
-                    * { box-sizing: border-box; }
-                    body { font-family: SimHei, "Microsoft YaHei", Arial, sans-serif; margin: 0; padding: 10px; }
-                    h1 { text-align: center; color: #333; margin-bottom: 15px; font-size: 20px; }
-                    .teacher-desk { text-align: center; margin: 15px auto; padding: 10px; background-color: #e0f2f1; border: 2px solid #26a69a; width: 200px; font-weight: bold; font-size: 14px; }
-                    
-                    /* 布局容器 */
-                    .main-container { width: 100%; page-break-inside: avoid; }
-                    
-                    /* 使用表格布局实现三列并排 */
-                    .layout-table { display: table; width: 100%; table-layout: fixed; }
-                    .layout-row { display: table-row; }
-                    .layout-cell { display: table-cell; vertical-align: top; padding: 0 2px; }
-                    
-                    /* 标题样式 */
-                    .column-title { 
-                        text-align: center; 
-                        font-weight: bold; 
-                        font-size: 16px; 
-                        padding: 6px; 
-                        background-color: #f0f0f0; 
-                        border: 1px solid #ddd; 
-                        margin-bottom: 5px;
-                    }
-                    
-                    /* 表格样式 */
-                    table { 
-                        width: 100%; 
-                        border-collapse: collapse;
-                        font-size: 11px;
-                    }
-                    th, td { 
-                        border: 1px solid #000;
-                        padding: 4px;
-                        text-align: center;
-                        word-wrap: break-word;
-                    }
-                    th { 
-                        background-color: #f9f9f9;
-                        font-weight: bold;
-                        color: #333;
-                    }
-                    .empty-seat { background-color: #f9f9f9; color: #999; }
-                    .occupied-seat { background-color: #fff; color: #333; }
-                    
-                    /* 统计信息 */
-                    .print-date { 
-                        text-align: right; 
-                        margin-top: 20px;
-                        font-style: italic;
-                        color: #666;
-                        font-size: 11px;
-                    }
-                </style>
-            </head>
-            <body>
-                <h1>教室座位安排</h1>
-                <div class="teacher-desk">讲 台</div>
-                <div class="main-container">
-            '''
-            
-            # 添加座位表内容
-            col_keys = ["column1", "column2", "column3"]
-            seat_count = 0
-            occupied_count = 0
-            
-            # 准备列数据
-            columns_html = {}
-            column_titles = []
-            
-            for col_key in col_keys:
-                # 安全地访问配置数据
-                if col_key not in self.parent_window.config["column_names"] or col_key not in self.parent_window.config["layout_config"]:
-                    print(f"警告：配置中缺少{col_key}的配置信息")
-                    columns_html[col_key] = "<tr><td colspan='2'>无数据</td></tr>"
-                    column_titles.append("")
-                    continue
+        except Exception as e:
+            LogManager.exception(file_logger, f"导出PDF时出错: {str(e)}")
+            QMessageBox.critical(self.parent_window, "错误", f"导出PDF时出错: {str(e)}\n\n详细错误信息已写入日志")
+            return
+
+        # 内容和打印日期都没有变化时复用缓存的PDF，跨天导出时重新生成
+        print_date = datetime.now().strftime("%Y年%m月%d日")
+        self._start_task(
+            "导出PDF", "pdf", dict(snapshot.payload(), print_date=print_date), file_path,
+            lambda path, progress, cancelled: ExportManager.render_pdf(snapshot, path, progress, cancelled, print_date)
+        )
+
+    @staticmethod
+    def build_print_html(snapshot, print_date=None):
+        """根据快照生成打印用的HTML
+
+        Args:
+            snapshot: ChartSnapshot
+            print_date: 页脚的打印日期，默认为今天
+
+        Returns:
+            str: HTML内容
+        """
+        html_content = '''
+        <html>
+        <head>
+            <meta charset="UTF-8">
+            <style>
+                * { box-sizing: border-box; }
+                body { font-family: SimHei, "Microsoft YaHei", Arial, sans-serif; margin: 0; padding: 10px; }
+                h1 { text-align: center; color: #333; margin-bottom: 15px; font-size: 20px; }
+                .teacher-desk { text-align: center; margin: 15px auto; padding: 10px; background-color: #e0f2f1; border: 2px solid #26a69a; width: 200px; font-weight: bold; font-size: 14px; }
                 
-                col_name = self.parent_window.config["column_names"][col_key]
-                col_config = self.parent_window.config["layout_config"][col_key]
-                column_titles.append(col_name)
+                /* 布局容器 */
+                .main-container { width: 100%; page-break-inside: avoid; }
                 
-                # 生成表格HTML
-                table_html = '<tr><th>座位</th><th>学生</th></tr>'
+                /* 使用表格布局实现三列并排 */
+                .layout-table { display: table; width: 100%; table-layout: fixed; }
+                .layout-row { display: table-row; }
+                .layout-cell { display: table-cell; vertical-align: top; padding: 0 2px; }
                 
-                try:
-                    rows = col_config.get("rows", 0)
-                    cols = col_config.get("cols", 0)
-                    
-                    if rows <= 0 or cols <= 0:
-                        print(f"警告：{col_name}列的行列配置无效")
-                        table_html += '<tr><td colspan="2">无座位数据</td></tr>'
-                    else:
-                        # 检查columns属性是否存在且有效
-                        if not hasattr(self.parent_window, 'columns') or not isinstance(self.parent_window.columns, dict) or col_key not in self.parent_window.columns:
-                            print(f"警告：缺少{col_name}列的座位数据")
-                            # 生成默认的空座位数据
-                            for row in range(rows):
-                                for col in range(cols):
-                                    seat_count += 1
-                                    table_html += f'<tr class="empty-seat"><td>第{row+1}排第{col+1}列</td><td>空座位</td></tr>'
-                        else:
-                            for row in range(rows):
-                                for col in range(cols):
-                                    seat_index = row * cols + col
-                                    seat_count += 1
-                                    
-                                    # 检查座位索引是否有效
-                                    if seat_index < len(self.parent_window.columns[col_key]):
-                                        seat = self.parent_window.columns[col_key][seat_index]
-                                        
-                                        # 检查座位对象是否有效
-                                        if hasattr(seat, 'is_occupied') and seat.is_occupied and hasattr(seat, 'student_name'):
-                                            student_name = seat.student_name
-                                            occupied_count += 1
-                                            table_html += f'<tr class="occupied-seat"><td>第{row+1}排第{col+1}列</td><td>{student_name}</td></tr>'
-                                        else:
-                                            table_html += f'<tr class="empty-seat"><td>第{row+1}排第{col+1}列</td><td>空座位</td></tr>'
-                                    else:
-                                        print(f"警告：{col_name}列的座位索引{seat_index}超出范围")
-                                        table_html += f'<tr class="empty-seat"><td>第{row+1}排第{col+1}列</td><td>空座位</td></tr>'
-                except Exception as inner_e:
-                    print(f"处理座位数据时出错: {str(inner_e)}")
-                    table_html += f'<tr><td colspan="2">数据处理错误</td></tr>'
+                /* 标题样式 */
+                .column-title { 
+                    text-align: center; 
+                    font-weight: bold; 
+                    font-size: 16px; 
+                    padding: 6px; 
+                    background-color: #f0f0f0; 
+                    border: 1px solid #ddd; 
+                    margin-bottom: 5px;
+                }
                 
-                columns_html[col_key] = table_html
-            
-            # 添加标题行
-            html_content += '<div class="layout-table">'
-            html_content += '<div class="layout-row">'
-            for title in column_titles:
-                if title:
-                    html_content += f'<div class="layout-cell"><div class="column-title">{title}</div></div>'
-            html_content += '</div>'
-            
-            # 添加表格行
-            html_content += '<div class="layout-row">'
-            for col_key in col_keys:
-                if column_titles[col_keys.index(col_key)]:
-                    html_content += f'<div class="layout-cell"><table>{columns_html[col_key]}</table></div>'
-            html_content += '</div>'
-            html_content += '</div>'
-            
-            # 添加统计信息和日期
-            current_date = datetime.now().strftime("%Y年%m月%d日 %H:%M:%S")
-            html_content += f'<div class="print-date">打印时间: {current_date}<br>总座位数: {seat_count}, 已占用: {occupied_count}, 空座位: {seat_count - occupied_count}</div>'
-            
-            # 关闭HTML
-            html_content += '</div></body></html>'
-            
-            # 设置完整的HTML内容到文档
-            document.setHtml(html_content)
-            
-            # 导出为PDF
-            printer = QPrinter(QPrinter.HighResolution)
-            printer.setOutputFormat(QPrinter.PdfFormat)
-            printer.setOutputFileName(file_path)
-            printer.setPageSize(QPrinter.A4)
-            printer.setPageMargins(20, 20, 20, 20, QPrinter.Millimeter)
-            
-            # 安全地打印文档
-            try:
-                document.print_(printer)
+                /* 表格样式 */
+                table { 
+                    width: 100%; 
+                    border-collapse: collapse;
+                    font-size: 11px;
+                }
+                th, td { 
+                    border: 1px solid #000;
+                    padding: 4px;
+                    text-align: center;
+                    word-wrap: break-word;
+                }
+                th { 
+                    background-color: #f9f9f9;
+                    font-weight: bold;
+                    color: #333;
+                }
+                .empty-seat { background-color: #f9f9f9; color: #999; }
+                .occupied-seat { background-color: #fff; color: #333; }
                 
-                # 验证文件是否已创建
-                if os.path.exists(file_path) and os.path.getsize(file_path) > 0:
-                    print(f"PDF文件已成功创建: {file_path}, 大小: {os.path.getsize(file_path)}字节")
-                    if self.parent_window:
-                        InfoBar.success(
-                            title="成功",
-                            content=f"已导出PDF到: {file_path}",
-                            orient=Qt.Horizontal,
-                            isClosable=True,
-                            position=InfoBarPosition.TOP_RIGHT,
-                            duration=2000,
-                            parent=self.parent_window
-                        )
-                else:
-                    raise IOError(f"PDF文件创建失败或为空: {file_path}")
-            except Exception as print_error:
-                print(f"打印文档时出错: {str(print_error)}")
-                raise
+                /* 统计信息 */
+                .print-date { 
+                    text-align: right; 
+                    margin-top: 20px;
+                    font-style: italic;
+                    color: #666;
+                    font-size: 11px;
+                }
+            </style>
+        </head>
+        <body>
+            <h1>教室座位安排</h1>
+            <div class="teacher-desk">讲 台</div>
+            <div class="main-container">
+        '''
+        
+        # 添加座位表内容
+        seat_count = 0
+        occupied_count = 0
+        column_titles = []
+        columns_html = []
+        
+        for col_key, col_config in snapshot.layout_config.items():
+            column_titles.append(snapshot.column_name(col_key))
             
-        except Exception as e:
-            import traceback
-            error_info = traceback.format_exc()
-            print(f"PDF导出错误详细信息:\n{error_info}")
-            QMessageBox.critical(self.parent_window, "错误", f"导出PDF时出错: {str(e)}\n\n详细错误信息已打印到控制台")
\ No newline at end of file
+            # 生成表格HTML
+            table_html = '<tr><th>座位</th><th>学生</th></tr>'
+            rows = col_config.get("rows", 0)
+            cols = col_config.get("cols", 0)
+            if rows <= 0 or cols <= 0:
+                table_html += '<tr><td colspan="2">无座位数据</td></tr>'
+            for row in range(rows):
+                for col in range(cols):
+                    seat_count += 1
+                    seat = snapshot.seats.get((col_key, row, col))
+                    if seat is not None:
+                        occupied_count += 1
+                        table_html += f'<tr class="occupied-seat"><td>第{row+1}排第{col+1}列</td><td>{seat[1]}</td></tr>'
+                    else:
+                        table_html += f'<tr class="empty-seat"><td>第{row+1}排第{col+1}列</td><td>空座位</td></tr>'
+            columns_html.append(table_html)
+        
+        # 添加标题行
+        html_content += '<div class="layout-table">'
+        html_content += '<div class="layout-row">'
+        for title in column_titles:
+            html_content += f'<div class="layout-cell"><div class="column-title">{title}</div></div>'
+        html_content += '</div>'
+        
+        # 添加表格行
+        html_content += '<div class="layout-row">'
+        for table_html in columns_html:
+            html_content += f'<div class="layout-cell"><table>{table_html}</table></div>'
+        html_content += '</div>'
+        html_content += '</div>'
+        
+        # 添加统计信息和日期
+        print_date = print_date or datetime.now().strftime("%Y年%m月%d日")
+        html_content += f'<div class="print-date">打印日期: {print_date}<br>总座位数: {seat_count}, 已占用: {occupied_count}, 空座位: {seat_count - occupied_count}</div>'
+        
+        # 关闭HTML
+        html_content += '</div></body></html>'
+        return html_content
+
+    @staticmethod
+    def render_pdf(snapshot, file_path, progress=None, cancelled=None, print_date=None):
+        """生成座位表PDF文件，可在后台线程中调用
+
+        排版和输出由QTextDocument一次完成，取消请求在排版前后检查
+
+        Args:
+            snapshot: ChartSnapshot
+            file_path: PDF文件路径
+            progress: 进度回调progress(百分比)
+            cancelled: 无参函数，返回True时停止导出
+            print_date: 页脚的打印日期，默认为今天；打印日期是导出缓存键的一部分
+
+        Raises:
+            RenderCancelled: 导出被取消
+            IOError: PDF文件创建失败
+        """
+        def checkpoint(percent):
+            if cancelled is not None and cancelled():
+                raise RenderCancelled()
+            if progress is not None:
+                progress(percent)
+
+        # 创建一个适合打印的文档
+        document = QTextDocument()
+        document.setHtml(ExportManager.build_print_html(snapshot, print_date))
+        checkpoint(20)
+        
+        # 导出为PDF
+        printer = QPrinter(QPrinter.HighResolution)
+        printer.setOutputFormat(QPrinter.PdfFormat)
+        printer.setOutputFileName(file_path)
+        printer.setPageSize(QPrinter.A4)
+        printer.setPageMargins(20, 20, 20, 20, QPrinter.Millimeter)
+        document.print_(printer)
+        checkpoint(95)
+        
+        # 验证文件是否已创建
+        if os.path.exists(file_path) and os.path.getsize(file_path) > 0:
+            LogManager.info(file_logger, f"PDF文件已成功创建: {file_path}, 大小: {os.path.getsize(file_path)}字节")
+        else:
+            raise IOError(f"PDF文件创建失败或为空: {file_path}")
+        if progress is not None:
+            progress(100)
@@ -0,0 +1,82 @@
+import os
+import threading
+
+from PyQt5.QtCore import QObject, QRunnable, pyqtSignal
+
+from chart_renderer import RenderCancelled
+from utils import LogManager
+
+file_logger = LogManager.get_logger('file')
+
+
+class ExportSignals(QObject):
+    """导出任务的信号，在界面线程中创建，后台线程发出的信号会排队回到界面线程"""
+    progress = pyqtSignal(int)  # 完成百分比
+    finished = pyqtSignal(str, bool)  # 文件路径, 是否使用了缓存
+    failed = pyqtSignal(str)  # 错误信息
+    cancelled = pyqtSignal()
+
+
+class ExportTask(QRunnable):
+    """后台导出任务
+
+    在线程池中调用渲染函数生成文件，渲染函数只能使用界面线程预先准备好的快照数据，
+    不能访问控件。通过cancel()请求取消，渲染函数在检查点抛出RenderCancelled后删除未完成的文件
+    """
+    def __init__(self, kind, payload, file_path, render, cache=None):
+        """初始化导出任务
+
+        Args:
+            kind: 导出类型，用于导出缓存
+            payload: 决定导出结果的全部内容，用于导出缓存
+            file_path: 目标文件路径
+            render: 函数render(file_path, progress, cancelled)，生成导出文件
+            cache: ExportCache，为None时不使用缓存
+        """
+        super().__init__()
+        # 由导出管理器持有引用，避免Qt在run结束后删除仍被信号引用的对象
+        self.setAutoDelete(False)
+        self.kind = kind
+        self.payload = payload
+        self.file_path = file_path
+        self.render = render
+        self.cache = cache
+        self.signals = ExportSignals()
+        self._cancel_event = threading.Event()
+
+    def cancel(self):
+        """请求取消导出"""
+        self._cancel_event.set()
+
+    def is_cancelled(self):
+        """是否已请求取消"""
+        return self._cancel_event.is_set()
+
+    def _render(self, file_path):
+        """调用渲染函数，传入进度回调和取消检查"""
+        self.render(file_path, self.signals.progress.emit, self.is_cancelled)
+
+    def run(self):
+        """在后台线程中执行导出"""
+        try:
+            if self.is_cancelled():
+                raise RenderCancelled()
+            if self.cache is not None:
+                cached = self.cache.export(self.kind, self.payload, self.file_path, self._render)
+            else:
+                self._render(self.file_path)
+                cached = False
+        except RenderCancelled:
+            if os.path.exists(self.file_path):
+                try:
+                    os.remove(self.file_path)
+                except OSError:
+                    pass
+            LogManager.info(file_logger, f"导出已取消: {self.file_path}")
+            self.signals.cancelled.emit()
+            return
+        except Exception as e:
+            LogManager.exception(file_logger, f"导出失败: {str(e)}")
+            self.signals.failed.emit(str(e))
+            return
+        self.signals.finished.emit(self.file_path, cached)
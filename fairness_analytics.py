@@ -0,0 +1,276 @@
+import csv
+
+import numpy as np
+from PyQt5.QtCore import QRect, Qt
+from PyQt5.QtGui import QColor, QFont, QImage, QPainter
+
+from session_manager import SessionManager
+from utils import LogManager
+
+file_logger = LogManager.get_logger('file')
+
+
+class FairnessReport:
+    """座位公平性统计结果
+
+    学生按姓名汇总（同名学生视为同一人），每周对应一个会话
+    """
+    __slots__ = ("names", "week_labels", "group_labels", "weeks_seated", "front_weeks",
+                 "group_counts", "mean_depth", "mean_distance", "depth_by_week")
+
+    def __init__(self, names, week_labels, group_labels, weeks_seated, front_weeks,
+                 group_counts, mean_depth, mean_distance, depth_by_week):
+        """初始化统计结果
+
+        Args:
+            names: 学生姓名列表
+            week_labels: 每周的标签（通常是会话文件名）
+            group_labels: 列组名称列表
+            weeks_seated: 每名学生入座的周数
+            front_weeks: 每名学生坐第一排的周数
+            group_counts: 学生×列组的入座周数矩阵
+            mean_depth: 每名学生到讲台的平均排数（0为第一排）
+            mean_distance: 每名学生到讲台的平均距离（以座位为单位）
+            depth_by_week: 学生×周的排数矩阵，未入座为NaN
+        """
+        self.names = names
+        self.week_labels = week_labels
+        self.group_labels = group_labels
+        self.weeks_seated = weeks_seated
+        self.front_weeks = front_weeks
+        self.group_counts = group_counts
+        self.mean_depth = mean_depth
+        self.mean_distance = mean_distance
+        self.depth_by_week = depth_by_week
+
+    def summary_text(self):
+        """生成统计摘要
+
+        Returns:
+            str: 摘要文本
+        """
+        seated = self.weeks_seated > 0
+        if not seated.any():
+            return "没有可统计的座位安排"
+        front = self.front_weeks[seated]
+        depth = self.mean_depth[seated]
+        return (
+            f"共 {len(self.week_labels)} 周、{len(self.names)} 名学生\n"
+            f"坐第一排的周数: 最少 {front.min()}，最多 {front.max()}\n"
+            f"到讲台的平均排数: 最近 {depth.min() + 1:.1f}，最远 {depth.max() + 1:.1f}"
+        )
+
+
+class FairnessAnalyzer:
+    """座位公平性分析器
+
+    读取一系列按周保存的会话，统计每名学生坐第一排的周数、在各列组的分布
+    和到讲台的平均距离，并导出统计表和热力图。讲台在座位表下方，
+    每个列组的最后一排为第一排。
+    """
+    # 热力图颜色：第一排为绿色，逐渐过渡到最后一排的红色，未入座为灰色
+    HEATMAP_STOPS = np.array([[76, 175, 80], [255, 235, 59], [244, 67, 54]], dtype=float)
+    HEATMAP_EMPTY = (224, 224, 224)
+    # 热力图网格的最大高度（像素），学生很多时每行会压缩到1像素
+    HEATMAP_MAX_HEIGHT = 6000
+
+    @staticmethod
+    def load_sessions(file_paths):
+        """按顺序加载会话文件
+
+        Args:
+            file_paths: 会话文件路径列表
+
+        Returns:
+            list: 会话数据列表
+        """
+        return [SessionManager.load(file_path) for file_path in file_paths]
+
+    @staticmethod
+    def _placements(session, name_index, group_index):
+        """向量化提取一个会话中所有入座学生的位置
+
+        Args:
+            session: 会话数据
+            name_index: 姓名 -> 全局学生下标（按需追加）
+            group_index: 列组名称 -> 全局列组下标（按需追加）
+
+        Returns:
+            tuple: (学生下标, 排数, 距离, 列组下标) 四个数组
+        """
+        layout_config = session["layout_config"]
+        column_names = session.get("column_names", {})
+        local_to_global = np.array(
+            [name_index.setdefault(name, len(name_index)) for name in session["students"]], dtype=np.int64
+        )
+
+        total_cols = sum(config["cols"] for config in layout_config.values())
+        center = (total_cols - 1) / 2
+        offset = 0
+        parts = []
+        for col_key, config in layout_config.items():
+            rows, cols = config["rows"], config["cols"]
+            cells = np.asarray(session["assignments"].get(col_key, []), dtype=np.int64)
+            positions = np.arange(cells.size)
+            occupied = cells >= 0
+            depth = (rows - 1 - positions // cols)[occupied]
+            lateral = np.abs(offset + positions % cols - center)[occupied]
+            group = group_index.setdefault(column_names.get(col_key, col_key), len(group_index))
+            parts.append((
+                local_to_global[cells[occupied]],
+                depth,
+                np.hypot(depth, lateral),
+                np.full(depth.size, group, dtype=np.int64),
+            ))
+            offset += cols
+
+        if not parts:
+            empty = np.empty(0, dtype=np.int64)
+            return empty, empty, np.empty(0), empty
+        return tuple(np.concatenate(arrays) for arrays in zip(*parts))
+
+    @staticmethod
+    def analyze(sessions, week_labels=None):
+        """统计一系列会话的座位分布
+
+        Args:
+            sessions: 按时间顺序排列的会话数据列表
+            week_labels: 每周的标签，缺省为"第N周"
+
+        Returns:
+            FairnessReport: 统计结果
+        """
+        week_labels = list(week_labels or [f"第{i + 1}周" for i in range(len(sessions))])
+        name_index = {}
+        group_index = {}
+        students, depths, distances, groups, weeks = [], [], [], [], []
+        for week, session in enumerate(sessions):
+            student, depth, distance, group = FairnessAnalyzer._placements(session, name_index, group_index)
+            students.append(student)
+            depths.append(depth)
+            distances.append(distance)
+            groups.append(group)
+            weeks.append(np.full(student.size, week, dtype=np.int64))
+
+        count = len(name_index)
+        group_count = len(group_index)
+        week_count = len(sessions)
+        if students:
+            student, depth, distance, group, week = (
+                np.concatenate(arrays) for arrays in (students, depths, distances, groups, weeks)
+            )
+        else:
+            student = depth = group = week = np.empty(0, dtype=np.int64)
+            distance = np.empty(0)
+
+        weeks_seated = np.bincount(student, minlength=count)
+        front_weeks = np.bincount(student[depth == 0], minlength=count)
+        group_counts = np.bincount(student * group_count + group, minlength=count * group_count)
+        group_counts = group_counts.reshape(count, group_count)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            mean_depth = np.bincount(student, weights=depth, minlength=count) / weeks_seated
+            mean_distance = np.bincount(student, weights=distance, minlength=count) / weeks_seated
+
+        depth_by_week = np.full((count, week_count), np.nan)
+        depth_by_week[student, week] = depth
+
+        return FairnessReport(
+            list(name_index), week_labels, list(group_index), weeks_seated, front_weeks,
+            group_counts, mean_depth, mean_distance, depth_by_week
+        )
+
+    @staticmethod
+    def write_csv(report, file_path):
+        """把每名学生的统计结果写入CSV文件
+
+        Args:
+            report: FairnessReport
+            file_path: 输出文件路径
+        """
+        with open(file_path, 'w', encoding='utf-8-sig', newline='') as f:
+            writer = csv.writer(f)
+            writer.writerow(["姓名", "入座周数", "第一排周数", "平均排数", "平均距离"]
+                            + [f"{label}周数" for label in report.group_labels])
+            for index, name in enumerate(report.names):
+                seated = report.weeks_seated[index]
+                writer.writerow(
+                    [name, seated, report.front_weeks[index],
+                     f"{report.mean_depth[index] + 1:.2f}" if seated else "",
+                     f"{report.mean_distance[index]:.2f}" if seated else ""]
+                    + list(report.group_counts[index])
+                )
+        LogManager.info(file_logger, f"公平性统计已导出到 {file_path}")
+
+    @staticmethod
+    def heatmap_colors(depth_by_week):
+        """把排数矩阵映射为RGB颜色（向量化）
+
+        Args:
+            depth_by_week: 学生×周的排数矩阵，未入座为NaN
+
+        Returns:
+            numpy.ndarray: 学生×周×3的uint8颜色数组
+        """
+        empty = np.isnan(depth_by_week)
+        max_depth = np.nanmax(depth_by_week) if not empty.all() else 0
+        position = np.where(empty, 0, depth_by_week) / max(max_depth, 1) * (len(FairnessAnalyzer.HEATMAP_STOPS) - 1)
+        lower = np.clip(np.floor(position).astype(int), 0, len(FairnessAnalyzer.HEATMAP_STOPS) - 2)
+        fraction = (position - lower)[..., None]
+        stops = FairnessAnalyzer.HEATMAP_STOPS
+        colors = stops[lower] * (1 - fraction) + stops[lower + 1] * fraction
+        colors[empty] = FairnessAnalyzer.HEATMAP_EMPTY
+        return colors.astype(np.uint8)
+
+    @staticmethod
+    def render_heatmap(report, file_path):
+        """导出学生×周的座位排数热力图
+
+        颜色表示当周到讲台的排数（绿色为第一排，红色为最后一排，灰色为未入座），
+        学生较少时在左侧标注姓名，顶部标注周次（从1开始，对应week_labels的顺序）
+
+        Args:
+            report: FairnessReport
+            file_path: 输出图片路径
+
+        Raises:
+            ValueError: 没有学生或会话，无法绘制
+            IOError: 图片保存失败
+        """
+        count, week_count = report.depth_by_week.shape
+        if count == 0 or week_count == 0:
+            raise ValueError("会话中没有学生，无法生成热力图")
+        cell_width = max(2, min(40, 1200 // week_count))
+        cell_height = max(1, min(20, FairnessAnalyzer.HEATMAP_MAX_HEIGHT // count))
+        show_labels = cell_height >= 12
+        label_width = 120 if show_labels else 0
+        header_height = 40 if show_labels else 0
+
+        colors = FairnessAnalyzer.heatmap_colors(report.depth_by_week)
+        cells = np.repeat(np.repeat(colors, cell_height, axis=0), cell_width, axis=1)
+        pixels = np.empty(cells.shape[:2] + (4,), dtype=np.uint8)
+        # Format_RGB32在内存中的字节顺序为B、G、R、A
+        pixels[..., 0] = cells[..., 2]
+        pixels[..., 1] = cells[..., 1]
+        pixels[..., 2] = cells[..., 0]
+        pixels[..., 3] = 255
+        grid = QImage(pixels.data, pixels.shape[1], pixels.shape[0], pixels.strides[0], QImage.Format_RGB32)
+
+        image = QImage(label_width + grid.width(), header_height + grid.height(), QImage.Format_RGB32)
+        image.fill(QColor("white"))
+        painter = QPainter(image)
+        painter.drawImage(label_width, header_height, grid)
+        if show_labels:
+            painter.setFont(QFont("Microsoft YaHei", 8))
+            painter.setPen(QColor("#333333"))
+            for index, name in enumerate(report.names):
+                painter.drawText(QRect(4, header_height + index * cell_height, label_width - 8, cell_height),
+                                 Qt.AlignRight | Qt.AlignVCenter, name)
+            if cell_width >= 16:
+                for week in range(week_count):
+                    painter.drawText(QRect(label_width + week * cell_width, 0, cell_width, header_height),
+                                     Qt.AlignCenter, str(week + 1))
+        painter.end()
+
+        if not image.save(file_path):
+            raise IOError(f"热力图保存失败: {file_path}")
+        LogManager.info(file_logger, f"公平性热力图已导出到 {file_path}")
@@ -0,0 +1,257 @@
+import hashlib
+import json
+import os
+
+from chart_renderer import ChartRenderer, ChartSnapshot
+from config_manager import ConfigManager
+from utils import LogManager
+
+file_logger = LogManager.get_logger('file')
+
+
+def _columns(names, rows, cols, row_height=60, col_width=80):
+    """生成行列数相同的若干列组
+
+    Returns:
+        tuple: (布局配置, 列名配置)
+    """
+    layout_config = {}
+    column_names = {}
+    for index, name in enumerate(names, 1):
+        col_key = f"column{index}"
+        layout_config[col_key] = {"rows": rows, "cols": cols, "row_height": row_height, "col_width": col_width}
+        column_names[col_key] = name
+    return layout_config, column_names
+
+
+class LayoutTemplate:
+    """布局模板索引项
+
+    只包含在模板列表中显示所需的信息，布局配置在应用时才从模板文件读取
+    """
+    __slots__ = ("name", "description", "file", "thumbnail", "groups", "seats", "builtin")
+
+    def __init__(self, name, description, file, thumbnail, groups, seats, builtin=False):
+        """初始化模板索引项
+
+        Args:
+            name: 模板名称
+            description: 说明
+            file: 模板文件名（位于模板目录中）
+            thumbnail: 缩略图文件名
+            groups: 列组数
+            seats: 座位总数
+            builtin: 是否为内置模板
+        """
+        self.name = name
+        self.description = description
+        self.file = file
+        self.thumbnail = thumbnail
+        self.groups = groups
+        self.seats = seats
+        self.builtin = builtin
+
+    def to_dict(self):
+        """转换为索引文件中的条目"""
+        return {slot: getattr(self, slot) for slot in self.__slots__}
+
+
+class LayoutTemplateLibrary:
+    """布局模板库
+
+    模板保存在本地模板目录中，每个模板一个JSON文件（布局配置和列名）和一张PNG缩略图，
+    index.json记录全部模板的名称、座位数和缩略图，打开模板列表时只读取索引和缩略图。
+    首次使用时写入内置的常见教室、实验室和考场模板
+    """
+    INDEX_FILE = "index.json"
+    # 缩略图宽度（像素）
+    THUMBNAIL_WIDTH = 240
+
+    # 内置模板：(名称, 说明, 布局配置, 列名配置)
+    BUILTIN_TEMPLATES = [
+        ("标准教室", "三个列组，每组8排3列", *_columns(["南", "中", "北"], 8, 3)),
+        ("宽教室", "两个列组，每组7排4列", *_columns(["左", "右"], 7, 4)),
+        ("小组教室", "四个列组，每组6排2列，适合同桌讨论", *_columns(["一组", "二组", "三组", "四组"], 6, 2)),
+        ("实验室", "四列实验台，每台2人，台间距较大",
+         *_columns(["一列", "二列", "三列", "四列"], 5, 2, row_height=90, col_width=100)),
+        ("标准考场", "30人考场，5列单人单桌，每列6个座位",
+         *_columns([f"第{i}列" for i in range(1, 6)], 6, 1, row_height=80)),
+        ("大考场", "40人考场，5列单人单桌，每列8个座位",
+         *_columns([f"第{i}列" for i in range(1, 6)], 8, 1, row_height=80)),
+    ]
+
+    def __init__(self, directory="templates"):
+        """初始化模板库
+
+        Args:
+            directory: 模板目录
+        """
+        self.directory = directory
+        self.templates = []  # [LayoutTemplate]，按添加顺序排列
+
+    def load(self):
+        """读取模板索引，首次使用时写入内置模板
+
+        索引文件损坏或缺少某个模板的缩略图时重新生成
+
+        Returns:
+            list: LayoutTemplate列表
+        """
+        index_path = os.path.join(self.directory, self.INDEX_FILE)
+        if not os.path.exists(index_path):
+            self.templates = []
+            for name, description, layout_config, column_names in self.BUILTIN_TEMPLATES:
+                self._write_template(name, description, layout_config, column_names, builtin=True)
+            self._save_index()
+            LogManager.info(file_logger, f"已创建模板库: {self.directory}")
+            return self.templates
+
+        try:
+            with open(index_path, 'r', encoding='utf-8') as f:
+                entries = json.load(f)
+            self.templates = [LayoutTemplate(**entry) for entry in entries]
+        except (OSError, ValueError, TypeError) as e:
+            LogManager.warning(file_logger, f"模板索引读取失败，重新生成: {str(e)}")
+            self.templates = self._rebuild_index()
+            self._save_index()
+            return self.templates
+
+        available = []
+        for template in self.templates:
+            try:
+                if not os.path.exists(self.thumbnail_path(template)):
+                    layout_config, column_names = self.read(template)
+                    self._render_thumbnail(layout_config, column_names, self.thumbnail_path(template))
+            except (OSError, ValueError, KeyError) as e:
+                LogManager.warning(file_logger, f"模板 {template.name} 无法读取，已从索引中移除: {str(e)}")
+                continue
+            available.append(template)
+        if len(available) != len(self.templates):
+            self.templates = available
+            self._save_index()
+        return self.templates
+
+    def read(self, template):
+        """读取模板的布局配置和列名
+
+        Args:
+            template: LayoutTemplate
+
+        Returns:
+            tuple: (布局配置, 列名配置)
+        """
+        with open(os.path.join(self.directory, template.file), 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        return data["layout_config"], data.get("column_names", {})
+
+    def thumbnail_path(self, template):
+        """模板缩略图的路径"""
+        return os.path.join(self.directory, template.thumbnail)
+
+    def find(self, name):
+        """按名称查找模板，不存在时返回None"""
+        return next((template for template in self.templates if template.name == name), None)
+
+    def save(self, name, layout_config, column_names, description=""):
+        """把布局保存为模板，同名模板会被覆盖
+
+        Args:
+            name: 模板名称
+            layout_config: 布局配置
+            column_names: 列名配置
+            description: 说明
+
+        Returns:
+            LayoutTemplate: 保存的模板
+        """
+        existing = self.find(name)
+        template = self._write_template(name, description, layout_config, column_names)
+        if existing is not None:
+            self.templates.remove(template)
+            self.templates[self.templates.index(existing)] = template
+        self._save_index()
+        LogManager.info(file_logger, f"已保存布局模板: {name}")
+        return template
+
+    def remove(self, template):
+        """删除模板及其缩略图
+
+        Args:
+            template: LayoutTemplate
+        """
+        self.templates.remove(template)
+        for file_name in (template.file, template.thumbnail):
+            try:
+                os.remove(os.path.join(self.directory, file_name))
+            except OSError:
+                pass
+        self._save_index()
+        LogManager.info(file_logger, f"已删除布局模板: {template.name}")
+
+    def _write_template(self, name, description, layout_config, column_names, builtin=False):
+        """写入模板文件和缩略图，并追加到模板列表
+
+        文件名由模板名称的哈希值决定，缩略图文件名另外包含布局内容的哈希值，
+        布局变化后不会读到旧的缩略图
+
+        Returns:
+            LayoutTemplate: 新的模板索引项
+        """
+        os.makedirs(self.directory, exist_ok=True)
+        column_names = {col_key: column_names.get(col_key) or ConfigManager.default_column_name(col_key) for col_key in layout_config}
+        stem = hashlib.sha256(name.encode("utf-8")).hexdigest()[:16]
+        data = {"name": name, "description": description, "layout_config": layout_config, "column_names": column_names}
+        content = json.dumps(data, ensure_ascii=False, sort_keys=True)
+        template = LayoutTemplate(
+            name=name,
+            description=description,
+            file=f"{stem}.json",
+            thumbnail=f"{stem}-{hashlib.sha256(content.encode('utf-8')).hexdigest()[:8]}.png",
+            groups=len(layout_config),
+            seats=sum(config["rows"] * config["cols"] for config in layout_config.values()),
+            builtin=builtin,
+        )
+        previous = self.find(name)
+        with open(os.path.join(self.directory, template.file), 'w', encoding='utf-8') as f:
+            json.dump(data, f, ensure_ascii=False, indent=4)
+        self._render_thumbnail(layout_config, column_names, self.thumbnail_path(template))
+        if previous is not None and previous.thumbnail != template.thumbnail:
+            try:
+                os.remove(self.thumbnail_path(previous))
+            except OSError:
+                pass
+        self.templates.append(template)
+        return template
+
+    def _render_thumbnail(self, layout_config, column_names, path):
+        """按导出图片的绘制方式生成空座位表的缩略图"""
+        renderer = ChartRenderer(ChartSnapshot(layout_config, column_names, {}))
+        renderer.render_image(path, scale=self.THUMBNAIL_WIDTH / renderer.width)
+
+    def _rebuild_index(self):
+        """扫描模板目录中的模板文件重建索引
+
+        Returns:
+            list: LayoutTemplate列表
+        """
+        builtin_names = {name for name, *_ in self.BUILTIN_TEMPLATES}
+        self.templates = []
+        for file_name in sorted(os.listdir(self.directory)):
+            if not file_name.endswith(".json") or file_name == self.INDEX_FILE:
+                continue
+            try:
+                with open(os.path.join(self.directory, file_name), 'r', encoding='utf-8') as f:
+                    data = json.load(f)
+                self._write_template(data["name"], data.get("description", ""), data["layout_config"],
+                                     data.get("column_names", {}), builtin=data["name"] in builtin_names)
+            except (OSError, ValueError, KeyError) as e:
+                LogManager.warning(file_logger, f"跳过无法读取的模板文件 {file_name}: {str(e)}")
+        return self.templates
+
+    def _save_index(self):
+        """写入模板索引"""
+        os.makedirs(self.directory, exist_ok=True)
+        temp_path = os.path.join(self.directory, self.INDEX_FILE + ".tmp")
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump([template.to_dict() for template in self.templates], f, ensure_ascii=False, indent=4)
+        os.replace(temp_path, os.path.join(self.directory, self.INDEX_FILE))
@@ -1,35 +1,56 @@
-from PyQt5.QtCore import Qt
+import csv
+import os
+from contextlib import contextmanager
+
+from PyQt5.QtCore import Qt, pyqtSignal
 from qfluentwidgets import PrimaryPushButton
 from PyQt5.QtGui import QIcon
 from PyQt5.QtWidgets import (
     QApplication,
+    QFileDialog,
     QGridLayout,
     QHBoxLayout,
+    QInputDialog,
     QLabel,
     QScrollArea,
     QVBoxLayout,
     QWidget,
 )
 from qfluentwidgets import (
-    BodyLabel,
+    Action,
     CardWidget,
+    ComboBox,
+    DropDownPushButton,
     FluentWindow,
     FluentIcon as FIF,
-    InfoBar,
-    InfoBarPosition,
     LineEdit,
+    NavigationItemPosition,
     PrimaryPushButton,
     PushButton,
-    Theme,
-    setTheme,
+    RoundMenu,
+    SearchLineEdit,
 )
 
 # 导入自定义模块
+from auto_arrange import FILL_ORDERS, AutoArranger
 from config_manager import ConfigManager
-from widgets import DraggableLabel, SeatWidget
+from widgets import SEAT_WIDGETS, DraggableLabel, PaintedSeatWidget
 from settings import SettingsPanel
+from template_panel import TemplatePanel
 from export_manager import ExportManager
-from utils import CSVManager, LogManager, ui_logger, config_logger
+from fairness_analytics import FairnessAnalyzer
+from exam_allocator import ExamAllocator
+from exam_documents import ExamDocumentExporter
+from notifications import NotificationManager
+from presentation import PresentationView
+from roster_index import RosterIndex
+from seat_constraints import ConstraintEvaluator
+from session_journal import SessionJournal
+from session_manager import SessionManager
+from student import Student
+from theme_manager import ThemeManager
+from utils import CSVManager, LogManager, UIUtils, ui_logger, config_logger
+from ui_watchdog import UIStallWatchdog
 
 class MWindow(FluentWindow):
     def __init__(self, parent=None):
@@ -51,15 +72,105 @@ class MWindow(FluentWindow):
             obj_name="Setting"
         )
 
+        self.Templates = TemplatePanel(
+            self,
+            config=self.config,
+            obj_name="Templates"
+        )
+
         # 连接设置更新信号到reloadSetting方法
         self.Setting.settings_updated.connect(self.reloadSetting)
+        self.Templates.template_applied.connect(self.applyTemplate)
+        self.seatingChartWindow.layout_restored.connect(self.onLayoutRestored)
+        # 投影演示窗口，首次进入演示模式时创建
+        self.presentation = None
 
         self.initNavigation()
         self.initWindow()
+        self.initWatchdog()
 
     def initNavigation(self):
         self.addSubInterface(self.seatingChartWindow, FIF.HOME, 'Home')
         self.addSubInterface(self.Setting, FIF.SETTING, 'Setting')
+        self.addSubInterface(self.Templates, FIF.LAYOUT, '布局模板')
+
+        # 公平性分析入口（读取历史会话文件，不切换页面）
+        self.navigationInterface.addItem(
+            routeKey="fairnessAnalysis",
+            icon=FIF.PIE_SINGLE,
+            text="公平性分析",
+            onClick=self.seatingChartWindow.analyze_fairness,
+            selectable=False
+        )
+
+        # 投影演示模式（全屏只读显示座位表）
+        self.navigationInterface.addItem(
+            routeKey="presentation",
+            icon=FIF.PROJECTOR,
+            text="演示模式",
+            onClick=self.showPresentation,
+            selectable=False
+        )
+
+        # 浅色/深色主题切换
+        self.navigationInterface.addItem(
+            routeKey="toggleTheme",
+            icon=FIF.CONSTRACT,
+            text="切换主题",
+            onClick=self.toggleTheme,
+            selectable=False,
+            position=NavigationItemPosition.BOTTOM
+        )
+
+    def initWatchdog(self):
+        """按配置启用界面卡顿看门狗"""
+        self.watchdog = None
+        watchdog_config = self.config.get("watchdog", {})
+        if not watchdog_config.get("enabled", False):
+            return
+
+        self.watchdog = UIStallWatchdog(
+            threshold_ms=watchdog_config.get("threshold_ms", 50),
+            parent=self
+        )
+        self.watchdog.start()
+
+        # 在导航栏底部添加卡顿统计入口
+        self.navigationInterface.addItem(
+            routeKey="stallSummary",
+            icon=FIF.SPEED_HIGH,
+            text="卡顿统计",
+            onClick=self.showStallSummary,
+            selectable=False,
+            position=NavigationItemPosition.BOTTOM
+        )
+
+    def toggleTheme(self):
+        """切换浅色/深色主题并保存到配置文件"""
+        self.config["theme"] = ThemeManager.toggle()
+        self.config_manager.update_config(self.config)
+
+    def showPresentation(self):
+        """进入投影演示模式"""
+        if self.presentation is None:
+            self.presentation = PresentationView(self.seatingChartWindow, self)
+        self.presentation.present()
+
+    def showStallSummary(self):
+        """显示界面卡顿统计摘要"""
+        if self.watchdog is None:
+            return
+        UIUtils.show_info_message(self, "卡顿统计", self.watchdog.summary_text())
+
+    def closeEvent(self, event):
+        """关闭窗口时退出演示模式，停止看门狗线程、后台导出和操作日志"""
+        if self.presentation is not None:
+            self.presentation.close()
+        if self.watchdog is not None:
+            self.watchdog.stop()
+        self.seatingChartWindow.export_manager.cancel_active()
+        self.seatingChartWindow.close_journal()
+        super().closeEvent(event)
 
     def initWindow(self):
         """初始化窗口基本属性"""
@@ -79,38 +190,85 @@ class MWindow(FluentWindow):
         # 设置窗口最小尺寸，确保UI组件不会被过度压缩
         self.setMinimumSize(self.config["window"]["min_width"], self.config["window"]["min_height"])
         
-        # 设置主题和样式
-        theme = Theme.LIGHT if self.config["theme"] == "LIGHT" else Theme.DARK
-        setTheme(theme)  # 设置Fluent主题
-        
-        # 设置窗口样式
-        self.setStyleSheet(self.config["styles"]["main_window"])
+        # 设置主题，样式表在应用程序级别统一应用
+        ThemeManager.apply(self.config.get("theme", "LIGHT"))
 
-    def reloadSetting(self, new_layout_config=None):
+    def reloadSetting(self, new_layout_config=None, column_names=None):
         """重新加载设置并更新界面
         
         Args:
             new_layout_config: 从设置面板传递的新布局配置
+            column_names: 从设置面板传递的新列名配置
         """
         # 如果没有传递配置，尝试从Setting对象获取
         if new_layout_config is None and hasattr(self.Setting, 'custom_layout_config'):
             new_layout_config = self.Setting.custom_layout_config
+        if column_names is None:
+            column_names = self.config["column_names"]
             
         if new_layout_config:
             # 更新配置
             self.config["layout_config"] = new_layout_config
+            self.config["column_names"] = column_names
             # 保存到配置文件
             self.config_manager.update_config(self.config)
-            # 重新设置座位图表
-            self.seatingChartWindow.setup_seating_chart(new_layout_config)
+            # 只更新变化的列组
+            displaced = self.seatingChartWindow.apply_layout(new_layout_config, column_names)
+            if displaced:
+                self.seatingChartWindow.notifier.warning(
+                    f"{len(displaced)} 名学生的座位已不在新布局中，已回到名单"
+                )
+
+    def applyTemplate(self, layout_config, column_names):
+        """把布局模板应用到当前座位表，同步设置面板后回到座位表
+
+        Args:
+            layout_config: 模板的布局配置
+            column_names: 模板的列名配置
+        """
+        self.reloadSetting(layout_config, column_names)
+        self.Setting.set_layout_config(layout_config, column_names)
+        self.switchTo(self.seatingChartWindow)
+        self.seatingChartWindow.notifier.success("已应用布局模板")
+
+    def onLayoutRestored(self, layout_config, column_names):
+        """打开会话改变布局后同步配置和设置面板
+
+        Args:
+            layout_config: 新的布局配置
+            column_names: 新的列名配置
+        """
+        self.config["layout_config"] = layout_config
+        self.config["column_names"] = column_names
+        self.Setting.set_layout_config(layout_config, column_names)
 
 class SeatingChartWindow(QWidget):
     """教室座位安排系统主窗口"""
+    # 座位安排变化信号，每次批量更新只发出一次，携带(座位键, Student或None)列表
+    arrangement_changed = pyqtSignal(list)
+    # 打开会话导致布局变化时发出，携带新的布局配置和列名
+    layout_restored = pyqtSignal(dict, dict)
+    # 座位表的列组、行列数或列名变化后发出
+    layout_changed = pyqtSignal()
+
     def __init__(self,parent=None,obj_name="seatingChartWindow"):
         super().__init__(parent)
         self.setObjectName(obj_name)
-        self.students = ["张三", "李四", "王五", "赵六", "钱七", "孙八", "周九", "吴十"]
+        self.setAttribute(Qt.WA_StyledBackground, True)  # 背景色由主题样式表设置
+        self.students = {}  # 学生名单，学生ID -> Student，保持添加顺序
+        self.student_labels = {}  # 学生ID -> 名单中的DraggableLabel
+        self.student_seats = {}  # 已入座学生ID -> 座位键
+        self.roster_index = RosterIndex()  # 名单和已入座学生的检索索引
+        self.search_matches = None  # 当前检索匹配的学生ID集合，未检索时为None
+        self.highlighted_seats = set()  # 检索高亮的座位键
+        self._next_student_id = 0
+        for student_name in ["张三", "李四", "王五", "赵六", "钱七", "孙八", "周九", "吴十"]:
+            self._add_roster_student(Student(-1, student_name))
         self.columns = {}  # 存储座位列数据
+        self.column_widgets = {}  # 列组键 -> 列组容器控件
+        self.selected_seats = set()  # 多选选中的座位键
+        self.constraint_evaluator = None  # 排座约束检查器，随座位表重建
+        self.arrangement_changed.connect(self._update_constraint_violations)
         
         ui_logger.info("开始初始化SeatingChartWindow")
         
@@ -124,6 +282,19 @@ class SeatingChartWindow(QWidget):
         # 初始化导出管理器
         self.export_manager = ExportManager(self)
 
+        # 初始化通知管理器，合并批量操作产生的提示
+        self.notifier = NotificationManager(self)
+
+        # 初始化座位操作日志，用于异常退出后恢复
+        journal_config = self.config.get("journal", {})
+        self.journal = None
+        self.journal_active = False
+        if journal_config.get("enabled", True):
+            self.journal = SessionJournal(
+                directory=journal_config.get("directory", "recovery"),
+                compact_every=journal_config.get("compact_every", 200)
+            )
+
         # 初始化UI
         ui_logger.info("开始初始化UI")
         self._init_ui()
@@ -146,10 +317,7 @@ class SeatingChartWindow(QWidget):
         """设置控制面板"""
         # 创建控制面板卡片
         control_card = CardWidget()
-        control_card.setStyleSheet("""
-            background-color: white;
-            border-radius: 8px;
-        """)
+        control_card.setObjectName("controlCard")
         
         # 主控制面板
         control_layout = QHBoxLayout(control_card)
@@ -165,19 +333,6 @@ class SeatingChartWindow(QWidget):
         self.add_student_edit = LineEdit()
         self.add_student_edit.setFixedWidth(200)
         self.add_student_edit.setPlaceholderText("输入学生姓名")
-        self.add_student_edit.setStyleSheet("""
-            QLineEdit {
-                border: 1px solid #e0e0e0;
-                border-radius: 4px;
-                padding: 6px 12px;
-                font-size: 14px;
-                background-color: white;
-            }
-            QLineEdit:focus {
-                border-color: #2196f3;
-                outline: none;
-            }
-        """)
         
         input_layout.addWidget(self.add_student_edit)
         
@@ -203,12 +358,55 @@ class SeatingChartWindow(QWidget):
         self.export_pdf_button.clicked.connect(self.export_manager.export_for_printing)
         self.export_pdf_button.setFixedHeight(36)
         
+        # 会话保存和打开
+        self.save_session_button = PushButton(
+            "保存会话", icon=QIcon(FIF.SAVE_AS.path()))
+        self.save_session_button.clicked.connect(self.save_session)
+        self.save_session_button.setFixedHeight(36)
+        
+        self.open_session_button = PushButton(
+            "打开会话", icon=QIcon(FIF.FOLDER.path()))
+        self.open_session_button.clicked.connect(self.open_session)
+        self.open_session_button.setFixedHeight(36)
+        
+        # 考场编排（多个班级分配到多个考场）
+        self.exam_button = PushButton(
+            "考场编排", icon=QIcon(FIF.PEOPLE.path()))
+        self.exam_button.clicked.connect(self.arrange_exam)
+        self.exam_button.setFixedHeight(36)
+        
+        # 自动排座：策略选择和执行按钮
+        self.strategy_combo = ComboBox()
+        for name, (label, _) in AutoArranger.STRATEGIES.items():
+            self.strategy_combo.addItem(label, userData=name)
+        self.strategy_combo.setFixedHeight(36)
+        
+        self.auto_arrange_button = PushButton(
+            "自动排座", icon=QIcon(FIF.ROBOT.path()))
+        self.auto_arrange_button.clicked.connect(self.auto_arrange)
+        self.auto_arrange_button.setFixedHeight(36)
+        
+        # 自动填充：把名单中剩余的学生按所选顺序填入空座位
+        self.auto_fill_button = DropDownPushButton(
+            "自动填充", icon=QIcon(FIF.CHECKBOX.path()))
+        fill_menu = RoundMenu(parent=self.auto_fill_button)
+        for order, (label, _) in FILL_ORDERS.items():
+            fill_menu.addAction(Action(label, triggered=lambda checked=False, order=order: self.auto_fill(order)))
+        self.auto_fill_button.setMenu(fill_menu)
+        self.auto_fill_button.setFixedHeight(36)
+        
         # 组装主控制面板
         control_layout.addWidget(input_group)
         control_layout.addWidget(self.add_student_button)
         control_layout.addWidget(self.import_csv_button)
         control_layout.addWidget(self.export_as_image_button)
         control_layout.addWidget(self.export_pdf_button)
+        control_layout.addWidget(self.save_session_button)
+        control_layout.addWidget(self.open_session_button)
+        control_layout.addWidget(self.exam_button)
+        control_layout.addWidget(self.strategy_combo)
+        control_layout.addWidget(self.auto_arrange_button)
+        control_layout.addWidget(self.auto_fill_button)
         
         self.layout.addWidget(control_card)
 
@@ -216,14 +414,11 @@ class SeatingChartWindow(QWidget):
         """设置座位显示区域"""
         # 创建座位图表容器
         seating_container = QWidget()
-        seating_container.setStyleSheet("background-color: transparent; padding: 20px; margin: 0px;")
         
         # 创建座位卡片
         seating_card = CardWidget()
-        seating_card.setStyleSheet("""
-            background-color: white;
-            border-radius: 8px;
-        """)
+        seating_card.setObjectName("seatingCard")
+        self.seating_card = seating_card
         
         self.seating_chart_layout = QHBoxLayout(seating_card)
         self.seating_chart_layout.setSpacing(30)  # 设置列与列之间有适当间距
@@ -243,7 +438,6 @@ class SeatingChartWindow(QWidget):
         """添加讲台组件"""
         # 创建讲台容器
         desk_container = QWidget()
-        desk_container.setStyleSheet("background-color: transparent; padding: 20px;")
         
         # 创建讲台布局
         desk_layout = QHBoxLayout(desk_container)
@@ -253,18 +447,12 @@ class SeatingChartWindow(QWidget):
         # 创建讲台控件
         teacher_desk = QWidget()
         teacher_desk.setFixedSize(240, 90)  # 适当增大讲台尺寸
-        teacher_desk.setStyleSheet("""
-            QWidget {
-                background-color: #e0f2f1;
-                border: 2px solid #26a69a;
-                border-radius: 8px;
-            }
-        """)
+        teacher_desk.setObjectName("teacherDesk")
         
         # 添加讲台标签
         desk_label = QLabel("讲 台")
         desk_label.setAlignment(Qt.AlignCenter)
-        desk_label.setStyleSheet("font-size: 18px; font-weight: 600; color: #00796b;")
+        desk_label.setObjectName("deskLabel")
         desk_inner_layout = QVBoxLayout(teacher_desk)
         desk_inner_layout.addWidget(desk_label)
         
@@ -278,10 +466,7 @@ class SeatingChartWindow(QWidget):
         """设置学生列表区域（水平滚动）"""
         # 创建学生列表卡片
         student_list_card = CardWidget()
-        student_list_card.setStyleSheet("""
-            background-color: white;
-            border-radius: 8px;
-        """)
+        student_list_card.setObjectName("studentListCard")
         
         # 学生列表布局
         student_list_layout = QVBoxLayout(student_list_card)
@@ -289,9 +474,20 @@ class SeatingChartWindow(QWidget):
         student_list_layout.setContentsMargins(20, 16, 20, 16)
         
         # 添加标题
-        title_label = BodyLabel("学生列表 (拖拽到座位)")
-        title_label.setStyleSheet("font-size: 14px; font-weight: 600; color: #424242;")
-        student_list_layout.addWidget(title_label)
+        title_label = QLabel("学生列表 (拖拽到座位)")
+        title_label.setObjectName("studentListTitle")
+        
+        # 检索框：按姓名片段、全拼或拼音首字母筛选名单并高亮座位
+        self.search_edit = SearchLineEdit()
+        self.search_edit.setFixedWidth(240)
+        self.search_edit.setPlaceholderText("搜索姓名/拼音/首字母")
+        self.search_edit.textChanged.connect(self.search_students)
+        
+        header_layout = QHBoxLayout()
+        header_layout.addWidget(title_label)
+        header_layout.addStretch(1)
+        header_layout.addWidget(self.search_edit)
+        student_list_layout.addLayout(header_layout)
         
         # 水平滚动区域
         student_scroll_area = QScrollArea()
@@ -299,34 +495,11 @@ class SeatingChartWindow(QWidget):
         student_scroll_area.setWidgetResizable(True)
         student_scroll_area.setHorizontalScrollBarPolicy(Qt.ScrollBarAsNeeded)
         student_scroll_area.setVerticalScrollBarPolicy(Qt.ScrollBarAlwaysOff)
-        student_scroll_area.setStyleSheet("""
-            QScrollArea {
-                border: 1px solid #e0e0e0;
-                border-radius: 6px;
-                background-color: #fafafa;
-            }
-            QScrollBar:horizontal {
-                height: 8px;
-                background: transparent;
-                margin: 3px 20px 3px 20px;
-            }
-            QScrollBar::handle:horizontal {
-                background: #c0c0c0;
-                border-radius: 4px;
-                min-width: 20px;
-            }
-            QScrollBar::handle:horizontal:hover {
-                background: #90caf9;
-            }
-            QScrollBar::add-line:horizontal, QScrollBar::sub-line:horizontal {
-                height: 0px;
-                width: 0px;
-            }
-        """)
+        student_scroll_area.setObjectName("studentScrollArea")
         
         # 学生列表容器
         self.student_container = QWidget()
-        self.student_container.setStyleSheet("background-color: transparent;")
+        self.student_container.setObjectName("studentContainer")
         self.student_layout = QHBoxLayout(self.student_container)
         self.student_layout.setSpacing(8)
         self.student_layout.setContentsMargins(10, 8, 10, 8)
@@ -372,15 +545,58 @@ class SeatingChartWindow(QWidget):
         
         ui_logger.info("UI刷新完成，所有组件已显示")
         
-        InfoBar.success(
-            title="成功",
-            content="就绪",
-            orient=Qt.Horizontal,
-            isClosable=True,
-            position=InfoBarPosition.TOP_RIGHT,
-            duration=2000,
-            parent=self
-        )
+        self.notifier.success("就绪")
+        self._start_journal()
+
+    def _start_journal(self):
+        """检查上次是否异常退出并提示恢复，然后开始记录座位操作日志"""
+        if self.journal is None or self.journal_active:
+            return
+
+        recovered = self.journal.recover()
+        if recovered is not None and UIUtils.ask_confirmation(
+            self, "恢复座位安排", "检测到上次未正常关闭时的座位安排，是否恢复？"
+        ):
+            self.restore_session(recovered)
+            self.notifier.success("已恢复上次的座位安排")
+
+        self.journal.start(self.get_session())
+        self.journal_active = True
+        self.arrangement_changed.connect(self.journal.record_seats)
+
+    def _snapshot_journal(self):
+        """名单或布局整体变化时，用当前会话替换日志快照"""
+        if self.journal_active:
+            self.journal.snapshot(self.get_session())
+
+    def close_journal(self):
+        """正常退出时停止记录并删除恢复数据"""
+        if self.journal_active:
+            self.journal.close(discard=True)
+            self.journal_active = False
+
+    def _assign_student_id(self, student):
+        """为学生记录分配新的ID并加入检索索引
+
+        Args:
+            student: 学生记录
+        """
+        student.student_id = self._next_student_id
+        self._next_student_id += 1
+        self.roster_index.add(student.student_id, student.name)
+
+    def _add_roster_student(self, student):
+        """为学生分配ID并加入名单（不刷新界面）
+
+        Args:
+            student: 学生记录
+
+        Returns:
+            int: 新学生的ID
+        """
+        self._assign_student_id(student)
+        self.students[student.student_id] = student
+        return student.student_id
 
     def refresh_student_list(self):
         """刷新学生列表显示"""
@@ -389,28 +605,467 @@ class SeatingChartWindow(QWidget):
             widget = self.student_layout.itemAt(i).widget()
             if widget:
                 widget.deleteLater()
+        self.student_labels = {}
         
         # 添加所有学生标签
-        for student in self.students:
+        for student_id, student in self.students.items():
             label = DraggableLabel(student)
+            self._apply_search_filter(label)
             self.student_layout.addWidget(label)
+            self.student_labels[student_id] = label
         
         self.student_container.adjustSize()
 
-    def remove_student_from_list(self, student_name):
-        """从学生列表中移除指定学生"""
-        if student_name in self.students:
-            self.students.remove(student_name)
-            self.refresh_student_list()
-            InfoBar.success(
-            title="成功",
-            content=f"已安排学生 {student_name} 到座位",
-            orient=Qt.Horizontal,
-            isClosable=True,
-            position=InfoBarPosition.TOP_RIGHT,
-            duration=2000,
-            parent=self
+    def remove_student_from_list(self, student_id):
+        """从学生列表中移除指定学生，只删除对应的标签而不重建整个名单
+
+        Args:
+            student_id: 学生ID
+
+        Returns:
+            bool: 学生是否在名单中
+        """
+        if student_id not in self.students:
+            return False
+
+        del self.students[student_id]
+        label = self.student_labels.pop(student_id, None)
+        if label is not None:
+            self.student_layout.removeWidget(label)
+            label.deleteLater()
+            self.student_container.adjustSize()
+        return True
+
+    def remove_students_from_list(self, student_ids):
+        """从学生列表中批量移除学生，暂停名单重绘并只调整一次名单尺寸
+
+        Args:
+            student_ids: 学生ID列表
+        """
+        self.student_container.setUpdatesEnabled(False)
+        try:
+            for student_id in student_ids:
+                if self.students.pop(student_id, None) is None:
+                    continue
+                label = self.student_labels.pop(student_id, None)
+                if label is not None:
+                    self.student_layout.removeWidget(label)
+                    label.deleteLater()
+        finally:
+            self.student_container.setUpdatesEnabled(True)
+        self.student_container.adjustSize()
+
+    def seat_at(self, seat_key):
+        """根据座位键获取座位控件
+
+        Args:
+            seat_key: 座位键(col_key, row, col)
+
+        Returns:
+            SeatMixin: 座位控件，座位不存在时返回None
+        """
+        col_key, row, col = seat_key
+        # 负数下标会从末尾取到其他座位，例如整体平移越过第一列时
+        if row < 0 or col < 0:
+            return None
+        try:
+            return self.columns[col_key][row][col]
+        except (KeyError, IndexError):
+            return None
+
+    def return_students_to_list(self, students):
+        """把学生放回名单末尾，只追加对应的标签
+
+        Args:
+            students: Student列表
+        """
+        if not students:
+            return
+        for student in students:
+            self.students[student.student_id] = student
+            label = DraggableLabel(student)
+            self._apply_search_filter(label)
+            self.student_layout.addWidget(label)
+            self.student_labels[student.student_id] = label
+        self.student_container.adjustSize()
+
+    @contextmanager
+    def suspend_updates(self):
+        """批量修改座位期间暂停座位区域重绘，结束后统一重绘一次"""
+        self.seating_card.setUpdatesEnabled(False)
+        try:
+            yield
+        finally:
+            self.seating_card.setUpdatesEnabled(True)
+
+    def apply_seat_changes(self, changes):
+        """批量更新座位，暂停重绘并只发出一次arrangement_changed信号
+
+        Args:
+            changes: 座位键 -> Student或None（清空）的字典
+
+        Returns:
+            list: 实际生效的变更(座位键, Student或None)
+        """
+        applied = []
+        with self.suspend_updates():
+            for seat_key, student in changes.items():
+                seat = self.seat_at(seat_key)
+                if seat is None:
+                    continue
+                if student is None:
+                    if seat.is_occupied:
+                        self._forget_student_seat(seat.student_id, seat_key)
+                        seat.clear_seat()
+                        applied.append((seat_key, None))
+                elif seat.student is not student:
+                    if seat.is_occupied:
+                        self._forget_student_seat(seat.student_id, seat_key)
+                    seat.set_student(student)
+                    self.student_seats[student.student_id] = seat_key
+                    seat.set_highlighted(
+                        self.search_matches is not None and student.student_id in self.search_matches
+                    )
+                    if seat.is_highlighted:
+                        self.highlighted_seats.add(seat_key)
+                    applied.append((seat_key, student))
+
+        if applied:
+            self.arrangement_changed.emit(applied)
+        return applied
+
+    def _forget_student_seat(self, student_id, seat_key):
+        """学生离开座位时移除座位索引和检索高亮"""
+        if self.student_seats.get(student_id) == seat_key:
+            del self.student_seats[student_id]
+        if seat_key in self.highlighted_seats:
+            self.highlighted_seats.discard(seat_key)
+            self.seat_at(seat_key).set_highlighted(False)
+
+    def _seated_students(self):
+        """获取所有已入座学生
+
+        Returns:
+            list: Student列表
+        """
+        return [self.seat_at(seat_key).student for seat_key in self.student_seats.values()]
+
+    def _apply_search_filter(self, label):
+        """按当前检索结果设置名单标签的可见性"""
+        label.setVisible(self.search_matches is None or label.student_id in self.search_matches)
+
+    def search_students(self, query):
+        """检索学生：筛选名单并高亮已入座学生的座位
+
+        只切换可见性或高亮状态发生变化的控件，不重建名单
+
+        Args:
+            query: 检索文本
+        """
+        matches = self.roster_index.search(query) if query.strip() else None
+        self.search_matches = matches
+
+        self.student_container.setUpdatesEnabled(False)
+        for student_id, label in self.student_labels.items():
+            visible = matches is None or student_id in matches
+            if label.isVisibleTo(self.student_container) != visible:
+                label.setVisible(visible)
+        self.student_container.setUpdatesEnabled(True)
+        self.student_container.adjustSize()
+
+        if matches is None:
+            new_highlighted = set()
+        else:
+            new_highlighted = {
+                self.student_seats[student_id] for student_id in matches
+                if student_id in self.student_seats
+            }
+        with self.suspend_updates():
+            for seat_key in self.highlighted_seats - new_highlighted:
+                self.seat_at(seat_key).set_highlighted(False)
+            for seat_key in new_highlighted - self.highlighted_seats:
+                self.seat_at(seat_key).set_highlighted(True)
+        self.highlighted_seats = new_highlighted
+
+    def _seat_content(self, seat_key):
+        """获取座位上的学生记录，空座位返回None"""
+        seat = self.seat_at(seat_key)
+        if seat is None:
+            return None
+        return seat.student
+
+    def place_student(self, seat, student_id, student_name, source_seat=None):
+        """把学生放到座位上，一次完成座位更新、清空来源座位和移出名单
+
+        目标座位已有学生时：从座位拖来则两人交换座位，从名单拖来则原学生回到名单
+
+        Args:
+            seat: 目标座位控件
+            student_id: 学生ID，拖拽数据中没有ID时为-1
+            student_name: 学生姓名
+            source_seat: 来源座位键，从名单拖入时为None
+        """
+        if source_seat == seat.seat_key:
+            return
+
+        displaced = self._seat_content(seat.seat_key)
+
+        if source_seat is not None:
+            student = self._seat_content(source_seat)
+            if student is None or student.student_id != student_id:
+                return
+            changes = {seat.seat_key: student, source_seat: displaced}
+            displaced = None
+        else:
+            student = self.students.get(student_id)
+            if student is None:
+                # 兼容不带ID的拖拽数据：按姓名在名单中查找，找不到时创建新学生
+                student = next(
+                    (s for s in self.students.values() if s.name == student_name),
+                    None
+                )
+                if student is None:
+                    student = Student(-1, student_name)
+                    self._assign_student_id(student)
+            self.remove_student_from_list(student.student_id)
+            changes = {seat.seat_key: student}
+
+        self.apply_seat_changes(changes)
+        if displaced is not None:
+            self.return_students_to_list([displaced])
+
+        if source_seat is None:
+            self.notifier.success(
+                "已安排 {count} 名学生",
+                key="arranged",
+                single=f"已安排学生 {student.name} 到座位"
+            )
+
+    def check_drop(self, seat_key, student_id, source_seat=None):
+        """检查把学生拖到座位上是否违反排座约束，供座位控件显示拖拽提示
+
+        Args:
+            seat_key: 目标座位键
+            student_id: 被拖动的学生ID
+            source_seat: 来源座位键，从名单拖入时为None
+
+        Returns:
+            list: 违规原因列表；学生未知时返回None
+        """
+        if self.constraint_evaluator is None:
+            return None
+        student = self.students.get(student_id)
+        if student is None and source_seat is not None:
+            student = self._seat_content(source_seat)
+        if student is None or student.student_id != student_id:
+            return None
+        return self.constraint_evaluator.check_drop(seat_key, student, source_seat)
+
+    def _update_constraint_violations(self, changes):
+        """座位变化后增量更新约束违规标记，出现违规时提示
+
+        Args:
+            changes: (座位键, Student或None)列表
+        """
+        if self.constraint_evaluator is None:
+            return
+        violations = []
+        for seat_key, reasons in self.constraint_evaluator.apply(changes).items():
+            seat = self.seat_at(seat_key)
+            if seat is None:
+                continue
+            seat.set_violation(reasons)
+            if reasons:
+                violations.append(f"{seat.student_name}{reasons[0]}")
+        if violations:
+            self.notifier.warning(
+                "有 {count} 个座位违反排座规则", key="constraint",
+                single=violations[0], count=len(violations)
+            )
+
+    def toggle_seat_selection(self, seat):
+        """切换座位的多选状态
+
+        Args:
+            seat: 座位控件
+        """
+        if seat.seat_key in self.selected_seats:
+            self.selected_seats.discard(seat.seat_key)
+            seat.set_selected(False)
+        else:
+            self.selected_seats.add(seat.seat_key)
+            seat.set_selected(True)
+
+    def clear_selection(self):
+        """取消所有座位的多选状态"""
+        if not self.selected_seats:
+            return
+        with self.suspend_updates():
+            for seat_key in self.selected_seats:
+                seat = self.seat_at(seat_key)
+                if seat is not None:
+                    seat.set_selected(False)
+        self.selected_seats = set()
+
+    def move_seats(self, seat_keys, anchor_seat, target_seat):
+        """整体移动一组座位上的学生
+
+        所有座位按起点座位到目标座位的行列偏移平移到目标座位所在的列组，
+        目标位置上原有的其他学生依次移到空出的座位上，整个移动作为一次批量更新完成
+
+        Args:
+            seat_keys: 被移动的座位键列表
+            anchor_seat: 拖拽起点座位键
+            target_seat: 放置的目标座位键
+
+        Returns:
+            bool: 是否移动成功
+        """
+        target_col_key, target_row, target_col = target_seat
+        row_offset = target_row - anchor_seat[1]
+        col_offset = target_col - anchor_seat[2]
+        if target_seat == anchor_seat:
+            return False
+
+        destinations = {}
+        for seat_key in seat_keys:
+            _, row, col = seat_key
+            destination = (target_col_key, row + row_offset, col + col_offset)
+            if self.seat_at(destination) is None:
+                self.show_status_message("目标位置超出座位范围，无法移动")
+                return False
+            destinations[seat_key] = destination
+
+        destination_set = set(destinations.values())
+        if len(destination_set) < len(destinations):
+            # 不同列组中相同行列的座位会平移到同一个座位
+            self.show_status_message("所选座位移动后会重叠，无法移动")
+            return False
+        displaced = [
+            self._seat_content(destination) for destination in destinations.values()
+            if destination not in destinations
+        ]
+        freed = sorted(seat_key for seat_key in seat_keys if seat_key not in destination_set)
+
+        changes = {}
+        for seat_key in freed:
+            changes[seat_key] = None
+        for seat_key, student in zip(freed, displaced):
+            changes[seat_key] = student
+        for seat_key, destination in destinations.items():
+            changes[destination] = self._seat_content(seat_key)
+
+        # 选中状态跟随座位移动
+        self.clear_selection()
+        self.apply_seat_changes(changes)
+        with self.suspend_updates():
+            for destination in destination_set:
+                self.toggle_seat_selection(self.seat_at(destination))
+        return True
+
+    def all_seat_keys(self):
+        """按列组、行、列顺序列出当前布局的全部座位键
+
+        Returns:
+            list: 座位键列表
+        """
+        return [
+            (col_key, row, col)
+            for col_key, config in self.current_layout_config.items()
+            for row in range(config["rows"])
+            for col in range(config["cols"])
+        ]
+
+    def auto_arrange(self):
+        """按所选策略重新安排全部学生（已入座和名单中的学生）
+
+        结果作为一次批量座位更新应用，座位不足时未安排的学生留在名单中
+        """
+        name = self.strategy_combo.currentData()
+        students = self._seated_students() + list(self.students.values())
+        if not students:
+            self.notifier.warning("没有可安排的学生")
+            return
+
+        try:
+            assignment = AutoArranger.arrange(
+                name, students, self.all_seat_keys(), self.current_layout_config,
+                self.config.get("constraints", {})
+            )
+        except Exception as e:
+            LogManager.exception(ui_logger, f"自动排座失败: {str(e)}")
+            UIUtils.show_error_message(self, "错误", f"自动排座时出错: {str(e)}")
+            return
+
+        changes = {seat_key: None for seat_key in self.student_seats.values()}
+        changes.update(assignment)
+        self.clear_selection()
+        self.apply_seat_changes(changes)
+
+        placed = {student.student_id for student in assignment.values()}
+        self.students = {
+            student.student_id: student for student in students if student.student_id not in placed
+        }
+        self.refresh_student_list()
+        self._snapshot_journal()
+        self.notifier.success(
+            f"已按\"{AutoArranger.STRATEGIES[name][0]}\"安排 {len(assignment)} 名学生", key="auto_arranged"
+        )
+
+    def auto_fill(self, order):
+        """把名单中剩余的学生按指定顺序填入空座位
+
+        作为一次批量座位更新应用，名单也只批量移除一次
+
+        Args:
+            order: 填充顺序名称，见FILL_ORDERS
+        """
+        if not self.students:
+            self.notifier.warning("名单中没有待安排的学生")
+            return
+        empty_seats = [
+            seat_key for seat_key in self.all_seat_keys()
+            if not self.seat_at(seat_key).is_occupied
+        ]
+        if not empty_seats:
+            self.notifier.warning("没有空座位")
+            return
+
+        assignment = AutoArranger.fill(
+            order, list(self.students.values()), empty_seats, self.current_layout_config
         )
+        self.apply_seat_changes(assignment)
+        self.remove_students_from_list([student.student_id for student in assignment.values()])
+
+        remaining = len(self.students)
+        self.notifier.success(
+            f"已按\"{FILL_ORDERS[order][0]}\"填充 {len(assignment)} 名学生"
+            + (f"，座位不足，{remaining} 名学生留在名单中" if remaining else ""),
+            key="auto_filled"
+        )
+
+    def clear_seats(self, seat_keys):
+        """批量清空座位，座位上的学生回到名单
+
+        Args:
+            seat_keys: 要清空的座位键列表
+        """
+        students = [student for student in map(self._seat_content, seat_keys) if student is not None]
+        if not students:
+            return
+        self.clear_selection()
+        self.apply_seat_changes({seat_key: None for seat_key in seat_keys})
+        self.return_students_to_list(students)
+        self.show_status_message(f"已清空 {len(students)} 个座位")
+
+    def keyPressEvent(self, event):
+        """Delete键清空所选座位，Esc键取消选择"""
+        if event.key() == Qt.Key_Delete and self.selected_seats:
+            self.clear_seats(sorted(self.selected_seats))
+        elif event.key() == Qt.Key_Escape:
+            self.clear_selection()
+        else:
+            super().keyPressEvent(event)
 
     def setup_seating_chart(self, layout_config=None):
         """设置座位图表布局"""
@@ -420,22 +1075,174 @@ class SeatingChartWindow(QWidget):
         
         # 保存当前布局配置
         self.current_layout_config = layout_config.copy()
+        self.selected_seats = set()
+        self.highlighted_seats = set()
+        for student_id in list(self.student_seats):
+            self.roster_index.remove(student_id)
+        self.student_seats = {}
+        self.constraint_evaluator = ConstraintEvaluator(layout_config, self.config.get("constraints", {}))
         
         # 清空现有座位
         for i in reversed(range(self.seating_chart_layout.count())):
             widget = self.seating_chart_layout.itemAt(i).widget()
             if widget:
                 widget.deleteLater()
+        self.columns = {}
+        self.column_widgets = {}
         
         # 创建所有配置的座位列
         for col_key in layout_config:
             self._create_seating_column(col_key, layout_config[col_key])
+        self._snapshot_journal()
+        self.layout_changed.emit()
+
+    def apply_layout(self, layout_config, column_names):
+        """按新布局增量更新座位表
+
+        行列数或尺寸变化的列组复用原有座位控件重新排列，只补建或删除多出的座位；
+        删除已移除的列组，新增的列组按布局配置中的顺序插入，改名的列组只更新标题。
+        变化列组中的学生保持到讲台的排数和所在列，超出范围或所在列组被删除的学生回到名单
+
+        Args:
+            layout_config: 新的布局配置
+            column_names: 新的列名配置
+
+        Returns:
+            list: 回到名单的学生
+        """
+        old_layout = self.current_layout_config
+        removed = [col_key for col_key in old_layout if col_key not in layout_config]
+        changed = [
+            col_key for col_key in old_layout
+            if col_key in layout_config and layout_config[col_key] != old_layout[col_key]
+        ]
+        added = [col_key for col_key in layout_config if col_key not in old_layout]
+
+        # 先清空受影响列组中的座位，记录需要重新入座的学生
+        affected = set(removed) | set(changed)
+        occupants = {
+            seat_key: student for seat_key, student in self.occupied_seats().items() if seat_key[0] in affected
+        }
+        self.clear_selection()
+        self.apply_seat_changes({seat_key: None for seat_key in occupants})
+
+        self.current_layout_config = layout_config.copy()
+        self.config["layout_config"] = layout_config
+        self.config["column_names"] = column_names
+        with self.suspend_updates():
+            for col_key in removed:
+                self.seating_chart_layout.removeWidget(self.column_widgets[col_key])
+                self.column_widgets.pop(col_key).deleteLater()
+                del self.columns[col_key]
+            reused = 0
+            for col_key in changed:
+                reused += self._reshape_seating_column(col_key, layout_config[col_key])
+            for col_key in added:
+                self._create_seating_column(col_key, layout_config[col_key])
+            self._order_seating_columns(layout_config)
+            for col_key, column_widget in self.column_widgets.items():
+                title = column_widget.findChild(QLabel, f"col_title_{col_key}")
+                if title is not None and col_key in column_names and title.text() != column_names[col_key]:
+                    title.setText(column_names[col_key])
+
+        # 约束检查器按新布局重建，未变化列组中的学生直接计入，违规标记保持不变
+        self.constraint_evaluator = ConstraintEvaluator(layout_config, self.config.get("constraints", {}))
+        self.constraint_evaluator.apply(list(self.occupied_seats().items()))
+
+        # 重建的列组按到讲台的排数对应座位（讲台在下方，最后一排为第一排）
+        kept = {}
+        displaced = []
+        for (col_key, row, col), student in occupants.items():
+            if col_key in layout_config:
+                row += layout_config[col_key]["rows"] - old_layout[col_key]["rows"]
+            seat_key = (col_key, row, col)
+            if row >= 0 and self.seat_at(seat_key) is not None:
+                kept[seat_key] = student
+            else:
+                displaced.append(student)
+        self.apply_seat_changes(kept)
+        self.return_students_to_list(displaced)
+        self._snapshot_journal()
+        self.layout_changed.emit()
+        LogManager.info(
+            ui_logger,
+            f"布局已更新：新增 {len(added)} 个列组，删除 {len(removed)} 个，调整 {len(changed)} 个"
+            f"（复用 {reused} 个座位），{len(displaced)} 名学生回到名单"
+        )
+        return displaced
     
 
+    def _order_seating_columns(self, layout_config):
+        """按布局配置的顺序排列座位区域中的列组
+
+        新增的列组先追加在末尾，例如删除中间的列组后再加回来时，需要移回它在配置中的位置，
+        使屏幕上的顺序与导出、自动排座和公平性统计使用的顺序一致
+
+        Args:
+            layout_config: 布局配置，键的顺序即列组的顺序
+        """
+        for index, col_key in enumerate(layout_config):
+            column_widget = self.column_widgets[col_key]
+            if self.seating_chart_layout.indexOf(column_widget) != index:
+                self.seating_chart_layout.removeWidget(column_widget)
+                self.seating_chart_layout.insertWidget(index, column_widget)
+        self.columns = {col_key: self.columns[col_key] for col_key in layout_config}
+        self.column_widgets = {col_key: self.column_widgets[col_key] for col_key in layout_config}
+
+    def _reshape_seating_column(self, col_key, config):
+        """按新的行列数和尺寸重新排列已有列组的座位，尽量复用原有座位控件
+
+        调用前列组中的座位必须已经清空。原有座位按行优先的顺序依次分配到新位置，
+        座位不够时补建，多出的座位删除
+
+        Args:
+            col_key: 列组键
+            config: 列组的新布局配置
+
+        Returns:
+            int: 复用的座位数量
+        """
+        grid_layout = self.column_widgets[col_key].findChild(QWidget, "seatGrid").layout()
+        pool = [seat for row_seats in self.columns[col_key] for seat in row_seats]
+        for seat in pool:
+            grid_layout.removeWidget(seat)
+        # 网格的行列数不会缩小，多出的行列去掉最小尺寸后不占空间
+        for row in range(grid_layout.rowCount()):
+            grid_layout.setRowMinimumHeight(row, config["row_height"] if row < config["rows"] else 0)
+        for col in range(grid_layout.columnCount()):
+            grid_layout.setColumnMinimumWidth(col, config["col_width"] if col < config["cols"] else 0)
+        for row in range(grid_layout.rowCount(), config["rows"]):
+            grid_layout.setRowMinimumHeight(row, config["row_height"])
+        for col in range(grid_layout.columnCount(), config["cols"]):
+            grid_layout.setColumnMinimumWidth(col, config["col_width"])
+
+        seat_class = SEAT_WIDGETS.get(self.config.get("seat_widget"), PaintedSeatWidget)
+        reused = min(len(pool), config["rows"] * config["cols"])
+        pool.reverse()
+        self.columns[col_key] = []
+        for row in range(config["rows"]):
+            row_seats = []
+            for col in range(config["cols"]):
+                if pool:
+                    seat = pool.pop()
+                    seat.reassign((col_key, row, col))
+                else:
+                    seat = seat_class(seat_key=(col_key, row, col))
+                grid_layout.addWidget(seat, row, col)
+                row_seats.append(seat)
+            self.columns[col_key].append(row_seats)
+        for seat in pool:
+            seat.deleteLater()
+        return reused
+
     def _create_seating_column(self, col_key, config):
-        """创建单个列的座位布局"""
+        """创建单个列的座位布局，追加到座位区域末尾
+
+        Args:
+            col_key: 列组键
+            config: 列组的布局配置
+        """
         column_widget = QWidget()
-        column_widget.setStyleSheet("background-color: transparent;")
         column_layout = QVBoxLayout(column_widget)
         column_layout.setContentsMargins(0, 0, 0, 0)  # 设置列容器无内边距
         column_layout.setSpacing(15)  # 设置列内组件适当间距
@@ -457,30 +1264,19 @@ class SeatingChartWindow(QWidget):
                     "column2": "中",
                     "column3": "北"
                 }
-                col_name = default_column_names.get(col_key, f"列{col_key[-1]}")
+                col_name = default_column_names.get(col_key) or ConfigManager.default_column_name(col_key)
                 config_logger.debug(f"使用默认列名 {col_key}: {col_name}")
         except Exception as e:
             config_logger.error(f"异常: {str(e)}")
             # 出现任何异常，使用简单的列名
-            col_name = f"列{col_key[-1]}"
+            col_name = ConfigManager.default_column_name(col_key)
             config_logger.debug(f"使用简单列名 {col_key}: {col_name}")
         
-        # 创建列标题，使用更强的样式确保可见性
-        col_title = BodyLabel(col_name)
+        # 创建列标题，样式由主题样式表按role属性匹配
+        col_title = QLabel(col_name)
         col_title.setObjectName(f"col_title_{col_key}")
+        col_title.setProperty("role", "columnTitle")
         col_title.setAlignment(Qt.AlignCenter)
-        # 使用更醒目的样式
-        col_title.setStyleSheet("""
-            font-size: 18px;
-            font-weight: bold;
-            color: #1976d2;
-            padding: 12px 20px;
-            background-color: #e3f2fd;
-            border: 2px solid #1976d2;
-            border-radius: 8px;
-            min-height: 45px;
-            min-width: 80px;
-        """)
         # 确保标签大小合适
         col_title.setMinimumSize(100, 50)
         # 添加到布局并确保可见
@@ -490,11 +1286,7 @@ class SeatingChartWindow(QWidget):
         
         # 网格布局容器，添加背景
         grid_container = QWidget()
-        grid_container.setStyleSheet("""
-            background-color: #f5f5f5;
-            border-radius: 8px;
-            padding: 10px;
-        """)
+        grid_container.setObjectName("seatGrid")
         
         # 网格布局
         grid_layout = QGridLayout(grid_container)
@@ -506,48 +1298,47 @@ class SeatingChartWindow(QWidget):
         for col in range(config["cols"]):
             grid_layout.setColumnMinimumWidth(col, config["col_width"])
         
-        # 添加座位控件
+        # 添加座位控件，默认使用自绘座位，config.json中seat_widget为"card"时使用卡片座位
+        seat_class = SEAT_WIDGETS.get(self.config.get("seat_widget"), PaintedSeatWidget)
         self.columns[col_key] = []
         for row in range(config["rows"]):
             row_seats = []
             for col in range(config["cols"]):
-                seat = SeatWidget()
+                seat = seat_class(seat_key=(col_key, row, col))
                 grid_layout.addWidget(seat, row, col)
                 row_seats.append(seat)
             self.columns[col_key].append(row_seats)
         
         column_layout.addWidget(grid_container)
         self.seating_chart_layout.addWidget(column_widget)
+        self.column_widgets[col_key] = column_widget
 
     def add_student(self):
         """添加新学生到列表"""
         student_name = self.add_student_edit.text().strip()
         if not student_name:
             return
-            
-        if student_name in self.students:
-            InfoBar.warning(
-            title="警告",
-            content="学生已存在",
-            orient=Qt.Horizontal,
-            isClosable=True,
-            position=InfoBarPosition.TOP_RIGHT,
-            duration=2000,
-            parent=self
+
+        # 允许重名学生：新学生总是分配新的ID，只在提示中说明已有同名学生
+        duplicate = any(student.name == student_name for student in self.students.values()) or any(
+            student.name == student_name for student in self._seated_students()
         )
-            return
-            
-        self.students.append(student_name)
-        self.refresh_student_list()
+        student = Student(-1, student_name)
+        student_id = self._add_roster_student(student)
+        label = DraggableLabel(student)
+        if self.search_matches is not None:
+            self.search_matches = self.roster_index.search(self.search_edit.text())
+        self._apply_search_filter(label)
+        self.student_layout.addWidget(label)
+        self.student_labels[student_id] = label
+        self.student_container.adjustSize()
         self.add_student_edit.clear()
-        InfoBar.success(
-            title="成功",
-            content=f"已添加学生: {student_name}",
-            orient=Qt.Horizontal,
-            isClosable=True,
-            position=InfoBarPosition.TOP_RIGHT,
-            duration=2000,
-            parent=self
+        if self.journal_active:
+            self.journal.record_added_students([student])
+        self.notifier.success(
+            "已添加 {count} 名学生",
+            key="added",
+            single=f"已添加学生: {student_name}" + ("（已有同名学生）" if duplicate else "")
         )
 
     def import_from_csv(self):
@@ -555,17 +1346,17 @@ class SeatingChartWindow(QWidget):
         new_students = CSVManager.import_from_csv(self)
         
         if new_students:
-            self.students = new_students
+            self.students = {}
+            self.roster_index.rebuild(
+                (student.student_id, student.name) for student in self._seated_students()
+            )
+            for student in new_students:
+                self._add_roster_student(student)
+            if self.search_matches is not None:
+                self.search_matches = self.roster_index.search(self.search_edit.text())
             self.refresh_student_list()
-            InfoBar.success(
-            title="成功",
-            content=f"已从CSV文件导入 {len(new_students)} 名学生",
-            orient=Qt.Horizontal,
-            isClosable=True,
-            position=InfoBarPosition.TOP_RIGHT,
-            duration=2000,
-            parent=self
-        )
+            self._snapshot_journal()
+            self.notifier.success(f"已从CSV文件导入 {len(new_students)} 名学生", key="imported")
         elif not new_students:
             # 用户取消操作或文件为空的情况不显示警告
             pass
@@ -573,14 +1364,212 @@ class SeatingChartWindow(QWidget):
             # 这里处理的是已经在CSVManager中处理过的错误，无需额外处理
             pass
 
+    def occupied_seats(self):
+        """获取所有已入座座位
+
+        Returns:
+            dict: 座位键 -> Student
+        """
+        return {
+            seat_key: self.seat_at(seat_key).student
+            for seat_key in self.student_seats.values()
+        }
+
+    def get_session(self):
+        """获取当前会话数据（布局、名单和座位分配）
+
+        Returns:
+            dict: 会话数据
+        """
+        return SessionManager.build_session(
+            self.current_layout_config,
+            self.config.get("column_names", {}),
+            list(self.students.values()),
+            self.occupied_seats()
+        )
+
+    def restore_session(self, session):
+        """恢复会话
+
+        布局和列名未变化时直接复用现有座位控件，只做一次批量座位更新；
+        布局变化时重建座位表后再批量填入学生
+
+        Args:
+            session: 会话数据
+        """
+        layout_config = session["layout_config"]
+        column_names = session["column_names"]
+        if layout_config != self.current_layout_config or column_names != self.config.get("column_names"):
+            self.config["layout_config"] = layout_config
+            self.config["column_names"] = column_names
+            self.config_manager.update_config(self.config)
+            self.setup_seating_chart(layout_config)
+            self.layout_restored.emit(layout_config, column_names)
+
+        roster, seats = SessionManager.unpack(session)
+        changes = {seat_key: None for seat_key in self.student_seats.values()}
+        changes.update(seats)
+        self.clear_selection()
+        self.apply_seat_changes(changes)
+
+        self.students = {student.student_id: student for student in roster}
+        self._next_student_id = max(session["student_ids"], default=-1) + 1
+        self.roster_index.rebuild(
+            (student.student_id, student.name)
+            for student in list(self.students.values()) + self._seated_students()
+        )
+        if self.search_matches is not None:
+            self.search_matches = self.roster_index.search(self.search_edit.text())
+        self.refresh_student_list()
+        self._snapshot_journal()
+
+    def save_session(self):
+        """保存当前会话到文件"""
+        file_path, _ = QFileDialog.getSaveFileName(
+            self, "保存会话", "座位安排" + SessionManager.FILE_EXT, SessionManager.FILE_FILTER
+        )
+        if not file_path:
+            return
+        try:
+            SessionManager.save(file_path, self.get_session())
+            self.notifier.success(f"会话已保存到: {file_path}")
+        except Exception as e:
+            LogManager.exception(ui_logger, f"保存会话失败: {str(e)}")
+            UIUtils.show_error_message(self, "错误", f"保存会话时出错: {str(e)}")
+
+    def open_session(self):
+        """从文件打开会话"""
+        file_path, _ = QFileDialog.getOpenFileName(
+            self, "打开会话", "", SessionManager.FILE_FILTER + ";;所有文件 (*)"
+        )
+        if not file_path:
+            return
+        try:
+            self.restore_session(SessionManager.load(file_path))
+            self.notifier.success(f"已打开会话: {file_path}")
+        except Exception as e:
+            LogManager.exception(ui_logger, f"打开会话失败: {str(e)}")
+            UIUtils.show_error_message(self, "错误", f"打开会话时出错: {str(e)}")
+
+    def arrange_exam(self):
+        """考场编排：导入多个班级的CSV名单，按当前布局分配到多个考场并导出CSV
+
+        每个CSV文件为一个班级，文件名作为班级名；同班学生不相邻，座位号按考场编排。
+        导出CSV后可选择在同一目录生成门贴、桌贴和签到表PDF
+        """
+        file_paths, _ = QFileDialog.getOpenFileNames(
+            self, "选择各班级的CSV名单", "", "CSV文件 (*.csv);;所有文件 (*)"
+        )
+        if not file_paths:
+            return
+
+        rosters = {}
+        try:
+            for file_path in file_paths:
+                with open(file_path, 'r', encoding='utf-8-sig') as file:
+                    students = CSVManager.read_students(csv.reader(file))
+                for student_id, student in enumerate(students):
+                    student.student_id = student_id
+                rosters[ExamAllocator.class_name_from_path(file_path)] = students
+        except Exception as e:
+            LogManager.exception(ui_logger, f"读取班级名单失败: {str(e)}")
+            UIUtils.show_error_message(self, "错误", f"读取班级名单时出错: {str(e)}")
+            return
+
+        total = sum(len(students) for students in rosters.values())
+        capacity = ExamAllocator.room_capacity(self.current_layout_config)
+        if total == 0 or capacity == 0:
+            UIUtils.show_warning_message(self, "警告", "名单为空或当前布局没有座位")
+            return
+
+        min_rooms = -(-total // capacity)
+        room_count, ok = QInputDialog.getInt(
+            self, "考场编排",
+            f"共 {len(rosters)} 个班级 {total} 名学生，每个考场 {capacity} 个座位。\n考场数量:",
+            min_rooms, min_rooms, max(min_rooms, 999)
+        )
+        if not ok:
+            return
+
+        rooms = [(f"第{index + 1}考场", self.current_layout_config) for index in range(room_count)]
+        try:
+            allocations = ExamAllocator.allocate_exam(rosters, rooms)
+        except ValueError as e:
+            UIUtils.show_warning_message(self, "警告", str(e))
+            return
+
+        file_path, _ = QFileDialog.getSaveFileName(
+            self, "保存考场安排", "考场安排.csv", "CSV文件 (*.csv)"
+        )
+        if not file_path:
+            return
+        try:
+            ExamAllocator.write_allocation_csv(
+                allocations, file_path, self.config.get("column_names", {})
+            )
+        except Exception as e:
+            LogManager.exception(ui_logger, f"保存考场安排失败: {str(e)}")
+            UIUtils.show_error_message(self, "错误", f"保存考场安排时出错: {str(e)}")
+            return
+
+        violations = sum(allocation.violations for allocation in allocations)
+        if violations:
+            self.notifier.warning(f"座位不足以完全隔开同班学生，有 {violations} 对同班学生相邻")
+        self.notifier.success(f"已将 {total} 名学生安排到 {room_count} 个考场: {file_path}")
+
+        if UIUtils.ask_confirmation(self, "考场资料", "是否同时生成门贴、桌贴和签到表PDF？"):
+            try:
+                QApplication.setOverrideCursor(Qt.WaitCursor)
+                try:
+                    pdf_paths = ExamDocumentExporter.write_all(
+                        allocations, os.path.splitext(file_path)[0], self.config.get("column_names", {}),
+                        cache=self.export_manager.cache
+                    )
+                finally:
+                    QApplication.restoreOverrideCursor()
+                self.notifier.success(f"已生成考场资料: {', '.join(os.path.basename(path) for path in pdf_paths)}")
+            except Exception as e:
+                LogManager.exception(ui_logger, f"生成考场资料失败: {str(e)}")
+                UIUtils.show_error_message(self, "错误", f"生成考场资料时出错: {str(e)}")
+
+    def analyze_fairness(self):
+        """公平性分析：选择按周保存的会话文件，导出统计表和座位排数热力图
+
+        会话文件按文件名排序作为周次顺序
+        """
+        file_paths, _ = QFileDialog.getOpenFileNames(
+            self, "选择按周保存的会话文件", "", SessionManager.FILE_FILTER
+        )
+        if not file_paths:
+            return
+        file_paths.sort()
+
+        try:
+            sessions = FairnessAnalyzer.load_sessions(file_paths)
+        except Exception as e:
+            LogManager.exception(ui_logger, f"加载会话失败: {str(e)}")
+            UIUtils.show_error_message(self, "错误", f"加载会话时出错: {str(e)}")
+            return
+        report = FairnessAnalyzer.analyze(
+            sessions, [os.path.splitext(os.path.basename(path))[0] for path in file_paths]
+        )
+
+        file_path, _ = QFileDialog.getSaveFileName(
+            self, "保存公平性热力图", "座位公平性.png", "PNG图片 (*.png)"
+        )
+        if not file_path:
+            return
+        try:
+            FairnessAnalyzer.render_heatmap(report, file_path)
+            FairnessAnalyzer.write_csv(report, os.path.splitext(file_path)[0] + ".csv")
+        except Exception as e:
+            LogManager.exception(ui_logger, f"导出公平性分析失败: {str(e)}")
+            UIUtils.show_error_message(self, "错误", f"导出公平性分析时出错: {str(e)}")
+            return
+        UIUtils.show_info_message(
+            self, "公平性分析", f"{report.summary_text()}\n\n热力图和统计表已保存到: {os.path.dirname(file_path)}"
+        )
+
     def show_status_message(self, message):
         """显示状态栏消息"""
-        InfoBar.info(
-            title="信息",
-            content=message,
-            orient=Qt.Horizontal,
-            isClosable=True,
-            position=InfoBarPosition.TOP_RIGHT,
-            duration=2000,
-            parent=self
-        )
\ No newline at end of file
+        self.notifier.info(message)
\ No newline at end of file
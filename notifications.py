@@ -0,0 +1,135 @@
+from PyQt5 import sip
+from PyQt5.QtCore import QObject, Qt, QTimer
+from qfluentwidgets import InfoBar, InfoBarPosition
+
+
+class _PendingNotification:
+    """合并窗口内尚未显示的通知"""
+    __slots__ = ("level", "title", "template", "single", "count")
+
+    def __init__(self, level, title, template, single):
+        self.level = level
+        self.title = title
+        self.template = template
+        self.single = single
+        self.count = 0
+
+    def content(self):
+        """生成最终显示的通知内容"""
+        if self.count == 1 and self.single is not None:
+            return self.single
+        return self.template.replace("{count}", str(self.count))
+
+
+class NotificationManager(QObject):
+    """通知管理器
+
+    统一显示InfoBar提示：相同key的通知在合并窗口内合并为一条（例如"已安排 12 名学生"），
+    同一key同时只保留一条提示，并限制同时存在的提示数量，避免批量操作时堆叠大量动画控件
+    """
+    def __init__(self, parent_widget, merge_window_ms=300, max_live=3, duration=2000):
+        """初始化通知管理器
+
+        Args:
+            parent_widget: 显示提示的父控件
+            merge_window_ms: 合并窗口（毫秒），窗口内相同key的通知合并显示
+            max_live: 同时存在的提示数量上限
+            duration: 提示显示时长（毫秒）
+        """
+        super().__init__(parent_widget)
+        self.parent_widget = parent_widget
+        self.max_live = max_live
+        self.duration = duration
+
+        self._pending = {}     # key -> _PendingNotification，保持到达顺序
+        self._live = []        # [(key, InfoBar)]，按显示先后排列
+
+        self._flush_timer = QTimer(self)
+        self._flush_timer.setSingleShot(True)
+        self._flush_timer.setInterval(merge_window_ms)
+        self._flush_timer.timeout.connect(self.flush)
+
+    def notify(self, level, content, key=None, title=None, single=None, count=1):
+        """提交一条通知
+
+        Args:
+            level: 提示级别，success/info/warning/error
+            content: 通知内容，可包含{count}占位符表示合并后的数量
+            key: 合并键，相同key的通知会合并；为None时使用内容本身
+            title: 提示标题，默认按级别选择
+            single: 合并后数量为1时显示的内容，默认使用content
+            count: 本条通知计入的数量
+        """
+        key = key or content
+        pending = self._pending.get(key)
+        if pending is None:
+            pending = self._pending[key] = _PendingNotification(
+                level, title or self._default_title(level), content, single
+            )
+        pending.count += count
+
+        if not self._flush_timer.isActive():
+            self._flush_timer.start()
+
+    def success(self, content, **kwargs):
+        """提交成功通知"""
+        self.notify("success", content, **kwargs)
+
+    def info(self, content, **kwargs):
+        """提交信息通知"""
+        self.notify("info", content, **kwargs)
+
+    def warning(self, content, **kwargs):
+        """提交警告通知"""
+        self.notify("warning", content, **kwargs)
+
+    def error(self, content, **kwargs):
+        """提交错误通知"""
+        self.notify("error", content, **kwargs)
+
+    def flush(self):
+        """立即显示所有待合并的通知"""
+        self._flush_timer.stop()
+        pending, self._pending = self._pending, {}
+        for key, notification in pending.items():
+            self._show(key, notification)
+
+    def _show(self, key, notification):
+        """显示一条合并后的通知，替换同key的旧提示并限制提示数量"""
+        self._live = [(k, bar) for k, bar in self._live if not sip.isdeleted(bar)]
+        for live_key, bar in list(self._live):
+            if live_key == key:
+                self._close(live_key, bar)
+        while len(self._live) >= self.max_live:
+            self._close(*self._live[0])
+
+        bar = getattr(InfoBar, notification.level)(
+            title=notification.title,
+            content=notification.content(),
+            orient=Qt.Horizontal,
+            isClosable=True,
+            position=InfoBarPosition.TOP_RIGHT,
+            duration=self.duration,
+            parent=self.parent_widget
+        )
+        self._live.append((key, bar))
+        bar.destroyed.connect(lambda _=None, bar=bar: self._forget(bar))
+
+    def _close(self, key, bar):
+        """关闭一条提示"""
+        self._forget(bar)
+        bar.close()
+
+    def _forget(self, bar):
+        """从存活列表中移除提示"""
+        self._live = [(k, b) for k, b in self._live if b is not bar]
+
+    @staticmethod
+    def _default_title(level):
+        """按级别获取默认标题"""
+        return {
+            "success": "成功",
+            "info": "信息",
+            "warning": "警告",
+            "error": "错误",
+        }.get(level, "信息")
@@ -0,0 +1,161 @@
+from PyQt5.QtCore import QRectF, Qt
+from PyQt5.QtGui import QColor, QFont, QPainter, QPen
+from PyQt5.QtPrintSupport import QPrinter
+
+from utils import LogManager
+
+file_logger = LogManager.get_logger('file')
+
+
+class PagedPdfWriter:
+    """逐页绘制的PDF写入器
+
+    用QPainter直接在QPrinter上逐页绘制，每页绘制完成后由PDF引擎写出，
+    不需要先构建整份文档，页数再多内存占用也保持平稳。
+
+    用法:
+        with PagedPdfWriter(file_path) as writer:
+            writer.new_page()
+            writer.painter.drawText(...)
+    """
+    # 默认字体，系统缺少时由Qt自动回退
+    FONT_FAMILY = "Microsoft YaHei"
+
+    def __init__(self, file_path, margin_mm=12, resolution=300, landscape=False):
+        """初始化PDF写入器
+
+        Args:
+            file_path: 输出文件路径
+            margin_mm: 页边距（毫米）
+            resolution: 绘制分辨率（DPI），坐标单位为设备像素
+            landscape: 是否横向
+        """
+        self.file_path = file_path
+        self.printer = QPrinter(QPrinter.HighResolution)
+        self.printer.setOutputFormat(QPrinter.PdfFormat)
+        self.printer.setOutputFileName(file_path)
+        self.printer.setPageSize(QPrinter.A4)
+        self.printer.setOrientation(QPrinter.Landscape if landscape else QPrinter.Portrait)
+        self.printer.setPageMargins(margin_mm, margin_mm, margin_mm, margin_mm, QPrinter.Millimeter)
+        self.printer.setResolution(resolution)
+        self.painter = None
+        self.page_count = 0
+        self.width = 0
+        self.height = 0
+
+    def __enter__(self):
+        self.painter = QPainter()
+        if not self.painter.begin(self.printer):
+            raise IOError(f"无法写入PDF文件: {self.file_path}")
+        page_rect = self.printer.pageRect()
+        self.width = page_rect.width()
+        self.height = page_rect.height()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.painter.end()
+        self.painter = None
+        if exc_type is None:
+            LogManager.info(file_logger, f"已生成PDF {self.file_path}，共 {self.page_count} 页")
+        return False
+
+    def new_page(self):
+        """开始新的一页（第一页由QPainter.begin创建）"""
+        if self.page_count > 0:
+            self.printer.newPage()
+        self.page_count += 1
+
+    def mm(self, value):
+        """毫米转换为设备像素"""
+        return value * self.printer.resolution() / 25.4
+
+    def font(self, point_size, bold=False):
+        """创建指定字号的字体
+
+        Args:
+            point_size: 字号（磅）
+            bold: 是否加粗
+
+        Returns:
+            QFont: 字体
+        """
+        font = QFont(self.FONT_FAMILY)
+        font.setPointSizeF(point_size)
+        font.setBold(bold)
+        return font
+
+    def draw_text(self, rect, text, point_size=10, bold=False, flags=Qt.AlignCenter):
+        """在矩形区域内绘制文本
+
+        Args:
+            rect: QRectF绘制区域
+            text: 文本
+            point_size: 字号（磅）
+            bold: 是否加粗
+            flags: 对齐方式
+        """
+        self.painter.setFont(self.font(point_size, bold))
+        self.painter.drawText(rect, flags | Qt.TextWordWrap, text)
+
+    def table(self, title, headers, ratios, rows, row_height_mm=8, footer=None):
+        """分页绘制表格，行数据逐行读取，一页写满即换页
+
+        Args:
+            title: 每页顶部的标题，续页会加"（续）"
+            headers: 表头文本列表
+            ratios: 各列宽度比例
+            rows: 行数据的可迭代对象，每行是与表头等长的文本序列
+            row_height_mm: 行高（毫米）
+            footer: 最后一页表格下方的文本，最后一页放不下时另起一页
+        """
+        title_height = self.mm(14)
+        row_height = self.mm(row_height_mm)
+        total_ratio = float(sum(ratios))
+        col_widths = [self.width * ratio / total_ratio for ratio in ratios]
+        footer_gap = self.mm(2)
+        rows_per_page = max(1, int((self.height - title_height - row_height) // row_height))
+
+        grid_pen = QPen(QColor("#000000"))
+        grid_pen.setWidthF(self.mm(0.2))
+        header_brush = QColor("#eeeeee")
+        cell_font = self.font(10)
+
+        def start_page(continued):
+            self.new_page()
+            self.draw_text(QRectF(0, 0, self.width, title_height),
+                           title + ("（续）" if continued else ""), 16, True)
+            y = title_height
+            x = 0
+            for header, width in zip(headers, col_widths):
+                cell = QRectF(x, y, width, row_height)
+                self.painter.fillRect(cell, header_brush)
+                self.painter.setPen(grid_pen)
+                self.painter.drawRect(cell)
+                self.draw_text(cell, header, 10, True)
+                x += width
+            return y + row_height
+
+        y = start_page(False)
+        row_on_page = 0
+        for row in rows:
+            if row_on_page == rows_per_page:
+                y = start_page(True)
+                row_on_page = 0
+            x = 0
+            self.painter.setFont(cell_font)
+            for text, width in zip(row, col_widths):
+                cell = QRectF(x, y, width, row_height)
+                self.painter.setPen(grid_pen)
+                self.painter.drawRect(cell)
+                self.painter.drawText(cell, Qt.AlignCenter, str(text))
+                x += width
+            y += row_height
+            row_on_page += 1
+
+        if footer:
+            if y + footer_gap + row_height > self.height:
+                self.new_page()
+                self.draw_text(QRectF(0, 0, self.width, title_height), title + "（续）", 16, True)
+                y = title_height
+            self.draw_text(QRectF(0, y + footer_gap, self.width, row_height), footer, 9,
+                           flags=Qt.AlignRight | Qt.AlignVCenter)
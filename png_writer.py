@@ -0,0 +1,95 @@
+import struct
+import zlib
+
+import numpy as np
+
+from utils import LogManager
+
+file_logger = LogManager.get_logger('file')
+
+
+class StreamingPngWriter:
+    """逐行写入的PNG编码器
+
+    图片按从上到下的顺序分批写入，每批像素行压缩后立即写入文件，
+    不需要在内存中保存整张图片，图片再大内存占用也只取决于每批的行数。
+
+    用法:
+        with StreamingPngWriter(file_path, width, height) as writer:
+            writer.write_rows(rgb_rows)  # uint8数组，形状为(行数, width, 3)
+    """
+    SIGNATURE = b"\x89PNG\r\n\x1a\n"
+    # 每个IDAT块的最大字节数
+    CHUNK_SIZE = 1 << 20
+
+    def __init__(self, file_path, width, height, compress_level=6):
+        """初始化PNG写入器
+
+        Args:
+            file_path: 输出文件路径
+            width: 图片宽度（像素）
+            height: 图片高度（像素）
+            compress_level: zlib压缩级别
+        """
+        self.file_path = file_path
+        self.width = width
+        self.height = height
+        self.compress_level = compress_level
+        self.rows_written = 0
+        self._file = None
+        self._compressor = None
+        self._pending = bytearray()
+
+    def __enter__(self):
+        self._file = open(self.file_path, "wb")
+        self._file.write(self.SIGNATURE)
+        # 8位RGB，无隔行扫描
+        self._write_chunk(b"IHDR", struct.pack(">IIBBBBB", self.width, self.height, 8, 2, 0, 0, 0))
+        self._compressor = zlib.compressobj(self.compress_level)
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        try:
+            if exc_type is None:
+                if self.rows_written != self.height:
+                    raise IOError(f"PNG行数不完整: 已写入 {self.rows_written} 行，应为 {self.height} 行")
+                self._pending += self._compressor.flush()
+                self._flush_pending(force=True)
+                self._write_chunk(b"IEND", b"")
+        finally:
+            self._file.close()
+            self._file = None
+        if exc_type is None:
+            LogManager.info(file_logger, f"已生成PNG {self.file_path}，{self.width}×{self.height}")
+        return False
+
+    def _write_chunk(self, chunk_type, data):
+        """写入一个PNG数据块"""
+        self._file.write(struct.pack(">I", len(data)))
+        self._file.write(chunk_type)
+        self._file.write(data)
+        self._file.write(struct.pack(">I", zlib.crc32(data, zlib.crc32(chunk_type)) & 0xFFFFFFFF))
+
+    def _flush_pending(self, force=False):
+        """把压缩后的数据按块写出"""
+        while len(self._pending) >= self.CHUNK_SIZE or (force and self._pending):
+            self._write_chunk(b"IDAT", bytes(self._pending[:self.CHUNK_SIZE]))
+            del self._pending[:self.CHUNK_SIZE]
+
+    def write_rows(self, rows):
+        """写入下一批像素行
+
+        Args:
+            rows: uint8数组，形状为(行数, width, 3)，RGB顺序
+        """
+        count = rows.shape[0]
+        if rows.shape[1:] != (self.width, 3):
+            raise ValueError(f"像素行的形状应为(行数, {self.width}, 3)，实际为{rows.shape}")
+        if self.rows_written + count > self.height:
+            raise ValueError("写入的行数超过图片高度")
+        # 每行前加一个字节的过滤类型（0表示不过滤）
+        scanlines = np.zeros((count, 1 + self.width * 3), dtype=np.uint8)
+        scanlines[:, 1:] = rows.reshape(count, -1)
+        self._pending += self._compressor.compress(scanlines.tobytes())
+        self._flush_pending()
+        self.rows_written += count
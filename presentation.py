@@ -0,0 +1,119 @@
+from PyQt5.QtCore import QRect, Qt
+from PyQt5.QtGui import QColor, QPainter, QPixmap
+from PyQt5.QtWidgets import QApplication, QWidget
+
+from chart_renderer import ChartRenderer, ChartSnapshot
+from utils import LogManager, ui_logger
+
+
+class PresentationView(QWidget):
+    """投影演示窗口
+
+    全屏只读显示座位表，不能拖动或编辑。座位表按屏幕的物理分辨率绘制一次，
+    缓存为QPixmap，之后的重绘（窗口遮挡、切换程序等）只复制缓存。
+    座位安排或布局变化时只标记缓存失效，窗口可见时在下一次重绘中重新绘制，
+    连续多次变化只重新绘制一次；窗口隐藏期间不绘制
+    """
+    # 座位表与屏幕边缘的距离（像素）
+    MARGIN = 24
+
+    def __init__(self, chart_window, parent=None):
+        """初始化演示窗口
+
+        Args:
+            chart_window: SeatingChartWindow，显示其座位安排
+            parent: 父窗口，演示窗口作为独立的顶层窗口显示
+        """
+        super().__init__(parent, Qt.Window)
+        self.chart_window = chart_window
+        self.setWindowTitle("演示模式")
+        # 缓存覆盖整个窗口，不需要先擦除背景
+        self.setAttribute(Qt.WA_OpaquePaintEvent, True)
+        self._pixmap = None
+        self._dirty = True
+        # 实际绘制座位表的次数，用于确认重绘复用了缓存
+        self.render_count = 0
+
+        chart_window.arrangement_changed.connect(self.invalidate)
+        chart_window.layout_changed.connect(self.invalidate)
+
+    def invalidate(self, *args):
+        """座位安排或布局变化，缓存在下一次重绘时重新绘制"""
+        self._dirty = True
+        if self.isVisible():
+            self.update()
+
+    def present(self):
+        """全屏显示演示窗口
+
+        有多个屏幕时显示在主窗口所在屏幕以外的屏幕（通常是投影仪），
+        主窗口仍可继续编辑，修改会同步到投影画面
+        """
+        main_screen = self.chart_window.window().screen()
+        others = [screen for screen in QApplication.screens() if screen is not main_screen]
+        screen = others[0] if others else main_screen
+        self.setGeometry(screen.geometry())
+        self.showFullScreen()
+        self.raise_()
+        self.activateWindow()
+        LogManager.info(ui_logger, f"进入演示模式：{screen.name()} {screen.geometry().width()}×{screen.geometry().height()}")
+
+    def _render(self):
+        """按窗口的物理分辨率把座位表绘制到缓存中，保持比例居中显示"""
+        ratio = self.devicePixelRatioF()
+        width, height = self.width(), self.height()
+        pixmap = QPixmap(max(1, round(width * ratio)), max(1, round(height * ratio)))
+        pixmap.setDevicePixelRatio(ratio)
+        pixmap.fill(QColor(ChartRenderer.BACKGROUND))
+
+        renderer = ChartRenderer(ChartSnapshot.capture(self.chart_window))
+        scale = max(min((width - 2 * self.MARGIN) / renderer.width, (height - 2 * self.MARGIN) / renderer.height), 0.01)
+        painter = QPainter(pixmap)
+        painter.translate((width - renderer.width * scale) / 2, (height - renderer.height * scale) / 2)
+        painter.scale(scale, scale)
+        renderer.paint(painter)
+        painter.end()
+
+        self._pixmap = pixmap
+        self._dirty = False
+        self.render_count += 1
+
+    def resizeEvent(self, event):
+        """窗口尺寸变化后按新尺寸重新绘制缓存"""
+        self._dirty = True
+        super().resizeEvent(event)
+
+    def paintEvent(self, event):
+        """缓存有效时只复制需要重绘的区域"""
+        if self._dirty or self._pixmap is None:
+            self._render()
+        painter = QPainter(self)
+        rect = event.rect()
+        painter.drawPixmap(rect, self._pixmap, self._source_rect(rect))
+        painter.end()
+
+    def _source_rect(self, rect):
+        """窗口坐标中的区域对应缓存中的像素区域"""
+        ratio = self._pixmap.devicePixelRatio()
+        return QRect(
+            round(rect.x() * ratio), round(rect.y() * ratio),
+            round(rect.width() * ratio), round(rect.height() * ratio)
+        )
+
+    def keyPressEvent(self, event):
+        """按Esc退出演示模式"""
+        if event.key() == Qt.Key_Escape:
+            self.close()
+            return
+        super().keyPressEvent(event)
+
+    def mouseDoubleClickEvent(self, event):
+        """双击退出演示模式"""
+        self.close()
+
+    def closeEvent(self, event):
+        """退出时释放缓存，窗口本身保留供下次使用"""
+        self._pixmap = None
+        self._dirty = True
+        LogManager.info(ui_logger, "退出演示模式")
+        super().closeEvent(event)
@@ -0,0 +1,103 @@
+from bisect import bisect_left, insort
+
+try:
+    from pypinyin import lazy_pinyin
+except ImportError:  # pypinyin为可选依赖，未安装时只按姓名检索
+    lazy_pinyin = None
+
+
+class RosterIndex:
+    """学生名单检索索引
+
+    对姓名的每个后缀以及每个音节后缀的全拼和拼音首字母建立有序前缀索引，
+    检索时用二分查找定位前缀区间，复杂度与名单规模基本无关
+    """
+    def __init__(self):
+        self._entries = []       # 有序的(检索键, 学生ID)列表
+        self._keys_by_id = {}    # 学生ID -> 该学生的检索键列表
+
+    def __len__(self):
+        return len(self._keys_by_id)
+
+    @staticmethod
+    def search_keys(student_name):
+        """生成学生姓名的检索键
+
+        Args:
+            student_name: 学生姓名
+
+        Returns:
+            list: 去重后的检索键，包含姓名的所有后缀，以及从每个音节开始的全拼和拼音首字母，
+                使"三"、"san"和"s"都能检索到"张三"
+        """
+        name = student_name.strip().lower()
+        keys = {name[i:] for i in range(len(name))}
+        if lazy_pinyin is not None and name:
+            syllables = [s.lower() for s in lazy_pinyin(name) if s.strip()]
+            for i in range(len(syllables)):
+                keys.add("".join(syllables[i:]))
+                keys.add("".join(s[0] for s in syllables[i:]))
+        keys.discard("")
+        return sorted(keys)
+
+    def rebuild(self, students):
+        """重建索引
+
+        Args:
+            students: 学生ID -> 姓名的字典或(学生ID, 姓名)可迭代对象
+        """
+        items = students.items() if isinstance(students, dict) else students
+        self._keys_by_id = {}
+        entries = []
+        for student_id, student_name in items:
+            keys = self.search_keys(student_name)
+            self._keys_by_id[student_id] = keys
+            entries.extend((key, student_id) for key in keys)
+        entries.sort()
+        self._entries = entries
+
+    def add(self, student_id, student_name):
+        """添加一名学生
+
+        Args:
+            student_id: 学生ID
+            student_name: 学生姓名
+        """
+        if student_id in self._keys_by_id:
+            self.remove(student_id)
+        keys = self.search_keys(student_name)
+        self._keys_by_id[student_id] = keys
+        for key in keys:
+            insort(self._entries, (key, student_id))
+
+    def remove(self, student_id):
+        """移除一名学生
+
+        Args:
+            student_id: 学生ID
+        """
+        for key in self._keys_by_id.pop(student_id, []):
+            index = bisect_left(self._entries, (key, student_id))
+            if index < len(self._entries) and self._entries[index] == (key, student_id):
+                del self._entries[index]
+
+    def search(self, query):
+        """按前缀检索学生
+
+        Args:
+            query: 检索文本，可以是姓名片段、全拼前缀或拼音首字母
+
+        Returns:
+            set: 匹配的学生ID集合
+        """
+        prefix = query.strip().lower()
+        if not prefix:
+            return set(self._keys_by_id)
+
+        matches = set()
+        index = bisect_left(self._entries, (prefix,))
+        entries = self._entries
+        while index < len(entries) and entries[index][0].startswith(prefix):
+            matches.add(entries[index][1])
+            index += 1
+        return matches
@@ -0,0 +1,130 @@
+class SeatAdjacencyIndex:
+    """座位邻接索引
+
+    预先计算每个座位在同一列组内的相邻座位（前后左右和斜对角），
+    以及离讲台最近的第一排座位，检查约束时只需查表
+    """
+    def __init__(self, layout_config):
+        """根据布局配置构建索引
+
+        Args:
+            layout_config: 布局配置
+        """
+        self.neighbors = {}  # 座位键 -> 相邻座位键元组
+        self.front_row = set()  # 第一排座位键（每个列组的最后一排，离讲台最近）
+        for col_key, config in layout_config.items():
+            rows, cols = config["rows"], config["cols"]
+            for row in range(rows):
+                for col in range(cols):
+                    self.neighbors[(col_key, row, col)] = tuple(
+                        (col_key, row + dr, col + dc)
+                        for dr in (-1, 0, 1)
+                        for dc in (-1, 0, 1)
+                        if (dr or dc) and 0 <= row + dr < rows and 0 <= col + dc < cols
+                    )
+                    if row == rows - 1:
+                        self.front_row.add((col_key, row, col))
+
+
+class ConstraintEvaluator:
+    """排座约束增量检查器
+
+    约束来自配置中的"constraints"项：
+        keep_apart: 不能相邻的姓名对，例如[["张三", "李四"]]
+        front_row: 必须坐第一排的学生姓名；带"前排"标签的学生同样需要坐第一排
+
+    维护当前每个座位的违规原因，座位变化时只重新检查变化的座位和它们的相邻座位
+    """
+    FRONT_ROW_TAGS = ("前排",)
+
+    def __init__(self, layout_config, constraints=None):
+        """初始化约束检查器
+
+        Args:
+            layout_config: 布局配置
+            constraints: 约束配置
+        """
+        constraints = constraints or {}
+        self.index = SeatAdjacencyIndex(layout_config)
+        self.keep_apart = {}  # 姓名 -> 不能相邻的姓名集合
+        for pair in constraints.get("keep_apart", []):
+            if len(pair) != 2 or pair[0] == pair[1]:
+                continue
+            self.keep_apart.setdefault(pair[0], set()).add(pair[1])
+            self.keep_apart.setdefault(pair[1], set()).add(pair[0])
+        self.front_row_names = set(constraints.get("front_row", []))
+        self.occupants = {}  # 座位键 -> Student
+        self.violations = {}  # 座位键 -> 违规原因列表，只包含有违规的座位
+
+    def requires_front_row(self, student):
+        """学生是否必须坐第一排"""
+        return student.name in self.front_row_names or any(
+            tag in student.tags for tag in self.FRONT_ROW_TAGS
+        )
+
+    def _reasons(self, seat_key, student, ignore_seat=None):
+        """检查学生坐在指定座位时违反的约束
+
+        Args:
+            seat_key: 座位键
+            student: 学生记录
+            ignore_seat: 检查相邻座位时忽略的座位键（拖动时学生原来的座位）
+
+        Returns:
+            list: 违规原因列表
+        """
+        reasons = []
+        if seat_key not in self.index.front_row and self.requires_front_row(student):
+            reasons.append("需要坐在第一排")
+        apart = self.keep_apart.get(student.name)
+        if apart:
+            for neighbor in self.index.neighbors.get(seat_key, ()):
+                if neighbor == ignore_seat:
+                    continue
+                other = self.occupants.get(neighbor)
+                if other is not None and other.name in apart:
+                    reasons.append(f"不能与{other.name}相邻")
+        return reasons
+
+    def apply(self, changes):
+        """应用座位变化，重新检查受影响的座位
+
+        Args:
+            changes: (座位键, Student或None)列表
+
+        Returns:
+            dict: 违规状态发生变化的座位键 -> 新的违规原因列表（空列表表示不再违规）
+        """
+        affected = set()
+        for seat_key, student in changes:
+            if student is None:
+                self.occupants.pop(seat_key, None)
+            else:
+                self.occupants[seat_key] = student
+            affected.add(seat_key)
+            affected.update(self.index.neighbors.get(seat_key, ()))
+
+        updated = {}
+        for seat_key in affected:
+            student = self.occupants.get(seat_key)
+            reasons = self._reasons(seat_key, student) if student is not None else []
+            if reasons != self.violations.get(seat_key, []):
+                updated[seat_key] = reasons
+                if reasons:
+                    self.violations[seat_key] = reasons
+                else:
+                    self.violations.pop(seat_key, None)
+        return updated
+
+    def check_drop(self, seat_key, student, source_seat=None):
+        """检查把学生放到座位上是否违反约束（不修改状态）
+
+        Args:
+            seat_key: 目标座位键
+            student: 被拖动的学生
+            source_seat: 学生原来的座位键，从名单拖入时为None
+
+        Returns:
+            list: 违规原因列表
+        """
+        return self._reasons(seat_key, student, ignore_seat=source_seat)
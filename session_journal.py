@@ -0,0 +1,270 @@
+import json
+import os
+import queue
+import threading
+import time
+
+from session_manager import SessionManager
+from student import Student
+from utils import LogManager
+
+file_logger = LogManager.get_logger('file')
+
+
+class JournalState:
+    """日志回放用的会话状态
+
+    在后台线程中维护与界面一致的名单和座位分配，用于回放日志和压缩快照
+    """
+    def __init__(self, session):
+        """从会话数据初始化
+
+        Args:
+            session: SessionManager会话数据
+        """
+        self.layout_config = session["layout_config"]
+        self.column_names = session["column_names"]
+        roster, self.seats = SessionManager.unpack(session)
+        self.roster = {student.student_id: student for student in roster}
+
+    def apply(self, entry):
+        """应用一条日志记录
+
+        规则与界面一致：入座的学生离开名单，离开座位且未在别处入座的学生回到名单末尾
+
+        Args:
+            entry: 日志记录字典
+        """
+        for values in entry.get("add", []):
+            student = Student.from_list(values)
+            self.roster[student.student_id] = student
+
+        changes = entry.get("seats", [])
+        if not changes:
+            return
+
+        left = {}
+        placed = []
+        for col_key, row, col, values in changes:
+            seat_key = (col_key, row, col)
+            previous = self.seats.pop(seat_key, None)
+            if previous is not None:
+                left[previous.student_id] = previous
+            if values is not None:
+                student = Student.from_list(values)
+                self.seats[seat_key] = student
+                placed.append(student.student_id)
+
+        seated_ids = {student.student_id for student in self.seats.values()}
+        for student_id in placed:
+            self.roster.pop(student_id, None)
+        for student_id, student in left.items():
+            if student_id not in seated_ids:
+                self.roster[student_id] = student
+
+    def to_session(self):
+        """转换为会话数据
+
+        Returns:
+            dict: SessionManager会话数据
+        """
+        return SessionManager.build_session(
+            self.layout_config,
+            self.column_names,
+            list(self.roster.values()),
+            self.seats
+        )
+
+
+class SessionJournal:
+    """座位操作日志
+
+    界面线程只把操作放入队列，由后台线程追加写入日志文件并落盘，
+    每累计一定数量的操作就把回放后的状态压缩为快照并清空日志。
+    程序异常退出后，启动时加载快照并回放日志即可恢复到最后一次操作。
+    """
+    SNAPSHOT_FILE = "snapshot.seats"
+    JOURNAL_FILE = "journal.log"
+    # 日志记录格式版本，写在日志头中；记录格式变化时递增，旧版本的日志不回放
+    # 2: 学生以Student.to_list()列表记录
+    FORMAT_VERSION = 2
+
+    def __init__(self, directory="recovery", compact_every=200):
+        """初始化操作日志
+
+        Args:
+            directory: 快照和日志文件所在目录
+            compact_every: 累计多少条日志后压缩为快照
+        """
+        self.directory = directory
+        self.compact_every = compact_every
+        self.snapshot_path = os.path.join(directory, self.SNAPSHOT_FILE)
+        self.journal_path = os.path.join(directory, self.JOURNAL_FILE)
+
+        self._queue = queue.Queue()
+        self._thread = None
+        self._journal_file = None
+        self._state = None
+        self._entries_since_snapshot = 0
+
+    def recover(self):
+        """加载快照并回放日志，恢复上次未正常关闭时的会话
+
+        Returns:
+            dict: 恢复出的会话数据，没有可恢复的数据时返回None
+        """
+        if not os.path.exists(self.snapshot_path):
+            return None
+
+        try:
+            session = SessionManager.load(self.snapshot_path)
+            state = JournalState(session)
+        except Exception as e:
+            LogManager.error(file_logger, f"加载恢复快照失败: {str(e)}")
+            return None
+
+        replayed = 0
+        if os.path.exists(self.journal_path):
+            with open(self.journal_path, 'r', encoding='utf-8') as f:
+                if not self._journal_matches_snapshot(f.readline(), session):
+                    # 快照已替换但日志尚未截断时断电，日志中的操作已包含在快照里；
+                    # 旧版本程序写入的日志格式不同，同样不回放
+                    f.seek(0, os.SEEK_END)
+                for line in f:
+                    try:
+                        entry = json.loads(line)
+                    except json.JSONDecodeError:
+                        # 断电时最后一行可能只写了一半，忽略即可
+                        break
+                    roster, seats = dict(state.roster), dict(state.seats)
+                    try:
+                        state.apply(entry)
+                    except (ValueError, KeyError, TypeError, IndexError) as e:
+                        # 格式不符的记录（手工修改或写入不完整）之后的操作无法可靠回放，
+                        # 状态恢复到这条记录之前
+                        state.roster, state.seats = roster, seats
+                        LogManager.warning(file_logger, f"操作日志第 {replayed + 1} 条无法回放，已停止回放: {str(e)}")
+                        break
+                    replayed += 1
+
+        LogManager.info(file_logger, f"已从快照恢复会话并回放 {replayed} 条操作日志")
+        return state.to_session()
+
+    @staticmethod
+    def _journal_matches_snapshot(header_line, session):
+        """检查日志头记录的快照代号是否与快照一致，且日志格式版本与当前版本相同"""
+        try:
+            header = json.loads(header_line)
+        except json.JSONDecodeError:
+            return False
+        if not isinstance(header, dict) or header.get("version") != SessionJournal.FORMAT_VERSION:
+            LogManager.warning(file_logger, "操作日志格式版本不同，跳过回放")
+            return False
+        return header.get("generation") == session.get("journal_generation")
+
+    def start(self, session):
+        """以当前会话为起点开始记录，写入新快照并启动后台线程
+
+        Args:
+            session: 当前会话数据
+        """
+        if self._thread is not None:
+            return
+        os.makedirs(self.directory, exist_ok=True)
+        self._thread = threading.Thread(target=self._run, name="SessionJournal", daemon=True)
+        self._thread.start()
+        self.snapshot(session)
+
+    def record_seats(self, changes):
+        """记录一次座位变更（非阻塞）
+
+        Args:
+            changes: (座位键, Student或None)列表
+        """
+        seats = [[col_key, row, col, student.to_list() if student is not None else None]
+                 for (col_key, row, col), student in changes]
+        self._queue.put(("entry", {"seats": seats}))
+
+    def record_added_students(self, students):
+        """记录加入名单末尾的学生（非阻塞）
+
+        Args:
+            students: Student列表
+        """
+        self._queue.put(("entry", {"add": [student.to_list() for student in students]}))
+
+    def snapshot(self, session):
+        """用完整会话替换快照并清空日志（非阻塞），用于导入名单、更换布局等整体变化
+
+        Args:
+            session: 当前会话数据
+        """
+        self._queue.put(("snapshot", session))
+
+    def close(self, discard=True):
+        """停止记录
+
+        Args:
+            discard: 是否删除快照和日志；正常退出时删除，下次启动不再提示恢复
+        """
+        if self._thread is None:
+            return
+        self._queue.put(("stop", None))
+        self._thread.join()
+        self._thread = None
+
+        if discard:
+            for path in (self.journal_path, self.snapshot_path):
+                try:
+                    os.remove(path)
+                except FileNotFoundError:
+                    pass
+
+    def _run(self):
+        """后台线程：写日志、写快照"""
+        while True:
+            kind, payload = self._queue.get()
+            try:
+                if kind == "stop":
+                    break
+                if kind == "snapshot":
+                    self._state = JournalState(payload)
+                    self._write_snapshot()
+                elif kind == "entry" and self._state is not None:
+                    self._state.apply(payload)
+                    self._append(payload)
+                    if self._entries_since_snapshot >= self.compact_every:
+                        self._write_snapshot()
+            except Exception as e:
+                LogManager.exception(file_logger, f"写入操作日志失败: {str(e)}")
+
+        if self._journal_file is not None:
+            self._journal_file.close()
+            self._journal_file = None
+
+    def _append(self, entry):
+        """追加一条日志并落盘"""
+        if self._journal_file is None:
+            self._journal_file = open(self.journal_path, 'a', encoding='utf-8')
+        self._journal_file.write(json.dumps(entry, ensure_ascii=False, separators=(",", ":")) + "\n")
+        self._journal_file.flush()
+        os.fsync(self._journal_file.fileno())
+        self._entries_since_snapshot += 1
+
+    def _write_snapshot(self):
+        """把当前状态压缩为快照并清空日志
+
+        快照和日志头都记录同一个快照代号，快照替换后、日志截断前断电时，
+        恢复会识别出旧日志并跳过回放
+        """
+        generation = time.time_ns()
+        session = self._state.to_session()
+        session["journal_generation"] = generation
+        SessionManager.save(self.snapshot_path, session)
+        if self._journal_file is not None:
+            self._journal_file.close()
+        self._journal_file = open(self.journal_path, 'w', encoding='utf-8')
+        self._journal_file.write(json.dumps({"generation": generation, "version": self.FORMAT_VERSION}) + "\n")
+        self._journal_file.flush()
+        os.fsync(self._journal_file.fileno())
+        self._entries_since_snapshot = 0
@@ -0,0 +1,185 @@
+import json
+import os
+import struct
+import zlib
+
+from student import Student
+from utils import LogManager
+
+file_logger = LogManager.get_logger('file')
+
+
+class SessionManager:
+    """会话管理器
+
+    负责保存和打开完整的座位安排会话（布局、学生名单和座位分配）。
+
+    文件格式：
+        5字节魔数 b"SEATS" + 2字节大端版本号 + zlib压缩的JSON。
+        学生记录按列保存（student_ids、students、genders、heights、visions、tags、scores各一个数组），
+        每名学生只保存一次，名单和座位都用学生下标引用，
+        每个列组的座位按行优先顺序存成一个下标数组（-1表示空座位）。
+        版本1只包含ID和姓名两列，版本2没有成绩列，打开时缺少的属性取默认值。
+    """
+    MAGIC = b"SEATS"
+    VERSION = 3
+    FILE_FILTER = "座位会话 (*.seats)"
+    FILE_EXT = ".seats"
+
+    @staticmethod
+    def build_session(layout_config, column_names, roster, seats):
+        """构建会话数据
+
+        Args:
+            layout_config: 布局配置
+            column_names: 列名配置
+            roster: 名单中的Student列表，按名单顺序排列
+            seats: 座位键 -> Student的字典，只包含已入座的座位
+
+        Returns:
+            dict: 会话数据
+        """
+        students = []
+        index_by_id = {}
+
+        def student_index(student):
+            index = index_by_id.get(student.student_id)
+            if index is None:
+                index = index_by_id[student.student_id] = len(students)
+                students.append(student)
+            return index
+
+        roster_indices = [student_index(student) for student in roster]
+
+        assignments = {}
+        for col_key, config in layout_config.items():
+            cells = [-1] * (config["rows"] * config["cols"])
+            for row in range(config["rows"]):
+                for col in range(config["cols"]):
+                    student = seats.get((col_key, row, col))
+                    if student is not None:
+                        cells[row * config["cols"] + col] = student_index(student)
+            assignments[col_key] = cells
+
+        return {
+            "version": SessionManager.VERSION,
+            "layout_config": layout_config,
+            "column_names": column_names,
+            "student_ids": [student.student_id for student in students],
+            "students": [student.name for student in students],
+            "genders": [student.gender for student in students],
+            "heights": [student.height for student in students],
+            "visions": [student.vision for student in students],
+            "tags": [list(student.tags) for student in students],
+            "scores": [student.score for student in students],
+            "roster": roster_indices,
+            "assignments": assignments,
+        }
+
+    @staticmethod
+    def unpack(session):
+        """从会话数据还原学生记录、名单和座位分配
+
+        Args:
+            session: 会话数据
+
+        Returns:
+            tuple: (名单Student列表, 座位键 -> Student的字典)
+        """
+        count = len(session["student_ids"])
+        genders = session.get("genders") or [""] * count
+        heights = session.get("heights") or [0.0] * count
+        visions = session.get("visions") or [0.0] * count
+        tags = session.get("tags") or [()] * count
+        scores = session.get("scores") or [0.0] * count
+        students = [
+            Student(*fields)
+            for fields in zip(session["student_ids"], session["students"], genders, heights, visions, tags, scores)
+        ]
+
+        roster = [students[index] for index in session["roster"]]
+        seats = {}
+        for col_key, cells in session["assignments"].items():
+            cols = session["layout_config"][col_key]["cols"]
+            for index, student_index in enumerate(cells):
+                if student_index >= 0:
+                    seats[(col_key, index // cols, index % cols)] = students[student_index]
+        return roster, seats
+
+    @staticmethod
+    def encode(session):
+        """把会话数据编码为文件内容
+
+        Args:
+            session: 会话数据
+
+        Returns:
+            bytes: 文件内容
+        """
+        payload = json.dumps(session, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+        return SessionManager.MAGIC + struct.pack(">H", SessionManager.VERSION) + zlib.compress(payload)
+
+    @staticmethod
+    def decode(data):
+        """解析文件内容
+
+        Args:
+            data: 文件内容
+
+        Returns:
+            dict: 会话数据
+
+        Raises:
+            ValueError: 文件格式无效或版本不受支持
+        """
+        header_size = len(SessionManager.MAGIC) + 2
+        if len(data) < header_size or not data.startswith(SessionManager.MAGIC):
+            raise ValueError("不是有效的座位会话文件")
+
+        version, = struct.unpack(">H", data[len(SessionManager.MAGIC):header_size])
+        if version > SessionManager.VERSION:
+            raise ValueError(f"会话文件版本 {version} 高于当前支持的版本 {SessionManager.VERSION}")
+
+        try:
+            session = json.loads(zlib.decompress(data[header_size:]).decode("utf-8"))
+        except (zlib.error, UnicodeDecodeError, json.JSONDecodeError) as e:
+            raise ValueError(f"会话文件已损坏: {str(e)}")
+
+        for key in ("layout_config", "column_names", "student_ids", "students", "roster", "assignments"):
+            if key not in session:
+                raise ValueError(f"会话文件缺少必要的键: {key}")
+        return session
+
+    @staticmethod
+    def save(file_path, session):
+        """保存会话到文件，先写临时文件再替换，避免写入中断损坏原文件
+
+        Args:
+            file_path: 文件路径
+            session: 会话数据
+        """
+        temp_path = file_path + ".tmp"
+        with open(temp_path, 'wb') as f:
+            f.write(SessionManager.encode(session))
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp_path, file_path)
+        LogManager.info(file_logger, f"会话已保存到 {file_path}")
+
+    @staticmethod
+    def load(file_path):
+        """从文件加载会话
+
+        Args:
+            file_path: 文件路径
+
+        Returns:
+            dict: 会话数据
+
+        Raises:
+            ValueError: 文件格式无效
+        """
+        with open(file_path, 'rb') as f:
+            session = SessionManager.decode(f.read())
+        LogManager.info(file_logger, f"已加载会话 {file_path}")
+        return session
@@ -1,23 +1,32 @@
-from PyQt5.QtWidgets import QVBoxLayout, QHBoxLayout, QWidget
-from PyQt5.QtCore import Qt, pyqtSignal
+from PyQt5.QtWidgets import QLabel, QVBoxLayout, QHBoxLayout, QWidget
+from PyQt5.QtCore import Qt, QTimer, pyqtSignal
 from qfluentwidgets import (
     BodyLabel,
     CardWidget,
+    FluentIcon as FIF,
+    LineEdit,
     SubtitleLabel,
     PushButton,
     PrimaryPushButton,
     InfoBar,
     InfoBarPosition,
-    SpinBox
+    SpinBox,
+    TransparentToolButton
 )
 
+from config_manager import ConfigManager
+from widgets import LayoutPreview
+
 class SettingsPanel(QWidget):
     """设置面板部件
     
-    用于配置座位布局的行数和列数
+    用于增删、重命名列组，配置每个列组的行数、列数、行高和列宽。
+    修改时下方的缩略图实时预览新布局，点击"应用设置"后才更新座位表
     """
-    # 定义配置更新信号，携带布局配置数据
-    settings_updated = pyqtSignal(dict)
+    # 定义配置更新信号，携带布局配置和列名配置
+    settings_updated = pyqtSignal(dict, dict)
+    # 数值停止变化多久后刷新预览（毫秒），快速连续调整时只刷新一次
+    PREVIEW_DELAY_MS = 200
     
     def __init__(self, parent=None, layout_config=None, column_names=None, obj_name=""):
         super().__init__(parent)
@@ -37,18 +46,29 @@ class SettingsPanel(QWidget):
             "column3": "北"
         }
         
-        # 存储输入控件引用
+        # 存储输入控件引用，键为列组键，按列组顺序排列
+        self.group_rows = {}
+        self.name_inputs = {}
         self.column_rows_inputs = {}
         self.column_cols_inputs = {}
+        self.row_height_inputs = {}
+        self.col_width_inputs = {}
+
+        # 预览防抖定时器
+        self.preview_timer = QTimer(self)
+        self.preview_timer.setSingleShot(True)
+        self.preview_timer.setInterval(self.PREVIEW_DELAY_MS)
+        self.preview_timer.timeout.connect(self._update_preview)
         
         # 初始化UI
         self._init_ui()
+        self._update_preview()
     
     def _init_ui(self):
         """初始化设置面板UI - 使用qfluentwidgets组件优化界面美观性"""
         
-        # 使用qfluentwidgets的主题色
-        self.setStyleSheet("background-color: white;")
+        # 背景色由主题样式表设置
+        self.setAttribute(Qt.WA_StyledBackground, True)
         
         # 创建主布局
         main_layout = QVBoxLayout(self)
@@ -66,65 +86,31 @@ class SettingsPanel(QWidget):
         settings_layout.setContentsMargins(10, 10, 10, 10)
         main_layout.addWidget(settings_container)
         
-        # 为每个列添加行数和列数设置
-        for col_key, col_name in self.column_names.items():
-            # 创建一行设置
-            row_widget = CardWidget(settings_container)
-            row_widget.show()
-            row_layout = QHBoxLayout(row_widget)
-            row_layout.setSpacing(15)
-            row_layout.setContentsMargins(10, 10, 10, 10)
-            
-            # 列名
-            col_label = SubtitleLabel(f"{col_name}列:", row_widget)
-            col_label.setFixedWidth(80)
-            col_label.show()
-            row_layout.addWidget(col_label)
-            
-            # 行数设置
-            rows_group = QWidget(row_widget)
-            rows_group.show()
-            rows_layout = QVBoxLayout(rows_group)
-            rows_layout.setContentsMargins(0, 0, 0, 0)
-            
-            rows_label = BodyLabel("行数", rows_group)
-            rows_label.show()
-            rows_layout.addWidget(rows_label)
-            
-            rows_spinbox = SpinBox(rows_group)
-            rows_spinbox.setRange(1, 20)
-            rows_spinbox.setValue(self.layout_config[col_key]["rows"])
-            rows_spinbox.setFixedWidth(120)
-            rows_spinbox.setFixedHeight(30)
-            rows_spinbox.show()
-            rows_layout.addWidget(rows_spinbox)
-            
-            self.column_rows_inputs[col_key] = rows_spinbox
-            row_layout.addWidget(rows_group)
-            
-            # 列数设置
-            cols_group = QWidget(row_widget)
-            cols_group.show()
-            cols_layout = QVBoxLayout(cols_group)
-            cols_layout.setContentsMargins(0, 0, 0, 0)
-            
-            cols_label = BodyLabel("列数", cols_group)
-            cols_label.show()
-            cols_layout.addWidget(cols_label)
-            
-            cols_spinbox = SpinBox(cols_group)
-            cols_spinbox.setRange(1, 10)
-            cols_spinbox.setValue(self.layout_config[col_key]["cols"])
-            cols_spinbox.setFixedWidth(120)
-            cols_spinbox.setFixedHeight(30)
-            cols_spinbox.show()
-            cols_layout.addWidget(cols_spinbox)
-            
-            self.column_cols_inputs[col_key] = cols_spinbox
-            row_layout.addWidget(cols_group)
-            
-            row_layout.addStretch(1)
-            settings_layout.addWidget(row_widget)
+        # 每个列组一行设置，增删列组时只增删对应的行
+        self.groups_layout = QVBoxLayout()
+        self.groups_layout.setSpacing(10)
+        settings_layout.addLayout(self.groups_layout)
+        for col_key, config in self.layout_config.items():
+            self._add_group_row(col_key, self.column_names.get(col_key) or ConfigManager.default_column_name(col_key), config)
+
+        add_group_button = PushButton(FIF.ADD, "添加列组", settings_container)
+        add_group_button.clicked.connect(self.add_group)
+        settings_layout.addWidget(add_group_button, 0, Qt.AlignLeft)
+        
+        # 布局预览
+        preview_container = CardWidget(self)
+        preview_layout = QVBoxLayout(preview_container)
+        preview_layout.setSpacing(6)
+        preview_layout.setContentsMargins(10, 10, 10, 10)
+        preview_header = QHBoxLayout()
+        preview_header.addWidget(SubtitleLabel("布局预览", preview_container))
+        preview_header.addStretch(1)
+        self.preview_summary = BodyLabel("", preview_container)
+        preview_header.addWidget(self.preview_summary)
+        preview_layout.addLayout(preview_header)
+        self.preview = LayoutPreview(preview_container)
+        preview_layout.addWidget(self.preview, 1)
+        main_layout.addWidget(preview_container, 1)
         
         # 添加按钮
         buttons_widget = QWidget(self)
@@ -151,6 +137,191 @@ class SettingsPanel(QWidget):
         
         # 在FluentWindow结构中，控件会自动显示，不需要强制显示
     
+    @staticmethod
+    def _field_label(text, parent):
+        """列组设置行中输入框的标题
+
+        列组行会随增删列组反复创建和删除，BodyLabel在全局主题信号上登记的回调不会随控件删除，
+        因此这里使用普通QLabel，由应用程序样式表按主题设置颜色
+
+        Returns:
+            QLabel: 标题标签
+        """
+        label = QLabel(text, parent)
+        label.setObjectName("fieldLabel")
+        return label
+
+    def _spin_box(self, parent, layout, label, minimum, maximum, value):
+        """在设置行中添加一个带标题的数值输入框
+
+        Returns:
+            SpinBox: 数值输入框
+        """
+        group = QWidget(parent)
+        group_layout = QVBoxLayout(group)
+        group_layout.setContentsMargins(0, 0, 0, 0)
+        group_layout.addWidget(self._field_label(label, group))
+        spinbox = SpinBox(group)
+        spinbox.setRange(minimum, maximum)
+        spinbox.setValue(value)
+        spinbox.setFixedWidth(110)
+        spinbox.setFixedHeight(30)
+        spinbox.valueChanged.connect(self._schedule_preview)
+        group_layout.addWidget(spinbox)
+        layout.addWidget(group)
+        return spinbox
+
+    def _add_group_row(self, col_key, col_name, config):
+        """添加一个列组的设置行
+
+        Args:
+            col_key: 列组键
+            col_name: 列名
+            config: 列组的布局配置
+        """
+        row_widget = CardWidget(self)
+        row_layout = QHBoxLayout(row_widget)
+        row_layout.setSpacing(12)
+        row_layout.setContentsMargins(10, 10, 10, 10)
+
+        # 列名
+        name_group = QWidget(row_widget)
+        name_layout = QVBoxLayout(name_group)
+        name_layout.setContentsMargins(0, 0, 0, 0)
+        name_layout.addWidget(self._field_label("列名", name_group))
+        name_input = LineEdit(name_group)
+        name_input.setText(col_name)
+        name_input.setFixedWidth(90)
+        name_input.textChanged.connect(self._schedule_preview)
+        name_layout.addWidget(name_input)
+        row_layout.addWidget(name_group)
+
+        self.name_inputs[col_key] = name_input
+        self.column_rows_inputs[col_key] = self._spin_box(row_widget, row_layout, "行数", 1, 20, config["rows"])
+        self.column_cols_inputs[col_key] = self._spin_box(row_widget, row_layout, "列数", 1, 10, config["cols"])
+        self.row_height_inputs[col_key] = self._spin_box(
+            row_widget, row_layout, "行高", 40, 200, config.get("row_height", 60)
+        )
+        self.col_width_inputs[col_key] = self._spin_box(
+            row_widget, row_layout, "列宽", 60, 300, config.get("col_width", 80)
+        )
+        row_layout.addStretch(1)
+
+        remove_button = TransparentToolButton(FIF.DELETE, row_widget)
+        remove_button.setToolTip("删除列组")
+        remove_button.clicked.connect(lambda: self.remove_group(col_key))
+        row_layout.addWidget(remove_button)
+
+        self.groups_layout.addWidget(row_widget)
+        self.group_rows[col_key] = row_widget
+
+    def add_group(self):
+        """添加一个新列组，行列数和尺寸沿用最后一个列组"""
+        # 新列组键的编号大于现有和已应用的所有列组，避免与刚删除的列组混淆
+        numbers = [
+            int(match.group(1))
+            for match in map(ConfigManager.COLUMN_KEY.match, list(self.group_rows) + list(self.layout_config)) if match
+        ]
+        col_key = f"column{max(numbers, default=0) + 1}"
+        template = self._pending_layout_config()
+        config = dict(list(template.values())[-1]) if template else {"rows": 8, "cols": 3, "row_height": 60, "col_width": 80}
+        self._add_group_row(col_key, ConfigManager.default_column_name(col_key), config)
+        self._schedule_preview()
+
+    def remove_group(self, col_key):
+        """删除一个列组的设置行，至少保留一个列组
+
+        Args:
+            col_key: 列组键
+        """
+        if len(self.group_rows) <= 1:
+            InfoBar.warning(
+                title="提示",
+                content="至少需要保留一个列组",
+                orient=Qt.Horizontal,
+                isClosable=True,
+                position=InfoBarPosition.TOP_RIGHT,
+                duration=2000,
+                parent=self
+            )
+            return
+        self._drop_group_row(col_key)
+        self._schedule_preview()
+
+    def _drop_group_row(self, col_key):
+        """移除一个列组的设置行和输入控件引用"""
+        row_widget = self.group_rows.pop(col_key)
+        for inputs in (self.name_inputs, self.column_rows_inputs, self.column_cols_inputs,
+                       self.row_height_inputs, self.col_width_inputs):
+            del inputs[col_key]
+        self.groups_layout.removeWidget(row_widget)
+        row_widget.deleteLater()
+
+    def set_layout_config(self, layout_config, column_names=None):
+        """用外部布局配置（例如打开的会话）更新设置项，只增删变化的列组行
+
+        Args:
+            layout_config: 新的布局配置
+            column_names: 新的列名配置，为None时保留原列名
+        """
+        self.layout_config = layout_config
+        if column_names is not None:
+            self.column_names = column_names
+        for col_key in [col_key for col_key in self.group_rows if col_key not in layout_config]:
+            self._drop_group_row(col_key)
+        for col_key, col_config in layout_config.items():
+            col_name = self.column_names.get(col_key) or ConfigManager.default_column_name(col_key)
+            if col_key not in self.group_rows:
+                self._add_group_row(col_key, col_name, col_config)
+                continue
+            self.name_inputs[col_key].setText(col_name)
+            self.column_rows_inputs[col_key].setValue(col_config["rows"])
+            self.column_cols_inputs[col_key].setValue(col_config["cols"])
+            self.row_height_inputs[col_key].setValue(col_config.get("row_height", 60))
+            self.col_width_inputs[col_key].setValue(col_config.get("col_width", 80))
+        self._update_preview()
+
+    def _schedule_preview(self):
+        """数值变化后重新开始计时，停止调整PREVIEW_DELAY_MS后再刷新预览"""
+        self.preview_timer.start()
+
+    def _pending_layout_config(self):
+        """按输入框中的数值生成布局配置
+
+        Returns:
+            dict: 布局配置，按列组顺序排列
+        """
+        return {
+            col_key: {
+                "rows": self.column_rows_inputs[col_key].value(),
+                "cols": self.column_cols_inputs[col_key].value(),
+                "row_height": self.row_height_inputs[col_key].value(),
+                "col_width": self.col_width_inputs[col_key].value()
+            }
+            for col_key in self.group_rows
+        }
+
+    def _pending_column_names(self):
+        """按输入框生成列名配置，列名为空时使用默认列名"列N"
+
+        Returns:
+            dict: 列组键 -> 列名
+        """
+        return {
+            col_key: self.name_inputs[col_key].text().strip() or ConfigManager.default_column_name(col_key)
+            for col_key in self.group_rows
+        }
+
+    def _update_preview(self):
+        """刷新缩略图和座位数统计"""
+        self.preview_timer.stop()
+        pending = self._pending_layout_config()
+        self.preview.set_layout(pending, self._pending_column_names())
+        total = sum(config["rows"] * config["cols"] for config in pending.values())
+        current = sum(config["rows"] * config["cols"] for config in self.layout_config.values())
+        change = f"，比当前{'多' if total > current else '少'} {abs(total - current)} 个" if total != current else ""
+        self.preview_summary.setText(f"共 {len(pending)} 个列组、{total} 个座位{change}")
+
     def close_parent_dialog(self):
         """关闭父窗口（在FluentWindow结构中不再需要）"""
         # 在FluentWindow结构中，我们不再需要关闭整个对话框
@@ -160,27 +331,18 @@ class SettingsPanel(QWidget):
     def apply_settings(self):
         """应用设置并实时更新界面"""
         try:
-            # 创建新的布局配置
-            custom_layout_config = {}
-            
-            # 从输入框获取每列的行数和列数
-            for col_key in self.column_names.keys():
-                rows = self.column_rows_inputs[col_key].value()
-                cols = self.column_cols_inputs[col_key].value()
-                
-                # 保留原有的行高和列宽设置
-                custom_layout_config[col_key] = {
-                    "rows": rows,
-                    "cols": cols,
-                    "row_height": self.layout_config[col_key]["row_height"],
-                    "col_width": self.layout_config[col_key]["col_width"]
-                }
+            # 从输入框获取每个列组的设置，创建新的布局配置和列名
+            custom_layout_config = self._pending_layout_config()
+            column_names = self._pending_column_names()
             
             # 保存设置到实例变量
             self.custom_layout_config = custom_layout_config
+            self.layout_config = custom_layout_config
+            self.column_names = column_names
+            self._update_preview()
             
             # 首先发送信号通知主界面更新座位布局
-            self.settings_updated.emit(custom_layout_config)
+            self.settings_updated.emit(custom_layout_config, column_names)
             
             # 直接保存配置到文件（不依赖parent的属性）
             import json
@@ -195,7 +357,7 @@ class SettingsPanel(QWidget):
                 # 如果文件不存在，创建默认配置
                 config_data = {
                     "layout_config": custom_layout_config,
-                    "column_names": self.column_names,
+                    "column_names": column_names,
                     "window": {
                         "title": "教室座位安排系统",
                         "max_width": 1200,
@@ -204,14 +366,12 @@ class SettingsPanel(QWidget):
                         "min_height": 700,
                         "size_percentage": 0.85
                     },
-                    "theme": "LIGHT",
-                    "styles": {
-                        "main_window": "background-color: #f5f7fa;"
-                    }
+                    "theme": "LIGHT"
                 }
             
-            # 更新布局配置
+            # 更新布局配置和列名
             config_data["layout_config"] = custom_layout_config
+            config_data["column_names"] = column_names
             
             # 写入文件，确保正确处理中文字符
             with open(config_file, 'w', encoding='utf-8') as f:
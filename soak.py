@@ -0,0 +1,321 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+SeatsChanger长时间运行测试
+
+模拟教师整天开着程序的使用方式：在offscreen平台上反复应用布局设置、导入名单、
+拖拽座位和导出，定期记录常驻内存、存活的控件和QObject数量以及Python对象数量。
+预热之后的增长超过阈值时以状态码1退出，并列出增长最多的Python对象类型
+
+用法:
+    python soak.py                                # 默认1200轮
+    python soak.py --cycles 3000 --max-rss-mb 40  # 指定轮数和内存增长上限
+
+程序在临时目录中运行，不会改动当前目录下的config.json、recovery和cache
+"""
+
+import argparse
+import gc
+import os
+import random
+import sys
+import tempfile
+import time
+from collections import Counter
+from unittest import mock
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+# 轮流应用的布局：增删列组、修改行列数和列名
+LAYOUTS = [
+    (
+        {
+            "column1": {"rows": 8, "cols": 3, "row_height": 60, "col_width": 80},
+            "column2": {"rows": 8, "cols": 3, "row_height": 60, "col_width": 80},
+            "column3": {"rows": 8, "cols": 3, "row_height": 60, "col_width": 80},
+        },
+        {"column1": "南", "column2": "中", "column3": "北"},
+    ),
+    (
+        {
+            "column1": {"rows": 6, "cols": 4, "row_height": 60, "col_width": 80},
+            "column2": {"rows": 8, "cols": 3, "row_height": 60, "col_width": 80},
+            "column4": {"rows": 5, "cols": 2, "row_height": 60, "col_width": 80},
+        },
+        {"column1": "南", "column2": "中间", "column4": "讲台旁"},
+    ),
+    (
+        {
+            "column1": {"rows": 6, "cols": 4, "row_height": 60, "col_width": 80},
+            "column4": {"rows": 7, "cols": 2, "row_height": 60, "col_width": 80},
+        },
+        {"column1": "左", "column4": "右"},
+    ),
+]
+
+
+class SoakTest:
+    """长时间运行测试
+
+    每轮依次执行：应用下一个布局（列组编号不连续时再应用一个内置模板）、导入名单、
+    若干次拖拽，每隔几轮导出一次图片或PDF。每次改变布局后检查列组的显示顺序
+    """
+    # 采样前等待提示条关闭的时间（毫秒），提示条显示2秒
+    NOTIFICATION_WAIT_MS = 3000
+
+    def __init__(self, window, app, directory, seed=0, roster_size=60, drags=10, export_every=5):
+        """初始化测试
+
+        Args:
+            window: MWindow主窗口
+            app: QApplication
+            directory: 临时工作目录，存放名单和导出文件
+            seed: 随机种子
+            roster_size: 每次导入的学生数量
+            drags: 每轮拖拽次数
+            export_every: 每隔多少轮导出一次
+        """
+        self.window = window
+        self.chart = window.seatingChartWindow
+        self.app = app
+        self.directory = directory
+        self.rng = random.Random(seed)
+        self.roster_size = roster_size
+        self.drags = drags
+        self.export_every = export_every
+        self.roster_path = os.path.join(directory, "roster.csv")
+        self.export_count = 0
+
+    def settle(self):
+        """处理挂起的事件并执行deleteLater，保证统计时已删除的控件确实被释放
+
+        processEvents()不会执行deleteLater，最后一步必须是删除：已关闭但未删除的提示条
+        如果随页面切换再次显示，会重新登记到InfoBarManager，删除后留下失效的引用
+        """
+        from PyQt5.QtCore import QCoreApplication, QEvent
+
+        self.app.processEvents()
+        QCoreApplication.sendPostedEvents(None, QEvent.DeferredDelete)
+
+    def relayout(self, cycle):
+        """切换到设置页面应用下一个布局，再回到座位表
+
+        设置面板的提示只在面板可见时开始计时关闭，因此和实际使用一样先切换页面
+        """
+        layout_config, column_names = LAYOUTS[cycle % len(LAYOUTS)]
+        self.window.switchTo(self.window.Setting)
+        self.window.Setting.set_layout_config(layout_config, column_names)
+        self.window.Setting.apply_settings()
+        self.window.switchTo(self.chart)
+
+    def apply_template(self, cycle):
+        """通过模板页面的应用流程应用一个内置布局模板
+
+        在列组编号不连续的布局上应用时，模板新增的列组需要插入到已有列组之间
+        """
+        from layout_templates import LayoutTemplateLibrary
+
+        templates = LayoutTemplateLibrary.BUILTIN_TEMPLATES
+        _, _, layout_config, column_names = templates[cycle % len(templates)]
+        self.window.applyTemplate(layout_config, column_names)
+
+    def check_column_order(self):
+        """确认座位区域中列组的显示顺序与布局配置一致
+
+        Raises:
+            RuntimeError: 显示顺序与布局配置不一致
+        """
+        layout = self.chart.seating_chart_layout
+        col_keys = {widget: col_key for col_key, widget in self.chart.column_widgets.items()}
+        shown = [col_keys.get(layout.itemAt(i).widget()) for i in range(layout.count())]
+        expected = list(self.chart.current_layout_config)
+        if shown != expected:
+            raise RuntimeError(f"列组显示顺序 {shown} 与布局配置 {expected} 不一致")
+
+    def import_roster(self, cycle):
+        """生成一份名单CSV并通过"导入CSV"导入"""
+        with open(self.roster_path, "w", encoding="utf-8") as f:
+            f.write("姓名,性别,成绩\n")
+            for i in range(self.roster_size):
+                f.write(f"学生{cycle % 7}-{i},{'男女'[i % 2]},{60 + i % 40}\n")
+        with mock.patch("utils.QFileDialog.getOpenFileName", return_value=(self.roster_path, "")):
+            self.chart.import_from_csv()
+
+    def _send_drop(self, seat, mime_data):
+        """向座位依次发送拖入和放置事件"""
+        from PyQt5.QtCore import QPoint, Qt
+        from PyQt5.QtGui import QDragEnterEvent, QDropEvent
+
+        pos = QPoint(seat.width() // 2, seat.height() // 2)
+        self.app.sendEvent(seat, QDragEnterEvent(pos, Qt.MoveAction, mime_data, Qt.LeftButton, Qt.NoModifier))
+        self.app.sendEvent(seat, QDropEvent(pos, Qt.MoveAction, mime_data, Qt.LeftButton, Qt.NoModifier))
+
+    def drag(self):
+        """模拟一次拖拽：从名单拖到座位、座位之间拖动或多选座位整体平移"""
+        from widgets import encode_seats_mime, encode_student_mime
+
+        seat_keys = self.chart.all_seat_keys()
+        target = self.chart.seat_at(self.rng.choice(seat_keys))
+        occupied = list(self.chart.occupied_seats())
+        kind = self.rng.random()
+        if kind < 0.4 and self.chart.students:
+            student = self.rng.choice(list(self.chart.students.values()))
+            self._send_drop(target, encode_student_mime(student.student_id, student.name))
+        elif kind < 0.85 and occupied:
+            source = self.chart.seat_at(self.rng.choice(occupied))
+            self._send_drop(target, encode_student_mime(source.student_id, source.student_name, source.seat_key))
+        elif len(occupied) >= 2:
+            selected = self.rng.sample(occupied, 2)
+            for seat_key in selected:
+                self.chart.toggle_seat_selection(self.chart.seat_at(seat_key))
+            self._send_drop(target, encode_seats_mime(selected[0], sorted(selected)))
+            self.chart.clear_selection()
+
+    def export(self):
+        """导出图片或PDF，等待后台任务结束"""
+        manager = self.chart.export_manager
+        self.export_count += 1
+        if self.export_count % 2:
+            file_path = os.path.join(self.directory, "chart.png")
+            start_export = manager.export_as_image
+        else:
+            file_path = os.path.join(self.directory, "chart.pdf")
+            start_export = manager.export_for_printing
+        with mock.patch("export_manager.QFileDialog.getSaveFileName", return_value=(file_path, "")):
+            start_export()
+        deadline = time.monotonic() + 30
+        while manager.active_task is not None and time.monotonic() < deadline:
+            self.app.processEvents()
+            time.sleep(0.005)
+
+    def cycle(self, cycle):
+        """执行一轮操作"""
+        self.relayout(cycle)
+        self.check_column_order()
+        layout_config = LAYOUTS[cycle % len(LAYOUTS)][0]
+        if list(layout_config) != [f"column{i}" for i in range(1, len(layout_config) + 1)]:
+            self.apply_template(cycle)
+            self.check_column_order()
+        self.import_roster(cycle)
+        for _ in range(self.drags):
+            self.drag()
+        if (cycle + 1) % self.export_every == 0:
+            self.export()
+        self.settle()
+
+    def sample(self):
+        """采集一次资源统计
+
+        Returns:
+            dict: rss（字节）、widgets、qobjects和pyobjects
+        """
+        from PyQt5.QtCore import QObject
+        from PyQt5.QtTest import QTest
+        from benchmark import current_rss
+
+        # 等待提示条到时关闭，只统计常驻的对象
+        QTest.qWait(self.NOTIFICATION_WAIT_MS)
+        self.settle()
+        gc.collect()
+        top_levels = self.app.topLevelWidgets()
+        qobjects = len(top_levels) + len(self.app.findChildren(QObject))
+        for widget in top_levels:
+            qobjects += len(widget.findChildren(QObject))
+        return {
+            "rss": current_rss(),
+            "widgets": len(self.app.allWidgets()),
+            "qobjects": qobjects,
+            "pyobjects": len(gc.get_objects()),
+        }
+
+
+def object_types():
+    """按类型统计当前存活的Python对象数量"""
+    gc.collect()
+    return Counter(type(obj).__name__ for obj in gc.get_objects())
+
+
+def main():
+    """主函数"""
+    parser = argparse.ArgumentParser(description="SeatsChanger长时间运行测试")
+    parser.add_argument("--cycles", type=int, default=1200, help="总轮数")
+    parser.add_argument("--warmup", type=int, default=60, help="预热轮数，预热结束时的统计作为基准")
+    parser.add_argument("--sample-every", type=int, default=120, help="每隔多少轮输出一次统计，应为布局和模板轮换周期（6轮）的倍数")
+    parser.add_argument("--drags", type=int, default=10, help="每轮拖拽次数")
+    parser.add_argument("--export-every", type=int, default=5, help="每隔多少轮导出一次")
+    parser.add_argument("--max-rss-mb", type=float, default=30.0, help="预热后允许的常驻内存增长（MB）")
+    parser.add_argument("--max-qobjects", type=int, default=50, help="预热后允许的QObject数量增长")
+    parser.add_argument("--seed", type=int, default=0, help="随机种子")
+    args = parser.parse_args()
+
+    # 在临时目录中运行，配置、操作日志、导出缓存和日志文件都写到这里
+    sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+    directory = tempfile.mkdtemp(prefix="seats_soak_")
+    os.chdir(directory)
+
+    import logging
+    from PyQt5.QtWidgets import QApplication
+    from PyQt5.QtTest import QTest
+
+    app = QApplication(sys.argv[:1])
+    from benchmark import report
+    from main_window import MWindow
+
+    logging.getLogger().setLevel(logging.WARNING)
+    window = MWindow()
+    window.show()
+    QTest.qWait(300)
+
+    soak = SoakTest(window, app, directory, seed=args.seed, drags=args.drags, export_every=args.export_every)
+    print(f"长时间运行测试（{args.cycles} 轮，工作目录 {directory}）")
+    print(f"  {'轮次':<8}{'常驻内存':>12}{'控件':>8}{'QObject':>10}{'Python对象':>12}{'耗时':>10}")
+
+    def show(cycle, stats, elapsed):
+        print(f"  {cycle:<8}{stats['rss'] / 1024 / 1024:>10.1f}MB{stats['widgets']:>8}"
+              f"{stats['qobjects']:>10}{stats['pyobjects']:>12}{elapsed:>9.1f}s")
+
+    start = time.perf_counter()
+    baseline = baseline_types = None
+    for cycle in range(args.cycles):
+        soak.cycle(cycle)
+        done = cycle + 1
+        if done == args.warmup:
+            baseline = soak.sample()
+            baseline_types = object_types()
+            show(done, baseline, time.perf_counter() - start)
+        elif done % args.sample_every == 0 or done == args.cycles:
+            show(done, soak.sample(), time.perf_counter() - start)
+
+    final = soak.sample()
+    window.close()
+    if baseline is None:
+        print("轮数少于预热轮数，无法判断增长")
+        sys.exit(2)
+
+    rss_growth = (final["rss"] - baseline["rss"]) / 1024 / 1024
+    qobject_growth = final["qobjects"] - baseline["qobjects"]
+    print("预热后增长")
+    report("常驻内存", f"{rss_growth:+.1f} MB（上限 {args.max_rss_mb} MB）")
+    report("控件", f"{final['widgets'] - baseline['widgets']:+d}")
+    report("QObject", f"{qobject_growth:+d}（上限 {args.max_qobjects}）")
+    report("Python对象", f"{final['pyobjects'] - baseline['pyobjects']:+d}")
+    growth = object_types()
+    growth.subtract(baseline_types)
+    for type_name, count in growth.most_common(5):
+        if count > 0:
+            report(f"  {type_name}", f"{count:+d}")
+
+    failures = []
+    if rss_growth > args.max_rss_mb:
+        failures.append(f"常驻内存增长 {rss_growth:.1f} MB 超过上限 {args.max_rss_mb} MB")
+    if qobject_growth > args.max_qobjects:
+        failures.append(f"QObject增长 {qobject_growth} 个超过上限 {args.max_qobjects} 个")
+    for failure in failures:
+        print(f"失败: {failure}")
+    if not failures:
+        print("通过")
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
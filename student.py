@@ -0,0 +1,110 @@
+class Student:
+    """学生记录
+
+    使用__slots__保存学生的ID、姓名、性别、身高、视力、标签和成绩，
+    不创建实例字典，10万名学生的名单也只占用少量内存
+    """
+    __slots__ = ("student_id", "name", "gender", "height", "vision", "tags", "score")
+
+    # CSV表头别名 -> 字段名
+    CSV_HEADERS = {
+        "姓名": "name", "name": "name",
+        "性别": "gender", "gender": "gender",
+        "身高": "height", "height": "height",
+        "视力": "vision", "vision": "vision",
+        "标签": "tags", "tags": "tags",
+        "成绩": "score", "score": "score",
+    }
+
+    def __init__(self, student_id, name, gender="", height=0.0, vision=0.0, tags=(), score=0.0):
+        """初始化学生记录
+
+        Args:
+            student_id: 学生ID，在一次会话中唯一
+            name: 姓名，允许重名
+            gender: 性别
+            height: 身高（厘米），未知时为0
+            vision: 视力，未知时为0
+            tags: 标签元组
+            score: 成绩（能力分），未知时为0
+        """
+        self.student_id = student_id
+        self.name = name
+        self.gender = gender
+        self.height = height
+        self.vision = vision
+        self.tags = tuple(tags)
+        self.score = score
+
+    def __repr__(self):
+        return f"Student({self.student_id}, {self.name!r})"
+
+    def describe(self):
+        """生成学生信息的简短描述，用于工具提示
+
+        Returns:
+            str: 描述文本
+        """
+        parts = [self.name]
+        if self.gender:
+            parts.append(f"性别: {self.gender}")
+        if self.height:
+            parts.append(f"身高: {self.height:g}")
+        if self.vision:
+            parts.append(f"视力: {self.vision:g}")
+        if self.score:
+            parts.append(f"成绩: {self.score:g}")
+        if self.tags:
+            parts.append(f"标签: {'、'.join(self.tags)}")
+        return "\n".join(parts)
+
+    def to_list(self):
+        """转换为紧凑的列表形式，用于日志等序列化场景
+
+        Returns:
+            list: [ID, 姓名, 性别, 身高, 视力, 标签列表, 成绩]
+        """
+        return [self.student_id, self.name, self.gender, self.height, self.vision, list(self.tags), self.score]
+
+    @classmethod
+    def from_list(cls, values):
+        """从to_list生成的列表还原学生记录
+
+        Args:
+            values: [ID, 姓名, 性别, 身高, 视力, 标签列表, 成绩]，缺少的末尾字段取默认值
+
+        Returns:
+            Student: 学生记录
+        """
+        return cls(*values)
+
+    @classmethod
+    def from_csv_row(cls, row, columns=None):
+        """从CSV行创建学生记录（ID为-1，由名单分配）
+
+        Args:
+            row: CSV行的单元格列表
+            columns: 字段名 -> 列下标的映射；为None时第一列为姓名
+
+        Returns:
+            Student: 学生记录，姓名为空时返回None
+        """
+        columns = columns or {"name": 0}
+
+        def cell(field):
+            index = columns.get(field)
+            if index is None or index >= len(row):
+                return ""
+            return row[index].strip()
+
+        def number(field):
+            try:
+                return float(cell(field))
+            except ValueError:
+                return 0.0
+
+        name = cell("name")
+        if not name:
+            return None
+        tags = [tag.strip() for tag in cell("tags").replace("；", ";").split(";") if tag.strip()]
+        return cls(-1, name, cell("gender"), number("height"), number("vision"), tags, number("score"))
@@ -0,0 +1,269 @@
+import math
+import random
+
+import numpy as np
+
+from utils import LogManager
+
+layout_logger = LogManager.get_logger('layout')
+
+
+class TableGrouper:
+    """小组分组引擎
+
+    把名单划分为人数均衡的小组，使各组的平均成绩和性别构成尽量接近全班，
+    并尽量不把需要分开的学生分到同一组；再把各小组映射到座位表中相邻的座位块。
+
+    算法：先按(性别, 成绩)排序后蛇形分配得到初始分组，再反复尝试交换两组中的学生，
+    每次交换对所有候选学生的目标函数变化做向量化计算，直到一轮下来没有可改进的交换。
+    """
+    # 目标函数中各项的权重
+    SCORE_WEIGHT = 1.0
+    GENDER_WEIGHT = 1.0
+    KEEP_APART_WEIGHT = 100.0
+    # 最多交换优化的轮数
+    MAX_PASSES = 20
+
+    @staticmethod
+    def table_blocks(layout_config, group_size):
+        """把座位表划分为小组座位块
+
+        每个列组按列宽切分，块的列数不超过小组人数，行数刚好容纳一个小组；
+        从离讲台最近的一排开始向后划分，列组边缘不完整的块座位会少一些
+
+        Args:
+            layout_config: 布局配置
+            group_size: 小组人数
+
+        Returns:
+            list: 座位块列表，每个座位块是座位键列表
+        """
+        blocks = []
+        for col_key, config in layout_config.items():
+            rows, cols = config["rows"], config["cols"]
+            block_cols = max(1, min(cols, group_size))
+            block_rows = math.ceil(group_size / block_cols)
+            for top in range(rows - 1, -1, -block_rows):
+                for left in range(0, cols, block_cols):
+                    blocks.append([
+                        (col_key, row, col)
+                        for row in range(top, max(top - block_rows, -1), -1)
+                        for col in range(left, min(left + block_cols, cols))
+                    ])
+        return blocks
+
+    @staticmethod
+    def group_sizes(count, capacities):
+        """在座位块容量限制下确定各小组人数，人数尽量平均
+
+        Args:
+            count: 学生人数
+            capacities: 按使用顺序排列的座位块容量
+
+        Returns:
+            list: 各小组人数（长度为使用的座位块数）
+
+        Raises:
+            ValueError: 座位不足
+        """
+        if count > sum(capacities):
+            raise ValueError(f"座位不足：共 {count} 名学生，只有 {sum(capacities)} 个座位")
+        if count == 0:
+            return []
+        # 使用尽量少的座位块，每块按满员人数计算
+        full_size = max(capacities)
+        used = max(1, math.ceil(count / full_size))
+        while sum(capacities[:used]) < count:
+            used += 1
+        capacities = capacities[:used]
+
+        sizes = [0] * used
+        remaining = count
+        # 逐人分配给当前人数最少且未满的小组
+        while remaining:
+            open_groups = [i for i in range(used) if sizes[i] < capacities[i]]
+            level = min(sizes[i] for i in open_groups)
+            for i in open_groups:
+                if sizes[i] == level and remaining:
+                    sizes[i] += 1
+                    remaining -= 1
+        return sizes
+
+    @staticmethod
+    def _features(students):
+        """构建学生特征矩阵：标准化成绩列和各性别的指示列"""
+        scores = np.array([student.score for student in students], dtype=float)
+        spread = scores.std()
+        score_column = (scores - scores.mean()) / spread if spread > 0 else np.zeros(len(students))
+
+        genders = sorted({student.gender for student in students if student.gender})
+        gender_columns = np.array(
+            [[1.0 if student.gender == gender else 0.0 for gender in genders] for student in students]
+        ).reshape(len(students), len(genders))
+
+        return np.hstack([
+            TableGrouper.SCORE_WEIGHT * score_column[:, None],
+            TableGrouper.GENDER_WEIGHT * gender_columns,
+        ])
+
+    @staticmethod
+    def _keep_apart_matrix(students, keep_apart):
+        """构建需要分开的学生对的对称矩阵，没有约束时返回None"""
+        if not keep_apart:
+            return None
+        indices_by_name = {}
+        for index, student in enumerate(students):
+            indices_by_name.setdefault(student.name, []).append(index)
+        apart = np.zeros((len(students), len(students)))
+        for pair in keep_apart:
+            if len(pair) != 2:
+                continue
+            for i in indices_by_name.get(pair[0], []):
+                for j in indices_by_name.get(pair[1], []):
+                    if i != j:
+                        apart[i, j] = apart[j, i] = 1.0
+        return apart if apart.any() else None
+
+    @staticmethod
+    def _initial_groups(students, sizes):
+        """按(性别, 成绩)排序后蛇形分配，得到性别和成绩都较均衡的初始分组"""
+        order = sorted(range(len(students)), key=lambda i: (students[i].gender, -students[i].score))
+        groups = np.empty(len(students), dtype=int)
+        counts = [0] * len(sizes)
+        snake = list(range(len(sizes))) + list(range(len(sizes) - 1, -1, -1))
+        position = 0
+        for index in order:
+            while counts[snake[position % len(snake)]] >= sizes[snake[position % len(snake)]]:
+                position += 1
+            group = snake[position % len(snake)]
+            groups[index] = group
+            counts[group] += 1
+            position += 1
+        return groups
+
+    @staticmethod
+    def partition(students, sizes, keep_apart=None, seed=None):
+        """把学生划分为指定人数的均衡小组
+
+        Args:
+            students: Student列表
+            sizes: 各小组人数，总和等于学生人数
+            keep_apart: 需要分开的姓名对列表，例如[["张三", "李四"]]
+            seed: 随机种子，决定交换优化时遍历学生的顺序
+
+        Returns:
+            list: 小组列表，每个小组是Student列表
+        """
+        count = len(students)
+        if count == 0:
+            return []
+        group_count = len(sizes)
+        features = TableGrouper._features(students)
+        apart = TableGrouper._keep_apart_matrix(students, keep_apart)
+        groups = TableGrouper._initial_groups(students, sizes)
+
+        # 各组特征和与目标值（按人数分摊的全班特征和）的偏差
+        sizes_array = np.array(sizes, dtype=float)
+        membership = np.zeros((count, group_count))
+        membership[np.arange(count), groups] = 1.0
+        error = membership.T @ features - sizes_array[:, None] * features.mean(axis=0)
+        # partners[i, g]: 学生i需要分开的同学在第g组中的人数
+        partners = apart @ membership if apart is not None else None
+
+        rng = random.Random(seed)
+        order = list(range(count))
+        all_indices = np.arange(count)
+        for _ in range(TableGrouper.MAX_PASSES):
+            improved = False
+            rng.shuffle(order)
+            for i in order:
+                a = groups[i]
+                # 交换i和j后目标函数的变化：2·d·(e_b - e_a) + 2·|d|²，d = f_i - f_j
+                diff = features[i] - features
+                delta = 2 * np.einsum("jk,jk->j", diff, error[groups] - error[a]) \
+                    + 2 * np.einsum("jk,jk->j", diff, diff)
+                if partners is not None:
+                    conflicts = (partners[i, groups] - apart[i]) - partners[i, a] \
+                        + (partners[:, a] - apart[:, i]) - partners[all_indices, groups]
+                    delta += TableGrouper.KEEP_APART_WEIGHT * conflicts
+                delta[groups == a] = np.inf
+                j = int(np.argmin(delta))
+                if delta[j] >= -1e-9:
+                    continue
+
+                b = groups[j]
+                d = features[i] - features[j]
+                error[a] -= d
+                error[b] += d
+                if partners is not None:
+                    partners[:, a] += apart[:, j] - apart[:, i]
+                    partners[:, b] += apart[:, i] - apart[:, j]
+                groups[i], groups[j] = b, a
+                improved = True
+            if not improved:
+                break
+
+        result = [[] for _ in range(group_count)]
+        for index, group in enumerate(groups):
+            result[group].append(students[index])
+        return result
+
+    @staticmethod
+    def keep_apart_violations(groups, keep_apart):
+        """统计同组的需分开学生对数量
+
+        Args:
+            groups: 小组列表
+            keep_apart: 需要分开的姓名对列表
+
+        Returns:
+            int: 违反约束的学生对数量
+        """
+        pairs = {frozenset(pair) for pair in keep_apart or [] if len(pair) == 2}
+        violations = 0
+        for group in groups:
+            names = [student.name for student in group]
+            for i in range(len(names)):
+                for j in range(i + 1, len(names)):
+                    if frozenset((names[i], names[j])) in pairs:
+                        violations += 1
+        return violations
+
+    @staticmethod
+    def arrange(students, seat_keys, layout_config, group_size=4, keep_apart=None, seed=None):
+        """分组并把各小组安排到座位块
+
+        Args:
+            students: Student列表
+            seat_keys: 可用的座位键列表，座位块中不可用的座位会被跳过
+            layout_config: 布局配置
+            group_size: 小组人数
+            keep_apart: 需要分开的姓名对列表
+            seed: 随机种子
+
+        Returns:
+            tuple: (座位键 -> Student的字典, 小组列表)
+        """
+        available = set(seat_keys)
+        blocks = [
+            [seat_key for seat_key in block if seat_key in available]
+            for block in TableGrouper.table_blocks(layout_config, group_size)
+        ]
+        blocks = [block for block in blocks if block]
+        # 容量取满员人数和座位块大小的较小值，学生多于满员人数时允许小组超员
+        capacities = [min(len(block), group_size) for block in blocks]
+        if len(students) > sum(capacities):
+            capacities = [len(block) for block in blocks]
+        students = students[:sum(capacities)]
+        sizes = TableGrouper.group_sizes(len(students), capacities)
+        groups = TableGrouper.partition(students, sizes, keep_apart, seed)
+
+        assignment = {}
+        for block, group in zip(blocks, groups):
+            assignment.update(zip(block, group))
+        LogManager.info(
+            layout_logger,
+            f"小组分组：{len(students)} 名学生分为 {len(groups)} 组，"
+            f"同组需分开的学生 {TableGrouper.keep_apart_violations(groups, keep_apart)} 对"
+        )
+        return assignment, groups
@@ -0,0 +1,200 @@
+from PyQt5.QtCore import Qt, pyqtSignal
+from PyQt5.QtGui import QPixmap
+from PyQt5.QtWidgets import QHBoxLayout, QInputDialog, QLabel, QScrollArea, QVBoxLayout, QWidget
+from qfluentwidgets import (
+    CardWidget,
+    FlowLayout,
+    FluentIcon as FIF,
+    InfoBar,
+    InfoBarPosition,
+    PrimaryPushButton,
+    PushButton,
+    SubtitleLabel,
+    TransparentToolButton,
+)
+
+from layout_templates import LayoutTemplateLibrary
+from utils import LogManager, UIUtils, ui_logger
+
+
+class TemplatePanel(QWidget):
+    """布局模板页面
+
+    以缩略图卡片列出模板库中的模板，点击"应用"后立即把模板布局应用到当前座位表，
+    也可以把当前布局保存为新模板。模板库在页面第一次显示时才读取
+    """
+    # 选择模板信号，携带模板的布局配置和列名配置
+    template_applied = pyqtSignal(dict, dict)
+    # 缩略图的最大高度（像素），过高的布局按比例缩小
+    THUMBNAIL_MAX_HEIGHT = 160
+
+    def __init__(self, parent=None, config=None, obj_name=""):
+        """初始化模板页面
+
+        Args:
+            parent: 父窗口
+            config: 程序配置，保存模板时从中读取当前布局，模板目录由layout_templates.directory指定
+            obj_name: 对象名
+        """
+        super().__init__(parent)
+        self.setObjectName(obj_name)
+        self.config = config or {}
+        self.library = LayoutTemplateLibrary(self.config.get("layout_templates", {}).get("directory", "templates"))
+        self.loaded = False
+        self._init_ui()
+
+    def _init_ui(self):
+        """初始化页面：标题栏和可滚动的模板卡片区域"""
+        # 背景色由主题样式表设置
+        self.setAttribute(Qt.WA_StyledBackground, True)
+
+        main_layout = QVBoxLayout(self)
+        main_layout.setSpacing(16)
+        main_layout.setContentsMargins(20, 20, 20, 20)
+
+        header = QHBoxLayout()
+        header.addWidget(SubtitleLabel("布局模板", self))
+        header.addStretch(1)
+        save_button = PushButton(FIF.SAVE, "保存当前布局为模板", self)
+        save_button.clicked.connect(self.save_current_layout)
+        header.addWidget(save_button)
+        main_layout.addLayout(header)
+
+        scroll_area = QScrollArea(self)
+        scroll_area.setObjectName("templateScrollArea")
+        scroll_area.setWidgetResizable(True)
+        scroll_area.setFrameShape(QScrollArea.NoFrame)
+        container = QWidget()
+        container.setObjectName("templateContainer")
+        self.cards_layout = FlowLayout(container)
+        self.cards_layout.setHorizontalSpacing(12)
+        self.cards_layout.setVerticalSpacing(12)
+        scroll_area.setWidget(container)
+        main_layout.addWidget(scroll_area, 1)
+
+    def showEvent(self, event):
+        """第一次显示时读取模板库并创建卡片"""
+        super().showEvent(event)
+        if not self.loaded:
+            self.loaded = True
+            try:
+                self.library.load()
+            except OSError as e:
+                LogManager.error(ui_logger, f"读取模板库失败: {str(e)}")
+                self._show_message("error", f"读取模板库失败: {str(e)}")
+            self._rebuild_cards()
+
+    def _rebuild_cards(self):
+        """按模板库重新创建全部模板卡片"""
+        self.cards_layout.takeAllWidgets()
+        for template in self.library.templates:
+            self.cards_layout.addWidget(self._template_card(template))
+
+    def _template_card(self, template):
+        """创建一个模板卡片：缩略图、名称、座位数和操作按钮
+
+        模板卡片随保存和删除模板反复重建，文字使用普通QLabel，
+        由应用程序样式表设置颜色（参见SettingsPanel._field_label）
+
+        Args:
+            template: LayoutTemplate
+
+        Returns:
+            CardWidget: 模板卡片
+        """
+        card = CardWidget(self)
+        card.setToolTip(template.description)
+        layout = QVBoxLayout(card)
+        layout.setSpacing(6)
+        layout.setContentsMargins(10, 10, 10, 10)
+
+        thumbnail = QLabel(card)
+        thumbnail.setObjectName("templateThumbnail")
+        thumbnail.setAlignment(Qt.AlignCenter)
+        thumbnail.setFixedSize(LayoutTemplateLibrary.THUMBNAIL_WIDTH, self.THUMBNAIL_MAX_HEIGHT)
+        pixmap = QPixmap(self.library.thumbnail_path(template))
+        if not pixmap.isNull():
+            thumbnail.setPixmap(pixmap.scaled(thumbnail.size(), Qt.KeepAspectRatio, Qt.SmoothTransformation))
+        layout.addWidget(thumbnail)
+
+        name_label = QLabel(template.name, card)
+        name_label.setObjectName("templateName")
+        layout.addWidget(name_label)
+        info_label = QLabel(f"{template.groups} 个列组，{template.seats} 个座位", card)
+        info_label.setObjectName("fieldLabel")
+        layout.addWidget(info_label)
+
+        buttons = QHBoxLayout()
+        apply_button = PrimaryPushButton("应用", card)
+        apply_button.clicked.connect(lambda: self.apply_template(template))
+        buttons.addWidget(apply_button, 1)
+        if not template.builtin:
+            remove_button = TransparentToolButton(FIF.DELETE, card)
+            remove_button.setToolTip("删除模板")
+            remove_button.clicked.connect(lambda: self.remove_template(template))
+            buttons.addWidget(remove_button)
+        layout.addLayout(buttons)
+        return card
+
+    def apply_template(self, template):
+        """读取模板并发出template_applied信号，由主窗口应用到座位表
+
+        Args:
+            template: LayoutTemplate
+        """
+        try:
+            layout_config, column_names = self.library.read(template)
+        except (OSError, ValueError, KeyError) as e:
+            LogManager.error(ui_logger, f"读取模板失败: {str(e)}")
+            self._show_message("error", f"模板 {template.name} 无法读取")
+            return
+        LogManager.info(ui_logger, f"应用布局模板: {template.name}")
+        self.template_applied.emit(layout_config, column_names)
+
+    def save_current_layout(self):
+        """把当前座位表的布局保存为模板，同名模板确认后覆盖"""
+        name, ok = QInputDialog.getText(self, "保存布局模板", "模板名称:")
+        name = name.strip()
+        if not ok or not name:
+            return
+        existing = self.library.find(name)
+        if existing is not None:
+            if existing.builtin:
+                self._show_message("warning", "不能覆盖内置模板，请换一个名称")
+                return
+            if not UIUtils.ask_confirmation(self, "保存布局模板", f"模板 {name} 已存在，是否覆盖？"):
+                return
+
+        layout_config = self.config.get("layout_config", {})
+        column_names = self.config.get("column_names", {})
+        try:
+            self.library.save(name, layout_config, column_names)
+        except OSError as e:
+            LogManager.error(ui_logger, f"保存模板失败: {str(e)}")
+            self._show_message("error", f"保存模板失败: {str(e)}")
+            return
+        self._rebuild_cards()
+        self._show_message("success", f"已保存模板 {name}")
+
+    def remove_template(self, template):
+        """确认后删除模板
+
+        Args:
+            template: LayoutTemplate
+        """
+        if not UIUtils.ask_confirmation(self, "删除布局模板", f"是否删除模板 {template.name}？"):
+            return
+        self.library.remove(template)
+        self._rebuild_cards()
+
+    def _show_message(self, level, content):
+        """在页面右上角显示提示"""
+        getattr(InfoBar, level)(
+            title="提示",
+            content=content,
+            orient=Qt.Horizontal,
+            isClosable=True,
+            position=InfoBarPosition.TOP_RIGHT,
+            duration=2000,
+            parent=self
+        )
@@ -0,0 +1,340 @@
+from string import Template
+
+from PyQt5.QtWidgets import QApplication
+from qfluentwidgets import Theme, setTheme
+
+from utils import LogManager, ui_logger
+
+
+class ThemeManager:
+    """主题管理器
+
+    界面配色集中在调色板中，与样式表模板组合成每个主题的完整样式表，
+    首次使用时编译一次并缓存。切换主题时只在应用程序级别设置一次样式表，
+    由Qt统一重新计算所有控件的样式，不需要逐个控件调用setStyleSheet。
+
+    控件通过对象名或动态属性（例如座位的seatState）匹配样式表中的规则，
+    状态变化时修改属性并调用repolish()，不重新解析样式表
+    """
+    # 支持的主题，键与config.json中的theme一致
+    THEMES = {
+        "LIGHT": Theme.LIGHT,
+        "DARK": Theme.DARK,
+    }
+
+    PALETTES = {
+        "LIGHT": {
+            "window_background": "#f5f7fa",
+            "card_background": "#ffffff",
+            "text": "#000000",
+            "secondary_text": "#424242",
+            "border": "#e0e0e0",
+            "desk_background": "#e0f2f1",
+            "desk_border": "#26a69a",
+            "desk_text": "#00796b",
+            "list_background": "#fafafa",
+            "scroll_handle": "#c0c0c0",
+            "scroll_handle_hover": "#90caf9",
+            "column_title_background": "#e3f2fd",
+            "column_title_border": "#1976d2",
+            "column_title_text": "#1976d2",
+            "grid_background": "#f5f5f5",
+            "chip_background": "#e3f2fd",
+            "chip_border": "#90caf9",
+            "chip_hover_background": "#bbdefb",
+            "chip_hover_border": "#64b5f6",
+            "seat_empty_background": "#f5f5f5",
+            "seat_empty_border": "#e0e0e0",
+            "seat_empty_text": "#757575",
+            "seat_occupied_background": "#e3f2fd",
+            "seat_occupied_border": "#90caf9",
+            "seat_occupied_text": "#1976d2",
+            "seat_selected_border": "#ff9800",
+            "seat_selected_empty_background": "#fff3e0",
+            "seat_ok_background": "#e8f5e9",
+            "seat_ok_border": "#43a047",
+            "seat_bad_background": "#ffebee",
+            "seat_bad_border": "#e53935",
+            "seat_violating_background": "#fff8f8",
+        },
+        "DARK": {
+            "window_background": "#202020",
+            "card_background": "#2b2b2b",
+            "text": "#ffffff",
+            "secondary_text": "#e0e0e0",
+            "border": "#3d3d3d",
+            "desk_background": "#1d3b38",
+            "desk_border": "#26a69a",
+            "desk_text": "#80cbc4",
+            "list_background": "#252525",
+            "scroll_handle": "#5a5a5a",
+            "scroll_handle_hover": "#64b5f6",
+            "column_title_background": "#1e3a5f",
+            "column_title_border": "#64b5f6",
+            "column_title_text": "#90caf9",
+            "grid_background": "#262626",
+            "chip_background": "#1e3a5f",
+            "chip_border": "#3f6fa3",
+            "chip_hover_background": "#26496f",
+            "chip_hover_border": "#64b5f6",
+            "seat_empty_background": "#2d2d2d",
+            "seat_empty_border": "#3d3d3d",
+            "seat_empty_text": "#9e9e9e",
+            "seat_occupied_background": "#1e3a5f",
+            "seat_occupied_border": "#3f6fa3",
+            "seat_occupied_text": "#90caf9",
+            "seat_selected_border": "#ffa726",
+            "seat_selected_empty_background": "#4a3415",
+            "seat_ok_background": "#1b3d20",
+            "seat_ok_border": "#66bb6a",
+            "seat_bad_background": "#4a1c1c",
+            "seat_bad_border": "#ef5350",
+            "seat_violating_background": "#3d1f1f",
+        },
+    }
+
+    STYLESHEET = Template("""
+        SeatingChartWindow {
+            background-color: $window_background;
+        }
+        SettingsPanel {
+            background-color: $card_background;
+        }
+        TemplatePanel {
+            background-color: $card_background;
+        }
+        #templateScrollArea, #templateContainer {
+            background-color: transparent;
+            border: none;
+        }
+        #templateThumbnail {
+            background-color: #ffffff;
+            border: 1px solid $border;
+            border-radius: 6px;
+        }
+        #templateName {
+            font-size: 14px;
+            font-weight: 600;
+            color: $text;
+            background-color: transparent;
+        }
+        #fieldLabel {
+            font-size: 14px;
+            color: $text;
+            background-color: transparent;
+        }
+        #controlCard, #seatingCard, #studentListCard {
+            background-color: $card_background;
+            border-radius: 8px;
+        }
+        #teacherDesk {
+            background-color: $desk_background;
+            border: 2px solid $desk_border;
+            border-radius: 8px;
+        }
+        #deskLabel {
+            font-size: 18px;
+            font-weight: 600;
+            color: $desk_text;
+        }
+        #studentListTitle {
+            font-size: 14px;
+            font-weight: 600;
+            color: $secondary_text;
+        }
+        #studentScrollArea {
+            border: 1px solid $border;
+            border-radius: 6px;
+            background-color: $list_background;
+        }
+        #studentScrollArea QScrollBar:horizontal {
+            height: 8px;
+            background: transparent;
+            margin: 3px 20px 3px 20px;
+        }
+        #studentScrollArea QScrollBar::handle:horizontal {
+            background: $scroll_handle;
+            border-radius: 4px;
+            min-width: 20px;
+        }
+        #studentScrollArea QScrollBar::handle:horizontal:hover {
+            background: $scroll_handle_hover;
+        }
+        #studentScrollArea QScrollBar::add-line:horizontal, #studentScrollArea QScrollBar::sub-line:horizontal {
+            height: 0px;
+            width: 0px;
+        }
+        #studentContainer {
+            background-color: transparent;
+        }
+        QLabel[role="columnTitle"] {
+            font-size: 18px;
+            font-weight: bold;
+            color: $column_title_text;
+            padding: 12px 20px;
+            background-color: $column_title_background;
+            border: 2px solid $column_title_border;
+            border-radius: 8px;
+            min-height: 45px;
+            min-width: 80px;
+        }
+        #seatGrid {
+            background-color: $grid_background;
+            border-radius: 8px;
+        }
+        DraggableLabel {
+            background-color: $chip_background;
+            border: 1px solid $chip_border;
+            border-radius: 8px;
+            padding: 8px 12px;
+            margin: 2px;
+            font-weight: 600;
+            font-size: 14px;
+            color: $text;
+        }
+        DraggableLabel:hover {
+            background-color: $chip_hover_background;
+            border-color: $chip_hover_border;
+        }
+        SeatWidget {
+            background-color: $seat_empty_background;
+            border: 1px solid $seat_empty_border;
+            border-radius: 8px;
+            margin: 2px;
+            padding: 0px;
+        }
+        SeatWidget[seatState="empty"]:hover {
+            background-color: $seat_occupied_background;
+            border: 1px solid $seat_occupied_border;
+        }
+        SeatWidget[seatState="occupied"] {
+            background-color: $seat_occupied_background;
+            border: 1px solid $seat_occupied_border;
+        }
+        SeatWidget[seatState="violating"] {
+            background-color: $seat_violating_background;
+            border: 2px dashed $seat_bad_border;
+        }
+        SeatWidget[seatState="highlighted"] {
+            background-color: $seat_ok_background;
+            border: 2px solid $seat_ok_border;
+        }
+        SeatWidget[seatState="selected"] {
+            background-color: $seat_occupied_background;
+            border: 2px solid $seat_selected_border;
+        }
+        SeatWidget[seatState="selectedEmpty"] {
+            background-color: $seat_selected_empty_background;
+            border: 2px solid $seat_selected_border;
+        }
+        SeatWidget[seatState="dropOk"] {
+            background-color: $seat_ok_background;
+            border: 2px solid $seat_ok_border;
+        }
+        SeatWidget[seatState="dropBad"] {
+            background-color: $seat_bad_background;
+            border: 2px solid $seat_bad_border;
+        }
+        #seatLabel {
+            font-size: 14px;
+            color: $seat_empty_text;
+            background-color: transparent;
+        }
+        #seatLabel[occupied="true"] {
+            font-weight: bold;
+            color: $seat_occupied_text;
+        }
+    """)
+
+    # 已编译的样式表，主题名 -> 样式表文本
+    _compiled = {}
+    # 当前应用的主题名
+    _current = None
+
+    @staticmethod
+    def normalize(theme):
+        """把配置中的主题名规范为THEMES中的键，无法识别时使用浅色主题"""
+        theme = str(theme).upper()
+        return theme if theme in ThemeManager.THEMES else "LIGHT"
+
+    @staticmethod
+    def palette(theme=None):
+        """指定主题的调色板，自绘控件按其中的颜色绘制
+
+        Args:
+            theme: 主题名，默认为当前主题
+
+        Returns:
+            dict: 颜色名 -> 十六进制颜色
+        """
+        return ThemeManager.PALETTES[ThemeManager.normalize(theme or ThemeManager._current or "LIGHT")]
+
+    @staticmethod
+    def compile(theme):
+        """编译指定主题的样式表，结果缓存后重复使用
+
+        Args:
+            theme: 主题名
+
+        Returns:
+            str: 完整的应用程序样式表
+        """
+        theme = ThemeManager.normalize(theme)
+        stylesheet = ThemeManager._compiled.get(theme)
+        if stylesheet is None:
+            stylesheet = ThemeManager.STYLESHEET.substitute(ThemeManager.PALETTES[theme])
+            ThemeManager._compiled[theme] = stylesheet
+        return stylesheet
+
+    @staticmethod
+    def precompile():
+        """预先编译所有主题的样式表，切换主题时不再有编译开销"""
+        for theme in ThemeManager.THEMES:
+            ThemeManager.compile(theme)
+
+    @staticmethod
+    def current():
+        """当前应用的主题名，尚未应用时为None"""
+        return ThemeManager._current
+
+    @staticmethod
+    def apply(theme, app=None):
+        """在应用程序级别应用主题
+
+        同时切换Fluent控件的主题和本程序控件的样式表，整个界面一次重绘完成
+
+        Args:
+            theme: 主题名，"LIGHT"或"DARK"
+            app: QApplication，默认为当前应用程序实例
+
+        Returns:
+            str: 实际应用的主题名
+        """
+        theme = ThemeManager.normalize(theme)
+        app = app or QApplication.instance()
+        if theme == ThemeManager._current and app.styleSheet():
+            return theme
+
+        ThemeManager.precompile()
+        setTheme(ThemeManager.THEMES[theme])
+        app.setStyleSheet(ThemeManager.compile(theme))
+        ThemeManager._current = theme
+        LogManager.info(ui_logger, f"已应用{theme}主题")
+        return theme
+
+    @staticmethod
+    def toggle(app=None):
+        """在浅色和深色主题之间切换
+
+        Returns:
+            str: 切换后的主题名
+        """
+        return ThemeManager.apply("LIGHT" if ThemeManager._current == "DARK" else "DARK", app)
+
+    @staticmethod
+    def repolish(widget):
+        """动态属性变化后重新计算控件样式"""
+        style = widget.style()
+        style.unpolish(widget)
+        style.polish(widget)
+        widget.update()
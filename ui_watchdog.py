@@ -0,0 +1,198 @@
+import os
+import sys
+import threading
+import time
+import traceback
+
+from PyQt5.QtCore import QObject, QTimer
+
+from utils import LogManager
+
+watchdog_logger = LogManager.get_logger('watchdog')
+
+# 项目代码所在目录，用于在调用栈中定位卡顿发生的项目代码位置
+PROJECT_DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+class StallRecord:
+    """单个卡顿位置的统计信息"""
+    __slots__ = ("location", "count", "total_ms", "worst_ms", "worst_stack")
+
+    def __init__(self, location):
+        self.location = location
+        self.count = 0
+        self.total_ms = 0.0
+        self.worst_ms = 0.0
+        self.worst_stack = ""
+
+
+class UIStallWatchdog(QObject):
+    """界面卡顿看门狗
+
+    在主线程中用定时器刷新心跳时间戳，后台线程周期性检查心跳；
+    当心跳超过阈值未刷新时，抓取主线程的Python调用栈，
+    卡顿结束后通过LogManager记录卡顿时长和调用栈，并按位置汇总统计。
+    """
+    def __init__(self, threshold_ms=50, interval_ms=None, parent=None):
+        """初始化看门狗
+
+        Args:
+            threshold_ms: 卡顿判定阈值（毫秒）
+            interval_ms: 心跳间隔（毫秒），默认取阈值的一半
+            parent: 父对象
+        """
+        super().__init__(parent)
+        self.threshold = threshold_ms / 1000.0
+        interval_ms = interval_ms or max(5, threshold_ms // 2)
+        self.interval = interval_ms / 1000.0
+
+        self._main_thread_id = threading.main_thread().ident
+        self._last_beat = time.perf_counter()
+        self._lock = threading.Lock()
+        self._stop_event = threading.Event()
+        self._thread = None
+
+        # 当前卡顿的采样状态
+        self._stall_start = None
+        self._stall_stack = None
+
+        self.records = {}
+        self.stall_count = 0
+
+        self._heartbeat = QTimer(self)
+        self._heartbeat.setInterval(interval_ms)
+        self._heartbeat.timeout.connect(self._beat)
+
+    @property
+    def running(self):
+        """看门狗是否正在运行"""
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self):
+        """启动看门狗（必须在主线程调用）"""
+        if self.running:
+            return
+        self._last_beat = time.perf_counter()
+        self._stop_event.clear()
+        self._heartbeat.start()
+        self._thread = threading.Thread(target=self._run, name="UIStallWatchdog", daemon=True)
+        self._thread.start()
+        LogManager.info(watchdog_logger, f"卡顿看门狗已启动，阈值 {self.threshold * 1000:.0f} ms")
+
+    def stop(self):
+        """停止看门狗"""
+        self._heartbeat.stop()
+        self._stop_event.set()
+        if self._thread is not None:
+            self._thread.join(timeout=1.0)
+            self._thread = None
+
+    def _beat(self):
+        """主线程心跳：刷新时间戳，并结束正在进行的卡顿"""
+        now = time.perf_counter()
+        with self._lock:
+            stall_start = self._stall_start
+            stack = self._stall_stack
+            self._stall_start = None
+            self._stall_stack = None
+            self._last_beat = now
+        if stall_start is not None:
+            self._record_stall((now - stall_start) * 1000.0, stack)
+
+    def _run(self):
+        """后台线程：检查主线程心跳是否超时"""
+        while not self._stop_event.wait(self.interval / 2):
+            with self._lock:
+                if self._stall_start is not None:
+                    continue
+                last_beat = self._last_beat
+                # 心跳间隔本身不计入卡顿时长
+                if time.perf_counter() - last_beat - self.interval < self.threshold:
+                    continue
+                self._stall_start = last_beat + self.interval
+            # 锁外抓取调用栈，避免阻塞主线程心跳
+            stack = self._capture_main_stack()
+            with self._lock:
+                if self._stall_start is not None:
+                    self._stall_stack = stack
+
+    def _capture_main_stack(self):
+        """抓取主线程当前的调用栈
+
+        Returns:
+            list: traceback.FrameSummary列表，主线程不存在时为空列表
+        """
+        frame = sys._current_frames().get(self._main_thread_id)
+        if frame is None:
+            return []
+        return traceback.extract_stack(frame)
+
+    def _record_stall(self, duration_ms, stack):
+        """记录一次卡顿
+
+        Args:
+            duration_ms: 卡顿时长（毫秒）
+            stack: 卡顿期间采样到的主线程调用栈
+        """
+        stack = stack or []
+        location = self._stall_location(stack)
+        stack_text = "".join(traceback.format_list(stack))
+
+        record = self.records.get(location)
+        if record is None:
+            record = self.records[location] = StallRecord(location)
+        record.count += 1
+        record.total_ms += duration_ms
+        if duration_ms > record.worst_ms:
+            record.worst_ms = duration_ms
+            record.worst_stack = stack_text
+        self.stall_count += 1
+
+        LogManager.warning(
+            watchdog_logger,
+            f"界面卡顿 {duration_ms:.0f} ms，位置: {location}\n{stack_text}"
+        )
+
+    @staticmethod
+    def _stall_location(stack):
+        """取调用栈中最内层的项目代码位置作为卡顿位置"""
+        for frame in reversed(stack):
+            filename = os.path.abspath(frame.filename)
+            if filename.startswith(PROJECT_DIR) and "site-packages" not in filename:
+                return f"{frame.filename}:{frame.lineno} {frame.name}"
+        if stack:
+            frame = stack[-1]
+            return f"{frame.filename}:{frame.lineno} {frame.name}"
+        return "未知位置"
+
+    def worst_offenders(self, limit=10):
+        """获取卡顿最严重的位置
+
+        Args:
+            limit: 返回的最大条目数
+
+        Returns:
+            list: 按最长卡顿时长降序排列的StallRecord列表
+        """
+        return sorted(self.records.values(), key=lambda r: r.worst_ms, reverse=True)[:limit]
+
+    def summary_text(self, limit=10):
+        """生成卡顿统计摘要文本
+
+        Args:
+            limit: 列出的最大位置数
+
+        Returns:
+            str: 统计摘要
+        """
+        if not self.stall_count:
+            return f"未检测到超过 {self.threshold * 1000:.0f} ms 的界面卡顿"
+
+        lines = [f"共检测到 {self.stall_count} 次超过 {self.threshold * 1000:.0f} ms 的界面卡顿", ""]
+        for record in self.worst_offenders(limit):
+            lines.append(
+                f"{record.location}\n"
+                f"    次数: {record.count}, 最长: {record.worst_ms:.0f} ms, "
+                f"平均: {record.total_ms / record.count:.0f} ms"
+            )
+        return "\n".join(lines)
@@ -4,6 +4,8 @@ import logging
 from datetime import datetime
 from PyQt5.QtWidgets import QFileDialog, QMessageBox
 
+from student import Student
+
 # 确保日志文件夹存在
 log_dir = 'log'
 os.makedirs(log_dir, exist_ok=True)
@@ -103,11 +105,14 @@ class CSVManager:
     def import_from_csv(parent=None):
         """从CSV文件导入学生名单
         
+        第一行包含"姓名/性别/身高/视力/标签"等表头时按表头读取各列，
+        否则每行第一列为学生姓名。重名学生作为不同的学生导入。
+        
         Args:
             parent: 父窗口，用于显示对话框
         
         Returns:
-            list: 学生名单列表
+            list: Student列表（ID为-1，由名单分配）
         """
         file_path, _ = QFileDialog.getOpenFileName(
             parent, "选择CSV文件", "", "CSV文件 (*.csv);;所有文件 (*)"
@@ -117,16 +122,8 @@ class CSVManager:
             return []
             
         try:
-            with open(file_path, 'r', encoding='utf-8') as file:
-                reader = csv.reader(file)
-                new_students = []
-                for row in reader:
-                    if row:  # 跳过空行
-                        student_name = row[0].strip()
-                        if student_name and student_name not in new_students:
-                            new_students.append(student_name)
-                
-                return new_students
+            with open(file_path, 'r', encoding='utf-8-sig') as file:
+                return CSVManager.read_students(csv.reader(file))
                 
         except Exception as e:
             error_message = f"导入CSV文件时出错: {str(e)}"
@@ -136,6 +133,36 @@ class CSVManager:
                 print(error_message)
             return []
 
+    @staticmethod
+    def read_students(rows):
+        """从CSV行读取学生记录
+        
+        Args:
+            rows: CSV行的可迭代对象
+        
+        Returns:
+            list: Student列表（ID为-1）
+        """
+        rows = iter(rows)
+        columns = None
+        new_students = []
+        for row in rows:
+            if not row:  # 跳过空行
+                continue
+            if columns is None:
+                headers = {
+                    Student.CSV_HEADERS[cell.strip().lower()]: index
+                    for index, cell in enumerate(row)
+                    if cell.strip().lower() in Student.CSV_HEADERS
+                }
+                columns = headers if "name" in headers else {"name": 0}
+                if headers:
+                    continue
+            student = Student.from_csv_row(row, columns)
+            if student is not None:
+                new_students.append(student)
+        return new_students
+
     @staticmethod
     def validate_file_path(file_path, ext=None):
         """验证文件路径是否有效
@@ -1,46 +1,203 @@
-from PyQt5.QtCore import QDataStream, QIODevice, QMimeData, QVariant, Qt
-from PyQt5.QtGui import QDrag, QPainter, QPixmap
+from PyQt5.QtCore import QByteArray, QDataStream, QIODevice, QMimeData, QRectF, QVariant, Qt
+from PyQt5.QtGui import QBrush, QColor, QDrag, QFont, QFontMetrics, QPainter, QPen, QPixmap
 from PyQt5.QtWidgets import (
     QApplication,
     QLabel,
     QVBoxLayout,
+    QWidget,
 )
 from qfluentwidgets import (
+    Action,
     CardWidget,
+    FluentIcon as FIF,
+    RoundMenu,
     ToolTipFilter,
     ToolTipPosition,
 )
 
+from chart_renderer import ChartRenderer, ChartSnapshot
+from student import Student
+from theme_manager import ThemeManager
+
+# 学生拖拽数据的MIME类型，携带学生ID、姓名和来源座位
+STUDENT_MIME_TYPE = "application/x-seatschanger-student"
+
+# 多座位拖拽数据的MIME类型，携带拖拽起点座位和所有选中座位
+SEAT_SELECTION_MIME_TYPE = "application/x-seatschanger-seats"
+
+# 拖拽预览图缓存，键为(控件类型, 文本, 宽, 高, 主题)
+_DRAG_PIXMAP_CACHE_LIMIT = 256
+_drag_pixmap_cache = {}
+
+
+def _write_seat_key(stream, seat_key):
+    """把座位键(col_key, row, col)写入数据流"""
+    col_key, row, col = seat_key
+    stream.writeQString(col_key)
+    stream.writeInt32(row)
+    stream.writeInt32(col)
+
+
+def _read_seat_key(stream):
+    """从数据流读取座位键(col_key, row, col)"""
+    col_key = stream.readQString()
+    row = stream.readInt32()
+    col = stream.readInt32()
+    return col_key, row, col
+
+
+def encode_student_mime(student_id, student_name, source_seat=None):
+    """构建学生拖拽数据
+
+    Args:
+        student_id: 学生ID
+        student_name: 学生姓名，同时写入纯文本以兼容其他拖放目标
+        source_seat: 来源座位键(col_key, row, col)，从名单拖出时为None
+
+    Returns:
+        QMimeData: 拖拽数据
+    """
+    payload = QByteArray()
+    stream = QDataStream(payload, QIODevice.WriteOnly)
+    stream.writeInt32(student_id)
+    stream.writeQString(student_name)
+    _write_seat_key(stream, source_seat or ("", -1, -1))
+
+    mime_data = QMimeData()
+    mime_data.setData(STUDENT_MIME_TYPE, payload)
+    mime_data.setText(student_name)
+    return mime_data
+
+
+def decode_student_mime(mime_data):
+    """解析学生拖拽数据
+
+    Args:
+        mime_data: QMimeData对象
+
+    Returns:
+        tuple: (学生ID, 学生姓名, 来源座位键或None)，不是学生拖拽数据时返回None
+    """
+    if not mime_data.hasFormat(STUDENT_MIME_TYPE):
+        return None
+
+    payload = mime_data.data(STUDENT_MIME_TYPE)
+    stream = QDataStream(payload, QIODevice.ReadOnly)
+    student_id = stream.readInt32()
+    student_name = stream.readQString()
+    source_seat = _read_seat_key(stream)
+    if not source_seat[0]:
+        source_seat = None
+    return student_id, student_name, source_seat
+
+
+def encode_seats_mime(anchor_seat, seat_keys):
+    """构建多座位拖拽数据
+
+    Args:
+        anchor_seat: 拖拽起点座位键，放置时以它为基准计算偏移
+        seat_keys: 所有被移动的座位键
+
+    Returns:
+        QMimeData: 拖拽数据
+    """
+    payload = QByteArray()
+    stream = QDataStream(payload, QIODevice.WriteOnly)
+    _write_seat_key(stream, anchor_seat)
+    stream.writeInt32(len(seat_keys))
+    for seat_key in seat_keys:
+        _write_seat_key(stream, seat_key)
+
+    mime_data = QMimeData()
+    mime_data.setData(SEAT_SELECTION_MIME_TYPE, payload)
+    return mime_data
+
+
+def decode_seats_mime(mime_data):
+    """解析多座位拖拽数据
+
+    Args:
+        mime_data: QMimeData对象
+
+    Returns:
+        tuple: (起点座位键, 座位键列表)，不是多座位拖拽数据时返回None
+    """
+    if not mime_data.hasFormat(SEAT_SELECTION_MIME_TYPE):
+        return None
+
+    payload = mime_data.data(SEAT_SELECTION_MIME_TYPE)
+    stream = QDataStream(payload, QIODevice.ReadOnly)
+    anchor_seat = _read_seat_key(stream)
+    count = stream.readInt32()
+    seat_keys = [_read_seat_key(stream) for _ in range(count)]
+    return anchor_seat, seat_keys
+
+
+def cached_drag_pixmap(widget, text):
+    """获取控件的拖拽预览图，相同外观只渲染一次
+
+    Args:
+        widget: 被拖拽的控件
+        text: 控件上显示的文本，作为缓存键的一部分
+
+    Returns:
+        QPixmap: 半透明的拖拽预览图
+    """
+    widget.ensurePolished()
+    key = (type(widget).__name__, text, widget.width(), widget.height(), ThemeManager.current())
+    pixmap = _drag_pixmap_cache.get(key)
+    if pixmap is None:
+        if len(_drag_pixmap_cache) >= _DRAG_PIXMAP_CACHE_LIMIT:
+            _drag_pixmap_cache.clear()
+        pixmap = QPixmap(widget.size())
+        pixmap.fill(Qt.transparent)
+        painter = QPainter(pixmap)
+        painter.setOpacity(0.7)
+        widget.render(painter)
+        painter.end()
+        _drag_pixmap_cache[key] = pixmap
+    return pixmap
+
+
+def find_owner(widget, attr_name):
+    """向上查找实现了指定方法的祖先控件
+
+    Args:
+        widget: 起始控件
+        attr_name: 方法名
+
+    Returns:
+        QWidget: 第一个具有该属性的祖先控件，未找到时返回None
+    """
+    parent = widget.parentWidget()
+    while parent is not None:
+        if hasattr(parent, attr_name):
+            return parent
+        parent = parent.parentWidget()
+    return None
+
 
 class DraggableLabel(QLabel):
     """可拖拽的学生姓名标签控件
     
     用于在学生列表中显示姓名，并支持拖拽到座位控件中
     """
-    def __init__(self, text, parent=None):
-        super().__init__(text, parent)
+    def __init__(self, student, parent=None):
+        super().__init__(student.name, parent)
+        self.student = student  # 学生记录
         self._init_ui()
 
+    @property
+    def student_id(self):
+        """学生ID"""
+        return self.student.student_id
+
     def _init_ui(self):
         """初始化UI样式和属性"""
         self.setAlignment(Qt.AlignCenter)
-        self.setStyleSheet("""
-            DraggableLabel {
-                background-color: #e3f2fd;
-                border: 1px solid #90caf9;
-                border-radius: 8px;
-                padding: 8px 12px;
-                margin: 2px;
-                font-weight: 600;
-                font-size: 14px;
-            }
-            DraggableLabel:hover {
-                background-color: #bbdefb;
-                border-color: #64b5f6;
-            }
-        """)
         self.setFixedHeight(40)
         self.setMouseTracking(True)  # 启用鼠标跟踪以显示工具提示
+        self.setToolTip(self.student.describe())
         self.installEventFilter(ToolTipFilter(self, 200, ToolTipPosition.TOP))
         
         # 启用拖拽光标
@@ -65,150 +222,285 @@ class DraggableLabel(QLabel):
     def _start_drag(self):
         """启动拖拽操作"""
         drag = QDrag(self)
-        mime_data = QMimeData()
-        mime_data.setText(self.text())
-        drag.setMimeData(mime_data)
-        
-        # 创建拖拽预览图像
-        pixmap = QPixmap(self.size())
-        pixmap.fill(Qt.transparent)
-        painter = QPainter(pixmap)
-        painter.setOpacity(0.7)
-        self.render(painter)
-        painter.end()
-        drag.setPixmap(pixmap)
+        drag.setMimeData(encode_student_mime(self.student_id, self.text()))
+        drag.setPixmap(cached_drag_pixmap(self, self.text()))
         drag.setHotSpot(self.drag_start_position)
         
         drag.exec_(Qt.MoveAction)
 
 
-class SeatWidget(CardWidget):
-    """座位控件
-    
-    用于显示座位状态，支持接收拖拽的学生信息和自身拖拽
+class SeatMixin:
+    """座位控件的共用行为
+
+    包括座位状态、多选、检索高亮、约束提示、右键菜单以及拖拽和放置。
+    具体控件实现_update_style()和_show_student()两个方法负责显示
     """
-    def __init__(self, parent=None):
-        super().__init__(parent)
-        self.is_occupied = False  # 座位是否被占用
-        self.student_name = ""    # 座位上的学生姓名
-        self._init_ui()
+    # 座位控件的固定尺寸
+    SEAT_WIDTH = 90
+    SEAT_HEIGHT = 70
 
-    def _init_ui(self):
-        """初始化UI样式和布局"""
-        self.setFixedSize(90, 70)
-        self._update_style(occupied=False)
-        
-        self.layout = QVBoxLayout(self)
-        self.label = QLabel("空座位", self)
-        self.label.setAlignment(Qt.AlignCenter)
-        self.label.setStyleSheet("color: #757575; font-size: 14px;")
-        self.layout.addWidget(self.label)
-        
+    def _init_seat(self, seat_key):
+        """初始化座位状态和交互属性
+
+        Args:
+            seat_key: 座位键(col_key, row, col)
+        """
+        self.seat_key = seat_key  # 座位键(col_key, row, col)
+        self.is_occupied = False  # 座位是否被占用
+        self.student = None       # 座位上的学生记录
+        self.is_selected = False  # 座位是否被多选选中
+        self.is_highlighted = False  # 座位是否被检索高亮
+        self.is_violating = False  # 座位上的学生是否违反排座约束
+        self.drop_hint = None  # 拖拽经过时的提示："ok"、"bad"或None
+        self.drag_start_position = None  # 拖拽起始位置，没有按下可拖拽的座位时为None
+        self.setFixedSize(self.SEAT_WIDTH, self.SEAT_HEIGHT)
         self.setAcceptDrops(True)
         self.setMouseTracking(True)
+        self.setFocusPolicy(Qt.ClickFocus)  # 获得焦点后Delete/Esc键由座位表窗口处理
         
         # 启用悬停效果
         self.setCursor(Qt.PointingHandCursor)
 
+    @property
+    def student_id(self):
+        """座位上的学生ID，空座位为-1"""
+        return self.student.student_id if self.student is not None else -1
+
+    @property
+    def student_name(self):
+        """座位上的学生姓名，空座位为空字符串"""
+        return self.student.name if self.student is not None else ""
+
+    def _seat_state(self, occupied):
+        """座位当前的显示状态
+
+        优先级：拖拽提示 > 多选 > 检索高亮 > 约束违规 > 占用状态
+
+        Returns:
+            str: dropBad、dropOk、selected、selectedEmpty、highlighted、violating、occupied或empty
+        """
+        if self.drop_hint is not None:
+            return "dropBad" if self.drop_hint == "bad" else "dropOk"
+        if self.is_selected:
+            return "selected" if occupied else "selectedEmpty"
+        if self.is_highlighted:
+            return "highlighted"
+        if self.is_violating:
+            return "violating"
+        return "occupied" if occupied else "empty"
+
     def _update_style(self, occupied):
-        """更新座位样式"""
-        if occupied:
-            self.setStyleSheet("""
-                SeatWidget {
-                    background-color: #e3f2fd;
-                    border: 1px solid #90caf9;
-                    border-radius: 8px;
-                    margin: 2px;
-                    padding: 0px;
-                }
-            """)
-        else:
-            self.setStyleSheet("""
-                SeatWidget {
-                    background-color: #f5f5f5;
-                    border: 1px solid #e0e0e0;
-                    border-radius: 8px;
-                    margin: 2px;
-                    padding: 0px;
-                }
-                SeatWidget:hover {
-                    background-color: #e3f2fd;
-                    border: 1px solid #90caf9;
-                }
-            """)
+        """按座位状态更新外观，由具体控件覆盖
+
+        Args:
+            occupied: 座位上是否有学生
+        """
+
+    def _show_student(self, student):
+        """显示座位上的学生姓名，由具体控件覆盖
+
+        Args:
+            student: Student，None表示空座位
+        """
+
+    def reassign(self, seat_key):
+        """把空座位控件复用为另一个座位，清除多选、检索高亮、约束违规和拖拽提示
+
+        Args:
+            seat_key: 新的座位键(col_key, row, col)
+        """
+        self.seat_key = seat_key
+        self.is_selected = False
+        self.is_highlighted = False
+        self.drop_hint = None
+        self.set_violation([])
+        self._update_style(occupied=self.is_occupied)
+
+    def set_selected(self, selected):
+        """设置座位的多选状态
+
+        Args:
+            selected: 是否选中
+        """
+        if selected == self.is_selected:
+            return
+        self.is_selected = selected
+        self._update_style(occupied=self.is_occupied)
+
+    def set_highlighted(self, highlighted):
+        """设置座位的检索高亮状态
+
+        Args:
+            highlighted: 是否高亮
+        """
+        if highlighted == self.is_highlighted:
+            return
+        self.is_highlighted = highlighted
+        self._update_style(occupied=self.is_occupied)
+
+    def set_violation(self, reasons):
+        """设置座位的约束违规状态
+
+        Args:
+            reasons: 违规原因列表，为空表示没有违规
+        """
+        self.setToolTip("；".join(reasons) if reasons else "")
+        violating = bool(reasons)
+        if violating == self.is_violating:
+            return
+        self.is_violating = violating
+        self._update_style(occupied=self.is_occupied)
+
+    def set_drop_hint(self, hint):
+        """设置拖拽经过时的提示颜色
+
+        Args:
+            hint: "ok"表示可以放置，"bad"表示放置后会违反约束，None表示清除提示
+        """
+        if hint == self.drop_hint:
+            return
+        self.drop_hint = hint
+        self._update_style(occupied=self.is_occupied)
 
     def mousePressEvent(self, event):
-        """鼠标按下事件：记录拖拽起始位置（仅当座位被占用时）"""
-        if event.button() == Qt.LeftButton and self.is_occupied:
-            self.drag_start_position = event.pos()
+        """鼠标按下事件：Ctrl+单击切换多选，否则记录拖拽起始位置（仅当座位被占用时）"""
+        if event.button() != Qt.LeftButton:
+            return
+
+        owner = find_owner(self, 'toggle_seat_selection')
+        if event.modifiers() & Qt.ControlModifier:
+            # Ctrl+单击只切换多选，不开始拖拽
+            self.drag_start_position = None
+            if owner is not None:
+                owner.toggle_seat_selection(self)
+            return
+
+        if owner is not None and not self.is_selected:
+            owner.clear_selection()
+        self.drag_start_position = event.pos() if self.is_occupied else None
+
+    def contextMenuEvent(self, event):
+        """右键菜单：清空座位或所选座位"""
+        owner = find_owner(self, 'clear_seats')
+        if owner is None:
+            return
+
+        seat_keys = sorted(owner.selected_seats) if self.is_selected else [self.seat_key]
+        menu = RoundMenu(parent=self)
+        clear_action = Action(
+            FIF.DELETE,
+            f"清空所选座位 ({len(seat_keys)})" if self.is_selected else "清空座位",
+            triggered=lambda: owner.clear_seats(seat_keys)
+        )
+        menu.addAction(clear_action)
+        if owner.selected_seats:
+            menu.addAction(Action(FIF.CANCEL, "取消选择", triggered=owner.clear_selection))
+        menu.exec(event.globalPos())
 
     def mouseMoveEvent(self, event):
         """鼠标移动事件：处理已占用座位的拖拽逻辑"""
-        if not (event.buttons() & Qt.LeftButton) or not self.is_occupied:
+        if not (event.buttons() & Qt.LeftButton) or not self.is_occupied or self.drag_start_position is None:
             return
-            
+
         if (event.pos() - self.drag_start_position).manhattanLength() < QApplication.startDragDistance():
             return
             
         self._start_drag()
 
     def _start_drag(self):
-        """启动拖拽操作"""
+        """启动拖拽操作
+
+        来源座位随拖拽数据一起传递，由放置目标统一完成座位更新
+        """
         drag = QDrag(self)
-        mime_data = QMimeData()
-        mime_data.setText(self.student_name)
-        drag.setMimeData(mime_data)
-        
-        # 创建拖拽预览图像
-        pixmap = QPixmap(self.size())
-        pixmap.fill(Qt.transparent)
-        painter = QPainter(pixmap)
-        painter.setOpacity(0.7)
-        self.render(painter)
-        painter.end()
-        drag.setPixmap(pixmap)
+        owner = find_owner(self, 'selected_seats')
+        if owner is not None and self.is_selected and len(owner.selected_seats) > 1:
+            # 拖动多选中的座位时整体移动所有选中座位
+            drag.setMimeData(encode_seats_mime(self.seat_key, sorted(owner.selected_seats)))
+        else:
+            drag.setMimeData(encode_student_mime(self.student_id, self.student_name, self.seat_key))
+        drag.setPixmap(cached_drag_pixmap(self, self.student_name))
         drag.setHotSpot(self.drag_start_position)
         
-        # 拖拽完成后清空座位
-        if drag.exec_(Qt.MoveAction) == Qt.MoveAction:
-            self.clear_seat()
+        drag.exec_(Qt.MoveAction)
+
+    def set_student(self, student):
+        """设置座位上的学生
+
+        Args:
+            student: 学生记录
+        """
+        self._show_student(student)
+        self._update_style(occupied=True)
+        self.is_occupied = True
+        self.student = student
 
     def clear_seat(self):
         """清空座位信息"""
-        self.label.setText("空座位")
-        self.label.setStyleSheet("color: #757575;")
+        self._show_student(None)
         self._update_style(occupied=False)
         self.is_occupied = False
-        self.student_name = ""
+        self.student = None
 
     def dragEnterEvent(self, event):
         """拖拽进入事件：检查是否可接受拖拽数据"""
-        if (event.mimeData().hasText() or 
-            event.mimeData().hasFormat("application/x-qabstractitemmodeldatalist")) and not self.is_occupied:
+        mime_data = event.mimeData()
+        if mime_data.hasFormat(STUDENT_MIME_TYPE) or mime_data.hasFormat(SEAT_SELECTION_MIME_TYPE):
+            # 学生拖拽数据可以放到已占用的座位上，与原座位上的学生交换
+            event.acceptProposedAction()
+            self._show_drop_hint(mime_data)
+        elif (mime_data.hasText() or 
+            mime_data.hasFormat("application/x-qabstractitemmodeldatalist")) and not self.is_occupied:
             event.acceptProposedAction()
         else:
             event.ignore()
 
+    def _show_drop_hint(self, mime_data):
+        """根据排座约束显示拖拽提示颜色"""
+        payload = decode_student_mime(mime_data)
+        owner = find_owner(self, 'check_drop')
+        if payload is None or owner is None:
+            return
+        student_id, _, source_seat = payload
+        reasons = owner.check_drop(self.seat_key, student_id, source_seat)
+        if reasons is not None:
+            self.set_drop_hint("bad" if reasons else "ok")
+
+    def dragLeaveEvent(self, event):
+        """拖拽离开事件：清除提示颜色"""
+        self.set_drop_hint(None)
+
     def dropEvent(self, event):
         """放置事件：处理学生信息放置逻辑"""
-        if self.is_occupied:
+        self.set_drop_hint(None)
+        selection = decode_seats_mime(event.mimeData())
+        if selection is not None:
+            owner = find_owner(self, 'move_seats')
+            if owner is not None:
+                anchor_seat, seat_keys = selection
+                owner.move_seats(seat_keys, anchor_seat, self.seat_key)
+            event.acceptProposedAction()
+            return
+
+        payload = decode_student_mime(event.mimeData())
+        if payload is None and self.is_occupied:
             event.ignore()
-            if hasattr(self.window(), 'show_status_message'):
-                self.window().show_status_message("该座位已被占用，无法放置")
+            owner = find_owner(self, 'show_status_message')
+            if owner is not None:
+                owner.show_status_message("该座位已被占用，无法放置")
             return
             
-        student_name = self._get_student_name_from_mime(event.mimeData())
-        
-        # 更新座位显示
-        self.label.setText(student_name)
-        self.label.setStyleSheet("color: #1976d2; font-weight: bold;")
-        self._update_style(occupied=True)
-        self.is_occupied = True
-        self.student_name = student_name
+        if payload is None:
+            # 兼容纯文本和列表控件的拖拽数据，此时没有学生ID
+            payload = (-1, self._get_student_name_from_mime(event.mimeData()), None)
+        student_id, student_name, source_seat = payload
         
-        # 从学生列表移除已放置的学生
-        if hasattr(self.window(), 'remove_student_from_list'):
-            self.window().remove_student_from_list(student_name)
+        # 由座位表窗口一次性完成放置、清空来源座位和移出名单
+        owner = find_owner(self, 'place_student')
+        if owner is not None:
+            owner.place_student(self, student_id, student_name, source_seat)
+        else:
+            self.set_student(Student(student_id, student_name))
             
         event.acceptProposedAction()
 
@@ -236,4 +528,218 @@ class SeatWidget(CardWidget):
         return "未知学生"
 
 
-# SettingsPanel类已移至settings.py文件中，避免重复定义
\ No newline at end of file
+class SeatWidget(SeatMixin, CardWidget):
+    """座位控件
+    
+    用于显示座位状态，支持接收拖拽的学生信息和自身拖拽。
+    由卡片、布局和姓名标签组成，外观由应用程序样式表按seatState属性匹配
+    """
+    def __init__(self, parent=None, seat_key=None):
+        super().__init__(parent)
+        self._init_seat(seat_key)
+        self._init_ui()
+
+    def _init_ui(self):
+        """初始化样式、姓名标签和布局"""
+        self._update_style(occupied=False)
+        self.layout = QVBoxLayout(self)
+        self.label = QLabel("空座位", self)
+        self.label.setObjectName("seatLabel")
+        self.label.setAlignment(Qt.AlignCenter)
+        self.layout.addWidget(self.label)
+
+    def _update_style(self, occupied):
+        """更新座位样式
+
+        只在状态变化时修改seatState属性并重新计算样式，不重新解析样式表
+        """
+        state = self._seat_state(occupied)
+        if self.property("seatState") == state:
+            return
+        self.setProperty("seatState", state)
+        ThemeManager.repolish(self)
+
+    def _show_student(self, student):
+        """更新姓名标签的文字和占用属性"""
+        self.label.setText(student.name if student is not None else "空座位")
+        occupied = student is not None
+        if self.label.property("occupied") != occupied:
+            self.label.setProperty("occupied", occupied)
+            ThemeManager.repolish(self.label)
+
+
+class PaintedSeatWidget(SeatMixin, QWidget):
+    """自绘座位控件
+
+    交互与SeatWidget相同，但背景、边框和姓名都在paintEvent中直接绘制：
+    没有子控件、布局和控件级样式表，也不参与样式表匹配。
+    字体、字体度量和各状态的画刷画笔按主题缓存在类中，所有座位共用
+    """
+    RADIUS = 8
+    MARGIN = 2
+    TEXT_PADDING = 6
+    FONT_PIXEL_SIZE = 14
+    # 显示状态 -> (背景色, 边框色, 边框宽度, 线型)，颜色为ThemeManager调色板中的键
+    STATE_STYLES = {
+        "empty": ("seat_empty_background", "seat_empty_border", 1, Qt.SolidLine),
+        "hover": ("seat_occupied_background", "seat_occupied_border", 1, Qt.SolidLine),
+        "occupied": ("seat_occupied_background", "seat_occupied_border", 1, Qt.SolidLine),
+        "violating": ("seat_violating_background", "seat_bad_border", 2, Qt.DashLine),
+        "highlighted": ("seat_ok_background", "seat_ok_border", 2, Qt.SolidLine),
+        "selected": ("seat_occupied_background", "seat_selected_border", 2, Qt.SolidLine),
+        "selectedEmpty": ("seat_selected_empty_background", "seat_selected_border", 2, Qt.SolidLine),
+        "dropOk": ("seat_ok_background", "seat_ok_border", 2, Qt.SolidLine),
+        "dropBad": ("seat_bad_background", "seat_bad_border", 2, Qt.SolidLine),
+    }
+
+    # 共用的字体和度量：(空座位字体, 已入座字体, 空座位度量, 已入座度量)
+    _fonts = None
+    # 主题名 -> {显示状态: (画刷, 画笔)}，另有"text"键对应(空座位文字色, 已入座文字色)
+    _theme_styles = {}
+
+    def __init__(self, parent=None, seat_key=None):
+        super().__init__(parent)
+        self._state = "empty"
+        self._hovered = False
+        self._text = ""
+        self._init_seat(seat_key)
+        self._show_student(None)
+
+    @classmethod
+    def _shared_fonts(cls):
+        """所有座位共用的字体和字体度量，首次使用时创建"""
+        if cls._fonts is None:
+            empty_font = QFont(QApplication.font())
+            empty_font.setPixelSize(cls.FONT_PIXEL_SIZE)
+            occupied_font = QFont(empty_font)
+            occupied_font.setBold(True)
+            cls._fonts = (empty_font, occupied_font, QFontMetrics(empty_font), QFontMetrics(occupied_font))
+        return cls._fonts
+
+    @classmethod
+    def _styles_for(cls, theme):
+        """指定主题下各显示状态的画刷和画笔，首次使用时创建"""
+        styles = cls._theme_styles.get(theme)
+        if styles is None:
+            palette = ThemeManager.palette(theme)
+            styles = {}
+            for state, (background, border, width, line_style) in cls.STATE_STYLES.items():
+                styles[state] = (QBrush(QColor(palette[background])), QPen(QColor(palette[border]), width, line_style))
+            styles["text"] = (QColor(palette["seat_empty_text"]), QColor(palette["seat_occupied_text"]))
+            cls._theme_styles[theme] = styles
+        return styles
+
+    def _update_style(self, occupied):
+        """记录显示状态，只在变化时重绘"""
+        state = self._seat_state(occupied)
+        if state != self._state:
+            self._state = state
+            self.update()
+
+    def _show_student(self, student):
+        """按座位宽度省略过长的姓名后重绘"""
+        _, _, empty_metrics, occupied_metrics = self._shared_fonts()
+        if student is None:
+            text, metrics = "空座位", empty_metrics
+        else:
+            text, metrics = student.name, occupied_metrics
+        self._text = metrics.elidedText(text, Qt.ElideRight, self.width() - 2 * self.TEXT_PADDING)
+        self.update()
+
+    def enterEvent(self, event):
+        """鼠标进入：空座位显示悬停效果"""
+        self._hovered = True
+        if self._state == "empty":
+            self.update()
+
+    def leaveEvent(self, event):
+        """鼠标离开：取消悬停效果"""
+        self._hovered = False
+        if self._state == "empty":
+            self.update()
+
+    def paintEvent(self, event):
+        """绘制圆角背景、边框和姓名"""
+        styles = self._styles_for(ThemeManager.current() or "LIGHT")
+        state = "hover" if self._state == "empty" and self._hovered else self._state
+        brush, pen = styles[state]
+        empty_font, occupied_font, _, _ = self._shared_fonts()
+
+        painter = QPainter(self)
+        painter.setRenderHint(QPainter.Antialiasing)
+        painter.setBrush(brush)
+        painter.setPen(pen)
+        inset = self.MARGIN + pen.widthF() / 2
+        painter.drawRoundedRect(QRectF(self.rect()).adjusted(inset, inset, -inset, -inset), self.RADIUS, self.RADIUS)
+
+        painter.setFont(occupied_font if self.is_occupied else empty_font)
+        painter.setPen(styles["text"][1 if self.is_occupied else 0])
+        painter.drawText(self.rect(), Qt.AlignCenter, self._text)
+
+
+# 可选的座位控件，键为config.json中seat_widget的取值
+SEAT_WIDGETS = {
+    "painted": PaintedSeatWidget,
+    "card": SeatWidget,
+}
+
+
+# SettingsPanel类已移至settings.py文件中，避免重复定义
+
+
+class LayoutPreview(QWidget):
+    """布局缩略预览
+
+    按布局配置绘制缩小的列组、座位和讲台，与导出图片使用相同的几何尺寸。
+    整个预览由一个控件在paintEvent中绘制，没有子控件，布局变化时只需重绘
+    """
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.renderer = None
+        self.setMinimumHeight(180)
+
+    def set_layout(self, layout_config, column_names):
+        """更新预览的布局
+
+        Args:
+            layout_config: 布局配置
+            column_names: 列组键 -> 列名
+        """
+        self.renderer = ChartRenderer(ChartSnapshot(layout_config, column_names, {}))
+        self.update()
+
+    def paintEvent(self, event):
+        """缩放到控件大小后绘制列组和座位轮廓"""
+        renderer = self.renderer
+        if renderer is None:
+            return
+        painter = QPainter(self)
+        painter.setRenderHint(QPainter.Antialiasing)
+        scale = min(self.width() / renderer.width, self.height() / renderer.height)
+        painter.translate((self.width() - renderer.width * scale) / 2, (self.height() - renderer.height * scale) / 2)
+        painter.scale(scale, scale)
+
+        painter.setFont(renderer.title_font)
+        for col_key, grid, title, seat_width, seat_height in renderer.groups:
+            config = renderer.snapshot.layout_config[col_key]
+            painter.setPen(Qt.NoPen)
+            painter.setBrush(QColor(renderer.TITLE_COLORS[0]))
+            painter.drawRoundedRect(title, 8, 8)
+            painter.setPen(QColor(renderer.TITLE_COLORS[2]))
+            painter.drawText(title, Qt.AlignCenter, renderer.snapshot.column_name(col_key))
+
+            painter.setPen(Qt.NoPen)
+            painter.setBrush(QColor(renderer.GRID_BACKGROUND))
+            painter.drawRoundedRect(grid, 8, 8)
+            painter.setBrush(QColor(renderer.EMPTY_COLORS[1]))
+            for row in range(config["rows"]):
+                for col in range(config["cols"]):
+                    painter.drawRoundedRect(
+                        renderer.seat_rect(grid, seat_width, seat_height, row, col).adjusted(2, 2, -2, -2), 6, 6
+                    )
+
+        painter.setBrush(QColor(renderer.DESK_COLORS[0]))
+        painter.drawRoundedRect(renderer.desk, 8, 8)
+        painter.setPen(QColor(renderer.DESK_COLORS[2]))
+        painter.drawText(renderer.desk, Qt.AlignCenter, "讲 台")
+        painter.end()